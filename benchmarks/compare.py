@@ -0,0 +1,81 @@
+"""
+Compare two JSON results files saved by *benchmarks.run*.
+
+Run from the repository root:
+
+::
+
+    python -m benchmarks.compare results_old.json results_new.json
+
+For each benchmark it prints the best time and peak memory of both runs and their ratio (new / old), so values lower
+than 1.0 mean that the new run is faster or uses less memory.
+"""
+import argparse
+import json
+from typing import Dict, Any, List, Union
+
+
+def _ratio(old: Union[float, None], new: Union[float, None]) -> Union[float, None]:
+    if old is None or new is None or old == 0:
+        return None
+    return new / old
+
+
+def compare(old_results: Dict[str, Any], new_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare results of two benchmark runs.
+
+    Args:
+        old_results (Dict[str, Any]): results of the baseline run
+        new_results (Dict[str, Any]): results of the compared run
+
+    Returns:
+        List[Dict[str, Any]]: for each benchmark found in both runs: its name, times, peak memory and ratios
+    """
+    comparison = []
+    for name, new in new_results['benchmarks'].items():
+        old = old_results['benchmarks'].get(name)
+        if old is None or 'error' in old or 'error' in new:
+            continue
+
+        comparison.append({
+            'name': name,
+            'old_seconds': old['best_seconds'],
+            'new_seconds': new['best_seconds'],
+            'time_ratio': _ratio(old['best_seconds'], new['best_seconds']),
+            'old_peak_memory_mb': old['peak_memory_mb'],
+            'new_peak_memory_mb': new['peak_memory_mb'],
+            'memory_ratio': _ratio(old['peak_memory_mb'], new['peak_memory_mb']),
+        })
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two MordinezNLP benchmark results files.")
+    parser.add_argument("old", help="results of the baseline run")
+    parser.add_argument("new", help="results of the compared run")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf8") as f:
+        old_results = json.load(f)
+    with open(args.new, encoding="utf8") as f:
+        new_results = json.load(f)
+
+    print("old: {}\nnew: {}".format(old_results['metadata']['commit'], new_results['metadata']['commit']))
+    print("{:<45} {:>10} {:>10} {:>7} {:>10} {:>10} {:>7}".format(
+        "benchmark", "old [s]", "new [s]", "time", "old [MB]", "new [MB]", "memory"
+    ))
+    for row in compare(old_results, new_results):
+        print("{:<45} {:>10.4f} {:>10.4f} {:>7} {:>10} {:>10} {:>7}".format(
+            row['name'],
+            row['old_seconds'],
+            row['new_seconds'],
+            '-' if row['time_ratio'] is None else "{:.2f}".format(row['time_ratio']),
+            '-' if row['old_peak_memory_mb'] is None else "{:.1f}".format(row['old_peak_memory_mb']),
+            '-' if row['new_peak_memory_mb'] is None else "{:.1f}".format(row['new_peak_memory_mb']),
+            '-' if row['memory_ratio'] is None else "{:.2f}".format(row['memory_ratio'])
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""
+Deterministic synthetic corpus used by the benchmarks. The same *seed* and *scale* always give the same texts, so
+results of runs on different commits can be compared.
+
+Kinds of texts:
+ - tweets - short texts with mentions, hashtags, urls, emojis and multiplied characters,
+ - html - long HTML pages with navigation, scripts, styles and paragraphs,
+ - lists - texts with "-" and ">" lists,
+ - digits - texts full of dates, numbers, math and phone numbers.
+"""
+import gzip
+import os
+import random
+from io import BytesIO
+from typing import List, Dict
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESOURCES_DIR = os.path.join(BASE_DIR, "tests", "resources")
+
+WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be this have from or one had by word but "
+    "not what all were we when your can said there use an each which she do how their if will up other about out many "
+    "then them these so some her would make like him into time has look two more write go see number no way could "
+    "people my than first water been call who oil its now find long down day did get come made may part over new "
+    "sound take only little work know place year live me back give most very after thing our just name good sentence "
+    "man think say great where help through much before line right too mean old any same tell boy follow came want "
+    "show also around form three small set put end does another well large must big even such because turn here why "
+    "ask went men read need land different home us move try kind hand picture again change off play spell air away "
+    "animal house point page letter mother answer found study still learn should America world"
+).split()
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+          "November", "December"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+EMOJIS = ["😂", "❤️", "🔥", "👍", "😍", "🙏", "😭", "✨"]
+# a spammy sentence with multiplied characters
+SPAM_UNIT = "heeeey you!!!! sooooo cooool ??? wooooow.... "
+
+
+def _sentence(rng: random.Random, min_words: int = 5, max_words: int = 20) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice([".", ".", ".", "!", "?"])
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+
+def tweets(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate short texts similar to tweets.
+
+    Args:
+        count (int): number of texts
+        seed (int): random seed
+
+    Returns:
+        List[str]: generated texts
+    """
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        parts = [_sentence(rng, 3, 15)]
+        if rng.random() < 0.4:
+            parts.insert(0, "@user{}".format(rng.randint(1, 5000)))
+        if rng.random() < 0.3:
+            parts.append("#" + rng.choice(WORDS) + rng.choice(WORDS))
+        if rng.random() < 0.3:
+            parts.append("https://t.co/{:x}".format(rng.getrandbits(40)))
+        if rng.random() < 0.3:
+            parts.append(rng.choice(WORDS) + rng.choice("aeiou") * rng.randint(4, 12) + "!!!!")
+        if rng.random() < 0.3:
+            parts.append(rng.choice(EMOJIS) * rng.randint(1, 3))
+        texts.append(" ".join(parts))
+    return texts
+
+
+def html_pages(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate long HTML pages with a navigation, scripts, styles, a footer and paragraphs of text.
+
+    Args:
+        count (int): number of pages
+        seed (int): random seed
+
+    Returns:
+        List[str]: generated HTML pages
+    """
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        navigation = "".join(
+            '<li><a href="/{0}">{0}</a></li>'.format(rng.choice(WORDS)) for _ in range(rng.randint(5, 15))
+        )
+        paragraphs = "\n".join(
+            "<h2>{}</h2>\n<p>{}</p>".format(_sentence(rng, 2, 6), _paragraph(rng, rng.randint(3, 12)))
+            for _ in range(rng.randint(10, 40))
+        )
+        pages.append(
+            "<!DOCTYPE html>\n<html><head><title>{title}</title>\n"
+            "<style>body {{ font-family: sans-serif; }} .nav li {{ display: inline; }}</style>\n"
+            "<script>var tracking = {{id: {id}, page: '{title}'}}; console.log(tracking);</script>\n"
+            "</head><body>\n<ul class=\"nav\">{navigation}</ul>\n<article>\n{paragraphs}\n</article>\n"
+            "<footer>Copyright (c) {year} Example Inc. Contact: contact@example.com, +1 555 {phone}</footer>\n"
+            "</body></html>".format(
+                title=_sentence(rng, 2, 6),
+                id=rng.randint(1, 10 ** 6),
+                navigation=navigation,
+                paragraphs=paragraphs,
+                year=rng.randint(1995, 2021),
+                phone=rng.randint(1000000, 9999999)
+            )
+        )
+    return pages
+
+
+def list_texts(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate texts with lists which items start with "-" or ">".
+
+    Args:
+        count (int): number of texts
+        seed (int): random seed
+
+    Returns:
+        List[str]: generated texts
+    """
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        lines = [_sentence(rng, 3, 8)[:-1] + ":"]
+        for _ in range(rng.randint(3, 12)):
+            lines.append("{}{}{}".format(
+                rng.choice(["-", "- ", ">", "> "]),
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6))),
+                rng.choice(["", ","])
+            ))
+        lines.append(_paragraph(rng, rng.randint(1, 3)))
+        texts.append("\n".join(lines))
+    return texts
+
+
+def digit_texts(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate texts full of dates, numbers, math expressions and phone numbers.
+
+    Args:
+        count (int): number of texts
+        seed (int): random seed
+
+    Returns:
+        List[str]: generated texts
+    """
+    rng = random.Random(seed)
+    patterns = [
+        lambda: "{}.{:02d}.{}".format(rng.randint(1, 28), rng.randint(1, 12), rng.randint(1900, 2030)),
+        lambda: "{} {} {}".format(rng.choice(DAYS), rng.randint(1, 28), rng.choice(MONTHS)),
+        lambda: "{}st of {} {}".format(rng.randint(1, 3), rng.choice(MONTHS), rng.randint(1900, 2030)),
+        lambda: "early {}s".format(rng.randint(1, 9) * 10),
+        lambda: "{} > {}".format(rng.randint(0, 1000), rng.randint(0, 1000)),
+        lambda: "{}<={}".format(rng.randint(0, 1000), rng.randint(0, 1000)),
+        lambda: "${}.{:02d}".format(rng.randint(1, 10000), rng.randint(0, 99)),
+        lambda: "+48 {} {} {}".format(rng.randint(100, 999), rng.randint(100, 999), rng.randint(100, 999)),
+        lambda: "{}rd place".format(rng.randint(1, 100)),
+        lambda: str(rng.randint(0, 10 ** 9)),
+    ]
+    texts = []
+    for i in range(count):
+        words = []
+        for _ in range(rng.randint(10, 60)):
+            words.append(rng.choice(patterns)() if rng.random() < 0.3 else rng.choice(WORDS))
+        texts.append(" ".join(words) + ".")
+    return texts
+
+
+def mixed_length_texts(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate scraped documents with short sentences and, in some of them, a very long row of a table (hundreds of
+    tokens without sentence punctuation).
+
+    Args:
+        count (int): number of texts
+        seed (int): random seed
+
+    Returns:
+        List[str]: generated texts
+    """
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        parts = [" ".join(_sentence(rng, 3, 8) for _ in range(rng.randint(2, 6)))]
+        if rng.random() < 0.2:
+            parts.append(" | ".join(
+                rng.choice([rng.choice(WORDS), str(rng.randint(1, 100000))]) for _ in range(rng.randint(100, 200))
+            ))
+            parts.append(_paragraph(rng, rng.randint(1, 3)))
+        texts.append("\n".join(parts))
+    return texts
+
+
+def generate_corpus(seed: int = 0, scale: float = 1.0) -> Dict[str, List[str]]:
+    """
+    Generate all kinds of synthetic texts.
+
+    Args:
+        seed (int): random seed
+        scale (float): multiplier of the number of texts of each kind
+
+    Returns:
+        Dict[str, List[str]]: texts of each kind
+    """
+    return {
+        'tweets': tweets(max(int(2000 * scale), 1), seed),
+        'html': html_pages(max(int(50 * scale), 1), seed),
+        'lists': list_texts(max(int(300 * scale), 1), seed),
+        'digits': digit_texts(max(int(300 * scale), 1), seed),
+        'mixed_lengths': mixed_length_texts(max(int(300 * scale), 1), seed),
+    }
+
+
+def gzip_files(texts: List[str]) -> List[bytes]:
+    """
+    Compress each of the texts to a gzip file, like files downloaded by *MordinezNLP.downloaders*.
+
+    Args:
+        texts (List[str]): texts to compress
+
+    Returns:
+        List[bytes]: gzip files content
+    """
+    files = []
+    for text in texts:
+        buffer = BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as f:
+            f.write(text.encode("utf8"))
+        files.append(buffer.getvalue())
+    return files
+
+
+def _read_files(directory: str, extension: str, mode: str = "r", exclude: str = None) -> List:
+    contents = []
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(extension) and (exclude is None or not file_name.endswith(exclude)):
+            with open(os.path.join(directory, file_name), mode, **({} if "b" in mode else {"encoding": "utf8"})) as f:
+                contents.append(f.read())
+    return contents
+
+
+def test_resources() -> Dict[str, List]:
+    """
+    Load input files of the unit tests.
+
+    Returns:
+        Dict[str, List]: processors documents, HTML documents, PDF files (bytes), gzip files (bytes) and POS tagging
+        documents
+    """
+    return {
+        'documents': _read_files(os.path.join(RESOURCES_DIR, "test_processors"), ".txt", exclude="_gt.txt"),
+        'html': _read_files(os.path.join(RESOURCES_DIR, "test_parsers"), ".html"),
+        'pdf': _read_files(os.path.join(RESOURCES_DIR, "test_parsers"), ".pdf", "rb"),
+        'gzip': _read_files(os.path.join(RESOURCES_DIR, "test_downloaders"), ".gz", "rb"),
+        'pos': _read_files(os.path.join(RESOURCES_DIR, "test_pipelines"), ".txt"),
+    }
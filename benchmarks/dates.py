@@ -0,0 +1,88 @@
+"""
+Benchmark of the date rules of *BasicProcessor* (*BasicProcessor._run_dates*) with names of days, ordinals and months
+compiled into tries (see *MordinezNLP.utils.trie_regex*) and with flat alternations of the names, which were used
+before. Both versions must give the same output.
+
+Run from the repository root:
+
+::
+
+    python -m benchmarks.dates
+    python -m benchmarks.dates --scale 0.1
+"""
+import argparse
+import re
+import time
+from typing import List, Dict, Tuple
+
+try:
+    from src.MordinezNLP.processors import BasicProcessor
+except:
+    from MordinezNLP.processors import BasicProcessor
+
+from benchmarks.corpus import generate_corpus, test_resources
+
+
+def flat_common_dates_combined(language: str):
+    """
+    Build *BasicProcessor.common_dates_combined* the way it was built before, with flat alternations of the names.
+    """
+    return re.compile(
+        r"((" + "|".join(BasicProcessor.load_language_days(language)) + r")*\s*((" + "|".join(
+            BasicProcessor._load_date_ordinals(
+                language)) + r")|(0*([1-9]{1,2})(st|nd|rd|th)*))\s+(of\s+)*(" + "|".join(
+            BasicProcessor.load_language_months(language)) + r"))\s*\d{0,4}s*", re.IGNORECASE)
+
+
+def _best_time(bp: BasicProcessor, texts: List[str], repeats: int) -> Tuple[float, List[str]]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        processed = [bp._run_dates(text, "<date>") for text in texts]
+        times.append(time.perf_counter() - start)
+    return min(times), processed
+
+
+def benchmark_dates(texts: Dict[str, List[str]], repeats: int = 3) -> List[tuple]:
+    """
+    Measure the date rules with flat and with trie compiled names.
+
+    Args:
+        texts (Dict[str, List[str]]): texts to process for each kind of texts
+        repeats (int): each measurement is repeated and the best time is reported
+
+    Returns:
+        List[tuple]: a list of (kind of texts, number of characters, flat seconds, trie seconds) tuples
+    """
+    trie_bp = BasicProcessor('en')
+    flat_bp = BasicProcessor('en')
+    flat_bp.common_dates_combined = flat_common_dates_combined('en')
+
+    results = []
+    for kind, kind_texts in texts.items():
+        flat_seconds, flat_processed = _best_time(flat_bp, kind_texts, repeats)
+        trie_seconds, trie_processed = _best_time(trie_bp, kind_texts, repeats)
+        if flat_processed != trie_processed:
+            raise Exception('Outputs of flat and trie date rules are different for "{}" texts'.format(kind))
+        results.append((kind, sum(len(text) for text in kind_texts), flat_seconds, trie_seconds))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the date rules of BasicProcessor")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale of the synthetic corpus")
+    parser.add_argument("--repeats", type=int, default=3, help="how many times each measurement is repeated")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(scale=args.scale)
+    texts = {'digits': corpus['digits'], 'tweets': corpus['tweets'], 'documents': test_resources()['documents']}
+
+    print("{:>10} {:>10} {:>10} {:>10} {:>8}".format("texts", "chars", "flat ms", "trie ms", "speedup"))
+    for kind, chars, flat_seconds, trie_seconds in benchmark_dates(texts, args.repeats):
+        print("{:>10} {:>10} {:>10.2f} {:>10.2f} {:>7.2f}x".format(
+            kind,
+            chars,
+            flat_seconds * 1000,
+            trie_seconds * 1000,
+            flat_seconds / trie_seconds
+        ))
@@ -0,0 +1,48 @@
+"""
+Benchmark of *BasicProcessor.process_multiple_characters* on spammy texts of growing length. Processing time per
+character should stay the same for each text length.
+
+Run from the repository root:
+
+::
+
+    python -m benchmarks.multiple_characters
+"""
+import time
+
+try:
+    from src.MordinezNLP.processors import BasicProcessor
+except:
+    from MordinezNLP.processors import BasicProcessor
+
+from benchmarks.corpus import SPAM_UNIT
+
+
+def benchmark_multiple_characters(bp: BasicProcessor, repeats: list) -> list:
+    """
+    Measure processing time of texts built from *repeats* copies of a spammy sentence.
+
+    Args:
+        bp (BasicProcessor): a processor to benchmark
+        repeats (list): how many copies of the spammy sentence are in each text
+
+    Returns:
+        list: a list of (text length, seconds) tuples
+    """
+    results = []
+    for repeat in repeats:
+        text = SPAM_UNIT * repeat
+
+        start = time.perf_counter()
+        bp.process_multiple_characters(text)
+        results.append((len(text), time.perf_counter() - start))
+    return results
+
+
+if __name__ == '__main__':
+    for text_length, seconds in benchmark_multiple_characters(BasicProcessor(), [100, 1000, 10000, 100000]):
+        print("{:>10} chars {:>10.2f} ms {:>8.3f} us/char".format(
+            text_length,
+            seconds * 1000,
+            seconds / text_length * 1000000
+        ))
@@ -0,0 +1,208 @@
+"""
+Throughput and tag agreement of the POS tagging backends of *PartOfSpeech* (see *MordinezNLP.pipelines.PosBackends*):
+the Stanza tagger (the default) and the tagger of the SpaCy pipeline.
+
+Tags are compared after the mapping with *pos_replacement_list* and *token_replacement_list*, so only differences
+which change the output of *PartOfSpeech* are counted (eg. PROPN and NOUN are both "NOUN"). Stanza is the reference:
+ - Stanza tags saved in the ground truth files of the POS tagging tests (*tests/resources/test_pipelines/*_gt.json*),
+   they are compared even if Stanza models are not installed,
+ - the Stanza backend itself, if its models are installed, on the POS tagging test texts and on the ground truth texts
+   of the processors tests (processed texts with special tokens, the input of the POS tagging in *BasicProcessor*).
+
+Both backends use the same SpaCy pipeline to tokenize texts and to split them into sentences, so they tag the same
+tokens in the same sentences. Each backend has its own copy of the pipeline, because the SpaCy backend keeps the
+tagger enabled.
+
+Run from the repository root:
+
+::
+
+    python -m benchmarks.pos_backends
+    python -m benchmarks.pos_backends --sentence-segmentation rules --repeats 5
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from typing import List, Dict, Any, Tuple
+
+import spacy
+
+try:
+    from src.MordinezNLP.pipelines import PartOfSpeech
+    from src.MordinezNLP.tokenizers import spacy_tokenizer
+except:
+    from MordinezNLP.pipelines import PartOfSpeech
+    from MordinezNLP.tokenizers import spacy_tokenizer
+
+from benchmarks.corpus import RESOURCES_DIR, _read_files
+
+BACKENDS = ['stanza', 'spacy']
+
+# a tagged document is a list of sentences, a sentence is a pair of its tokens and their tags
+TaggedDocument = List[Tuple[List[str], List[str]]]
+
+
+def pos_tagger(backend: str, sentence_segmentation: str = 'parser', model: str = "en_core_web_sm") -> PartOfSpeech:
+    """
+    A POS tagger with its own SpaCy pipeline.
+    """
+    nlp = spacy.load(model)
+    nlp.tokenizer = spacy_tokenizer(nlp)
+    return PartOfSpeech(nlp, 'en', sentence_segmentation, backend)
+
+
+def tag(tagger: PartOfSpeech, texts: List[str]) -> List[TaggedDocument]:
+    """
+    POS tag documents in a single process, tokens are texts of SpaCy tokens (as in the ground truth files).
+    """
+    return [
+        [([token.text for token in sentence], sentence_pos) for sentence, sentence_pos in zip(sentences, poss)]
+        for sentences, poss in tagger.process(texts, tokenizer_threads=1, return_docs=True)
+    ]
+
+
+def compare(reference: List[TaggedDocument], predicted: List[TaggedDocument], top: int = 10) -> Dict[str, Any]:
+    """
+    Compare tags of the same tokens.
+
+    Args:
+        reference (List[TaggedDocument]): documents tagged by the reference backend
+        predicted (List[TaggedDocument]): the same documents tagged by the compared backend
+        top (int): how many of the most common differences are returned
+
+    Returns:
+        Dict[str, Any]: number of tokens, number and fraction of the tokens with the same tags and the most common
+        differences as (reference tag, predicted tag, count)
+    """
+    tokens = 0
+    same = 0
+    confusions = Counter()
+
+    for reference_doc, predicted_doc in zip(reference, predicted):
+        # sentences may be split differently (eg. saved sentences of an older parser), tokens have to be the same
+        if [token for sentence, _ in reference_doc for token in sentence] != \
+                [token for sentence, _ in predicted_doc for token in sentence]:
+            raise Exception('Tokens of the compared documents are different')
+
+        reference_tags = [pos for _, poss in reference_doc for pos in poss]
+        predicted_tags = [pos for _, poss in predicted_doc for pos in poss]
+        for reference_tag, predicted_tag in zip(reference_tags, predicted_tags):
+            tokens += 1
+            if reference_tag == predicted_tag:
+                same += 1
+            else:
+                confusions[(reference_tag, predicted_tag)] += 1
+
+    return {
+        'tokens': tokens,
+        'same_tags': same,
+        'agreement': same / tokens if tokens > 0 else 1.0,
+        'confusions': [(reference_tag, predicted_tag, count)
+                       for (reference_tag, predicted_tag), count in confusions.most_common(top)],
+    }
+
+
+def _best_time(tagger: PartOfSpeech, texts: List[str], repeats: int) -> Tuple[float, List[TaggedDocument]]:
+    # the first run loads the models of the backend, it is not measured
+    tagged = tag(tagger, texts)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tag(tagger, texts)
+        times.append(time.perf_counter() - start)
+    return min(times), tagged
+
+
+def backends_report(
+        repeats: int = 3,
+        sentence_segmentation: str = 'parser',
+        model: str = "en_core_web_sm"
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Compare the SpaCy backend with Stanza on the tests resources.
+
+    Args:
+        repeats (int): each time measurement is repeated and the best time is reported
+        sentence_segmentation (str): 'parser' or 'rules', sentence segmentation of both backends
+        model (str): SpaCy model
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]: comparison (see *compare*) for each of the
+        sources and throughput of each of the backends (with an error if the backend can't be loaded)
+    """
+    pipelines_dir = os.path.join(RESOURCES_DIR, "test_pipelines")
+    saved_names = sorted(name for name in os.listdir(pipelines_dir) if name.endswith("_gt.json"))
+    pos_texts = []
+    saved = []
+    for name in saved_names:
+        with open(os.path.join(pipelines_dir, name.replace("_gt.json", ".txt")), encoding="utf8") as f:
+            pos_texts.append(f.read())
+        with open(os.path.join(pipelines_dir, name), encoding="utf8") as f:
+            saved.append([tuple(sentence) for sentence in json.load(f)['sentences']])
+    processed_texts = _read_files(os.path.join(RESOURCES_DIR, "test_processors"), "_gt.txt")
+    texts = pos_texts + processed_texts
+
+    tagged: Dict[str, List[TaggedDocument]] = {}
+    timing: Dict[str, Dict[str, Any]] = {}
+    for backend in BACKENDS:
+        try:
+            seconds, tagged[backend] = _best_time(pos_tagger(backend, sentence_segmentation, model), texts, repeats)
+        except (OSError, ImportError) as e:
+            timing[backend] = {'error': "{}: {}".format(type(e).__name__, e)}
+            continue
+
+        tokens = sum(len(sentence) for doc in tagged[backend] for sentence, _ in doc)
+        timing[backend] = {
+            'seconds': seconds,
+            'characters_per_second': sum(len(text) for text in texts) / seconds if seconds > 0 else None,
+            'tokens_per_second': tokens / seconds if seconds > 0 else None,
+        }
+
+    reports = {}
+    if 'spacy' in tagged:
+        spacy_pos = tagged['spacy'][:len(pos_texts)]
+        if sentence_segmentation == 'parser':
+            # the saved tags come from sentences of the parser
+            for name, saved_doc, doc in zip(saved_names, saved, spacy_pos):
+                reports['saved stanza: ' + name] = compare([saved_doc], [doc])
+        if 'stanza' in tagged:
+            for name, begin, end in [('stanza: test_pipelines', 0, len(pos_texts)),
+                                     ('stanza: test_processors', len(pos_texts), len(texts))]:
+                reports[name] = compare(tagged['stanza'][begin:end], tagged['spacy'][begin:end])
+    return reports, timing
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare POS tagging backends of PartOfSpeech")
+    parser.add_argument("--repeats", type=int, default=3, help="how many times each time measurement is repeated")
+    parser.add_argument("--model", default="en_core_web_sm", help="SpaCy model")
+    parser.add_argument("--sentence-segmentation", default="parser", choices=['parser', 'rules'],
+                        help="sentence segmentation of both backends")
+    args = parser.parse_args()
+
+    reports, timing = backends_report(args.repeats, args.sentence_segmentation, args.model)
+
+    print("{:<10} {:>10} {:>12} {:>12}".format("backend", "ms", "chars/s", "tokens/s"))
+    for backend, backend_timing in timing.items():
+        if 'error' in backend_timing:
+            print("{:<10} not available ({})".format(backend, backend_timing['error']))
+        else:
+            print("{:<10} {:>10.2f} {:>12.0f} {:>12.0f}".format(
+                backend,
+                backend_timing['seconds'] * 1000,
+                backend_timing['characters_per_second'],
+                backend_timing['tokens_per_second']
+            ))
+    if 'error' not in timing['stanza'] and 'error' not in timing['spacy']:
+        print("speedup of spacy {:.1f}x".format(timing['stanza']['seconds'] / timing['spacy']['seconds']))
+
+    print("\n{:<40} {:>8} {:>9}  most common differences (stanza -> spacy)".format("source", "tokens", "agreement"))
+    for name, report in reports.items():
+        print("{:<40} {:>8} {:>9.3f}  {}".format(
+            name,
+            report['tokens'],
+            report['agreement'],
+            ", ".join("{}->{} {}".format(*confusion) for confusion in report['confusions'][:5])
+        ))
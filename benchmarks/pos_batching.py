@@ -0,0 +1,155 @@
+"""
+Throughput of the Stanza POS tagging with sentences sorted by length and tagged in calls of at most *pos_batch_tokens*
+padded tokens (see *PartOfSpeech.process*) compared with the default single call of Stanza for all of the sentences,
+which are split by Stanza into minibatches of *pos_batch_size* sentences.
+
+Texts are scraped-like documents with short sentences and long rows of tables (*benchmarks.corpus.mixed_length_texts*)
+and the POS tagging tests texts. For each *pos_batch_tokens* (None is the default behaviour) the best time, sentences
+and tokens per second, the number of calls of the backend and the largest call in padded tokens (number of sentences
+multiplied by the length of the longest one) are reported. Tags are checked to be the same as tags of the default
+behaviour.
+
+Run from the repository root:
+
+::
+
+    python -m benchmarks.pos_batching
+    python -m benchmarks.pos_batching --budgets 1000 5000 20000 --pos-batch-size 3000 --scale 0.5
+"""
+import argparse
+import os
+import time
+from typing import List, Dict, Any, Union, Tuple
+
+import spacy
+from spacy.tokens import Token
+
+try:
+    from src.MordinezNLP.pipelines import PartOfSpeech, PosBackend
+    from src.MordinezNLP.tokenizers import spacy_tokenizer
+except:
+    from MordinezNLP.pipelines import PartOfSpeech, PosBackend
+    from MordinezNLP.tokenizers import spacy_tokenizer
+
+from benchmarks.corpus import RESOURCES_DIR, _read_files, mixed_length_texts
+
+
+class CallsRecorder(PosBackend):
+    """
+    A backend which records sizes of the calls of an other backend.
+    """
+
+    def __init__(self, backend: PosBackend):
+        self.backend = backend
+        self.name = backend.name
+        self.spacy_components = backend.spacy_components
+        self.calls: List[Tuple[int, int]] = []
+
+    def load(self, pos_batch_size: int):
+        self.backend.load(pos_batch_size)
+
+    def tag(self, sentences: List[List[str]], spacy_sentences: List[List[Token]]) -> List[List[Tuple[str, str]]]:
+        # number of sentences and padded tokens
+        self.calls.append((len(sentences), len(sentences) * max([len(sentence) for sentence in sentences] or [0])))
+        return self.backend.tag(sentences, spacy_sentences)
+
+
+def _tag(tagger: PartOfSpeech, texts: List[str], pos_batch_size: int, pos_batch_tokens: Union[int, None]) -> List:
+    return list(tagger.process(
+        texts,
+        tokenizer_threads=1,
+        pos_batch_size=pos_batch_size,
+        return_string_tokens=True,
+        pos_batch_tokens=pos_batch_tokens
+    ))
+
+
+def batching_report(
+        texts: List[str],
+        budgets: List[Union[int, None]],
+        pos_batch_size: int = 3000,
+        repeats: int = 3,
+        model: str = "en_core_web_sm"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Measure POS tagging of the texts with each of the budgets.
+
+    Args:
+        texts (List[str]): documents to tag
+        budgets (List[Union[int, None]]): values of *pos_batch_tokens*, None is a single call of the backend
+        pos_batch_size (int): *pos_batch_size* of the Stanza pipeline
+        repeats (int): each time measurement is repeated and the best time is reported
+        model (str): SpaCy model
+
+    Returns:
+        Dict[str, Dict[str, Any]]: measurements for each of the budgets
+    """
+    nlp = spacy.load(model)
+    nlp.tokenizer = spacy_tokenizer(nlp)
+    tagger = PartOfSpeech(nlp, 'en')
+    recorder = CallsRecorder(tagger.backend)
+    tagger.backend = recorder
+
+    # the first run loads the Stanza pipeline and it is the reference output
+    reference = _tag(tagger, texts, pos_batch_size, None)
+    sentences = len(reference)
+    tokens = sum(len(sentence) for sentence, _ in reference)
+
+    reports = {}
+    for budget in budgets:
+        times = []
+        for _ in range(repeats):
+            recorder.calls = []
+            start = time.perf_counter()
+            output = _tag(tagger, texts, pos_batch_size, budget)
+            times.append(time.perf_counter() - start)
+
+        best = min(times)
+        reports[str(budget)] = {
+            'seconds': best,
+            'sentences_per_second': sentences / best if best > 0 else None,
+            'tokens_per_second': tokens / best if best > 0 else None,
+            'calls': len(recorder.calls),
+            'largest_call_sentences': max([call_sentences for call_sentences, _ in recorder.calls] or [0]),
+            'largest_call_padded_tokens': max([padded for _, padded in recorder.calls] or [0]),
+            'same_tags': output == reference,
+        }
+    return reports
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare Stanza POS tagging with and without length-bucketed calls")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[1000, 2500, 5000, 10000],
+                        help="values of pos_batch_tokens, the default single call is always measured")
+    parser.add_argument("--pos-batch-size", type=int, default=3000, help="pos_batch_size of the Stanza pipeline")
+    parser.add_argument("--repeats", type=int, default=3, help="how many times each time measurement is repeated")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of the number of generated texts")
+    parser.add_argument("--model", default="en_core_web_sm", help="SpaCy model")
+    args = parser.parse_args()
+
+    sources = {
+        'mixed_lengths': mixed_length_texts(max(int(300 * args.scale), 1)),
+        'test_pipelines': _read_files(os.path.join(RESOURCES_DIR, "test_pipelines"), ".txt"),
+    }
+
+    print("{:<16} {:>8} {:>10} {:>12} {:>12} {:>7} {:>12} {:>9}".format(
+        "source", "budget", "ms", "sentences/s", "tokens/s", "calls", "largest call", "same tags"
+    ))
+    for name, source_texts in sources.items():
+        try:
+            reports = batching_report(source_texts, [None] + args.budgets, args.pos_batch_size, args.repeats, args.model)
+        except (OSError, ImportError) as e:
+            print("{:<16} not available ({}: {})".format(name, type(e).__name__, e))
+            continue
+
+        for budget, report in reports.items():
+            print("{:<16} {:>8} {:>10.2f} {:>12.0f} {:>12.0f} {:>7} {:>12} {:>9}".format(
+                name,
+                budget,
+                report['seconds'] * 1000,
+                report['sentences_per_second'],
+                report['tokens_per_second'],
+                report['calls'],
+                report['largest_call_padded_tokens'],
+                str(report['same_tags'])
+            ))
@@ -0,0 +1,401 @@
+"""
+Benchmark suite of MordinezNLP. It measures throughput and peak memory of the main functions on a deterministic
+synthetic corpus (see *benchmarks.corpus*) and on the unit tests resources. Results are saved to a JSON file, so
+runs on different commits can be compared with *benchmarks.compare*.
+
+Run from the repository root:
+
+::
+
+    python -m benchmarks.run --output results_new.json
+    python -m benchmarks.run --filter basic_processor --scale 0.1 --output results_quick.json
+    python -m benchmarks.compare results_old.json results_new.json
+
+Each benchmark is run *repeats* times and the best and the median times are reported. Peak memory is measured in an
+additional run with *tracemalloc* enabled (it slows the code down, so it is not used for timing). *tracemalloc* sees
+only memory allocated by Python, so the maximum resident set size of the whole process after each benchmark is
+reported too.
+
+Import benchmarks (*import.<package>*) run a new Python interpreter which imports a MordinezNLP package, so their
+time includes the interpreter startup.
+
+Benchmarks which can't be run (eg. a SpaCy or a Stanza model is not installed) are reported with an error message.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from typing import List, Callable, Dict, Any, Union
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+from benchmarks.corpus import generate_corpus, test_resources, gzip_files, BASE_DIR, SPAM_UNIT
+
+# benchmark the repository sources if they are available, otherwise the installed package
+PACKAGE = "src.MordinezNLP" if os.path.isdir(os.path.join(BASE_DIR, "src", "MordinezNLP")) else "MordinezNLP"
+
+
+@lru_cache(maxsize=None)
+def _load(module: str, name: str) -> Any:
+    """
+    Import a MordinezNLP object when a benchmark needs it, so a missing optional dependency (eg. stanza or selectolax)
+    fails only the benchmarks which use it.
+    """
+    return getattr(importlib.import_module(PACKAGE + "." + module), name)
+
+
+@lru_cache(maxsize=1)
+def _basic_processor():
+    return _load("processors", "BasicProcessor")('en')
+
+
+@lru_cache(maxsize=1)
+def _spacy_nlp():
+    import spacy
+
+    nlp = spacy.load("en_core_web_sm")
+    nlp.tokenizer = _load("tokenizers", "spacy_tokenizer")(nlp)
+    return nlp
+
+
+@lru_cache(maxsize=2)
+def _segmentation_nlp(sentence_segmentation: str):
+    import spacy
+
+    nlp = spacy.load("en_core_web_sm")
+    nlp.tokenizer = _load("tokenizers", "spacy_tokenizer")(nlp)
+    # the same components as in the pipeline of *PartOfSpeech*
+    return _load("pipelines", "PartOfSpeech")(nlp, 'en', sentence_segmentation).spacy_nlp
+
+
+@lru_cache(maxsize=2)
+def _pos_tagger(backend: str = 'stanza'):
+    import spacy
+
+    nlp = spacy.load("en_core_web_sm")
+    nlp.tokenizer = _load("tokenizers", "spacy_tokenizer")(nlp)
+    return _load("pipelines", "PartOfSpeech")(nlp, 'en', backend=backend)
+
+
+def _input_size(inputs: List[Union[str, bytes]]) -> int:
+    return sum(len(item) for item in inputs)
+
+
+def measure(function: Callable[[List], Any], inputs: List, repeats: int = 3, memory: bool = True) -> Dict[str, Any]:
+    """
+    Measure time and peak memory of a function which processes a list of inputs.
+
+    Args:
+        function (Callable[[List], Any]): a function to measure, it gets the whole *inputs* list
+        inputs (List): a list of str or bytes inputs
+        repeats (int): how many times the function is run to measure time
+        memory (bool): if True, the function is run once more with *tracemalloc* enabled
+
+    Returns:
+        Dict[str, Any]: measurements
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(inputs)
+        times.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        function(inputs)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    best = min(times)
+    size = _input_size(inputs)
+    return {
+        'items': len(inputs),
+        'input_size': size,
+        'size_unit': 'bytes' if len(inputs) > 0 and type(inputs[0]) is bytes else 'chars',
+        'repeats': repeats,
+        'best_seconds': best,
+        'median_seconds': statistics.median(times),
+        'items_per_second': len(inputs) / best if best > 0 else None,
+        'size_per_second': size / best if best > 0 else None,
+        'peak_memory_mb': None if peak_memory is None else peak_memory / 2 ** 20,
+        'max_rss_mb': _max_rss_mb(),
+    }
+
+
+def _max_rss_mb() -> Union[float, None]:
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return max_rss / 2 ** 20 if sys.platform == 'darwin' else max_rss / 2 ** 10
+
+
+def _consume(iterator) -> int:
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def _import_in_new_process(modules: List[str]):
+    for module in modules:
+        subprocess.run([sys.executable, "-c", "import " + module], cwd=BASE_DIR, check=True,
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def build_benchmarks(corpus: Dict[str, List[str]], resources: Dict[str, List], pos: bool) -> Dict[str, tuple]:
+    """
+    Build all of the benchmarks.
+
+    Args:
+        corpus (Dict[str, List[str]]): synthetic corpus built by *generate_corpus*
+        resources (Dict[str, List]): unit tests resources loaded by *test_resources*
+        pos (bool): if True, *BasicProcessor* benchmarks use POS tagging
+
+    Returns:
+        Dict[str, tuple]: for each benchmark name a function and its inputs
+    """
+    benchmarks = {}
+    texts = dict(corpus, documents=resources['documents'])
+
+    for package in ['utils', 'processors', 'parsers', 'downloaders', 'pipelines', 'tokenizers']:
+        benchmarks['import.' + package] = (_import_in_new_process, [PACKAGE + "." + package])
+
+    for kind, kind_texts in texts.items():
+        benchmarks['basic_processor.str.' + kind] = (
+            lambda inputs: [_basic_processor().process(text, use_pos_tagging=pos) for text in inputs],
+            kind_texts
+        )
+        benchmarks['basic_processor.list.' + kind] = (
+            lambda inputs: _basic_processor().process(inputs, use_pos_tagging=pos),
+            kind_texts
+        )
+
+    # language resources are built by the first processor only, next processors reuse them
+    benchmarks['basic_processor.init'] = (
+        lambda inputs: [_load("processors", "BasicProcessor")(language) for language in inputs],
+        ['en'] * 100
+    )
+
+    # all of the html pages in a single large document, processed as a whole and in segments by a processes pool
+    large_document = ["\n\n".join(corpus['html'])]
+    benchmarks['basic_processor.large_document'] = (
+        lambda inputs: [_basic_processor().process(text, use_pos_tagging=pos) for text in inputs],
+        large_document
+    )
+    benchmarks['basic_processor.large_document.segmented'] = (
+        lambda inputs: [
+            _basic_processor().process(text, use_pos_tagging=pos, segment_size=100000, executor='process')
+            for text in inputs
+        ],
+        large_document
+    )
+
+    benchmarks['basic_processor.multiple_characters'] = (
+        lambda inputs: [_basic_processor().process_multiple_characters(text) for text in inputs],
+        [SPAM_UNIT * 1000]
+    )
+
+    for kind in ['tweets', 'digits']:
+        benchmarks['basic_processor.dates.' + kind] = (
+            lambda inputs: [_basic_processor()._run_dates(text, "<date>") for text in inputs],
+            texts[kind]
+        )
+
+    for kind in ['tweets', 'digits', 'documents']:
+        benchmarks['spacy_tokenizer.' + kind] = (
+            lambda inputs: _consume(_spacy_nlp().tokenizer.pipe(inputs)),
+            texts[kind]
+        )
+
+    for kind in ['tweets', 'documents']:
+        for sentence_segmentation in ['parser', 'rules']:
+            benchmarks['sentence_segmentation.{}.{}'.format(sentence_segmentation, kind)] = (
+                lambda inputs, mode=sentence_segmentation: sum(
+                    len(list(doc.sents)) for doc in _segmentation_nlp(mode).pipe(inputs)
+                ),
+                texts[kind]
+            )
+
+    for kind in ['tweets', 'documents', 'mixed_lengths']:
+        benchmarks['part_of_speech.' + kind] = (
+            lambda inputs: _consume(_pos_tagger().process(inputs, tokenizer_threads=1, return_docs=True)),
+            texts[kind]
+        )
+    # POS tags of the SpaCy tagger instead of Stanza, see *benchmarks.pos_backends* for the agreement of the tags
+    for kind in ['tweets', 'documents']:
+        benchmarks['part_of_speech.{}.spacy_backend'.format(kind)] = (
+            lambda inputs: _consume(_pos_tagger('spacy').process(inputs, tokenizer_threads=1, return_docs=True)),
+            texts[kind]
+        )
+    # sentences sorted by length and tagged in calls of at most 5000 padded tokens, compare with the single call of
+    # *part_of_speech.<kind>*, see also *benchmarks.pos_batching*
+    for kind in ['documents', 'mixed_lengths']:
+        benchmarks['part_of_speech.{}.token_budget'.format(kind)] = (
+            lambda inputs: _consume(_pos_tagger().process(
+                inputs,
+                tokenizer_threads=1,
+                return_docs=True,
+                pos_batch_tokens=5000
+            )),
+            texts[kind]
+        )
+    benchmarks['part_of_speech.documents.window'] = (
+        lambda inputs: _consume(_pos_tagger().process(inputs, tokenizer_threads=1, return_docs=True, window=100)),
+        texts['documents']
+    )
+    # a new cache for each run, so only sentences repeated in the documents are hits
+    benchmarks['part_of_speech.documents.cache'] = (
+        lambda inputs: _consume(_pos_tagger().process(
+            inputs,
+            tokenizer_threads=1,
+            return_docs=True,
+            cache=_load("pipelines", "PosCache")()
+        )),
+        texts['documents']
+    )
+    benchmarks['part_of_speech.resources'] = (
+        lambda inputs: _consume(_pos_tagger().process(inputs, tokenizer_threads=1, return_docs=True)),
+        resources['pos']
+    )
+
+    for kind, pages in [('html', corpus['html']), ('resources', resources['html'])]:
+        benchmarks['html_parser.' + kind] = (
+            lambda inputs: [_load("parsers.HTML_Parser", "HTML_Parser")(page) for page in inputs],
+            pages
+        )
+
+    benchmarks['process_pdf.resources'] = (
+        lambda inputs: [_load("parsers.process_pdf", "process_pdf")(BytesIO(pdf)) for pdf in inputs],
+        resources['pdf']
+    )
+
+    for kind, files in [('html', gzip_files(corpus['html'])), ('resources', resources['gzip'])]:
+        benchmarks['gzip_to_text_data_processor.' + kind] = (
+            lambda inputs: [
+                _load("downloaders.Processors", "gzip_to_text_data_processor")(BytesIO(data)) for data in inputs
+            ],
+            files
+        )
+    return benchmarks
+
+
+def _git_commit() -> Union[str, None]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BASE_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BASE_DIR, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, universal_newlines=True
+        ).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+        seed: int = 0,
+        scale: float = 1.0,
+        repeats: int = 3,
+        memory: bool = True,
+        pos: bool = False,
+        name_filter: Union[str, None] = None
+) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        seed (int): seed of the synthetic corpus
+        scale (float): size multiplier of the synthetic corpus
+        repeats (int): how many times each benchmark is run
+        memory (bool): if True, peak memory is measured
+        pos (bool): if True, *BasicProcessor* benchmarks use POS tagging
+        name_filter (Union[str, None]): run only benchmarks which names contain this string
+
+    Returns:
+        Dict[str, Any]: run metadata and results of each benchmark
+    """
+    corpus = generate_corpus(seed, scale)
+    resources = test_resources()
+
+    results = {
+        'metadata': {
+            'commit': _git_commit(),
+            'date': datetime.now().isoformat(),
+            'python': sys.version,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'scale': scale,
+            'repeats': repeats,
+            'pos': pos,
+        },
+        'benchmarks': {}
+    }
+
+    for name, (function, inputs) in build_benchmarks(corpus, resources, pos).items():
+        if name_filter is not None and name_filter not in name:
+            continue
+
+        print("Running {} ...".format(name), file=sys.stderr)
+        try:
+            results['benchmarks'][name] = measure(function, inputs, repeats, memory)
+        except Exception as e:
+            results['benchmarks'][name] = {'error': "{}: {}".format(type(e).__name__, e)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run MordinezNLP benchmarks and save results to a JSON file.")
+    parser.add_argument("--output", default="benchmark_results.json", help="path of the JSON results file")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic corpus")
+    parser.add_argument("--scale", type=float, default=1.0, help="size multiplier of the synthetic corpus")
+    parser.add_argument("--repeats", type=int, default=3, help="how many times each benchmark is run")
+    parser.add_argument("--no-memory", action="store_true", help="don't measure peak memory")
+    parser.add_argument("--pos", action="store_true", help="use POS tagging in BasicProcessor benchmarks")
+    parser.add_argument("--filter", default=None, help="run only benchmarks which names contain this string")
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        seed=args.seed,
+        scale=args.scale,
+        repeats=args.repeats,
+        memory=not args.no_memory,
+        pos=args.pos,
+        name_filter=args.filter
+    )
+
+    with open(args.output, "w", encoding="utf8") as f:
+        json.dump(results, f, indent=2)
+
+    for name, result in results['benchmarks'].items():
+        if 'error' in result:
+            print("{:<45} {}".format(name, result['error']))
+        else:
+            print("{:<45} {:>10.4f} s {:>12.1f} items/s {:>10} MB".format(
+                name,
+                result['best_seconds'],
+                result['items_per_second'] or 0,
+                '-' if result['peak_memory_mb'] is None else "{:.1f}".format(result['peak_memory_mb'])
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Agreement of the rule based sentence segmentation (*MordinezNLP.tokenizers.spacy_sentencizer*, used by
+*PartOfSpeech* with *sentence_segmentation='rules'*) with sentences of the SpaCy dependency parser, and speed of both.
+
+Sentences of the parser are taken from:
+ - ground truth files of the POS tagging tests (*tests/resources/test_pipelines/*_gt.json*), they were made by the
+   parser, so the agreement is reported even if SpaCy models are not installed,
+ - the parser itself, if the SpaCy model is installed, on the POS tagging test texts and on the ground truth texts of
+   the processors tests (processed texts with special tokens, the input of the POS tagging in *BasicProcessor*).
+
+For each source sentence boundaries (token positions where a sentence starts) of both methods are compared. Precision
+is the fraction of the rules boundaries which are parser boundaries, recall is the fraction of the parser boundaries
+found by the rules.
+
+Run from the repository root:
+
+::
+
+    python -m benchmarks.sentences
+    python -m benchmarks.sentences --show --repeats 5
+"""
+import argparse
+import json
+import os
+import time
+from typing import List, Dict, Any, Tuple, Union
+
+import spacy
+from spacy.language import Language
+
+try:
+    from src.MordinezNLP.tokenizers import spacy_tokenizer, spacy_sentencizer
+except:
+    from MordinezNLP.tokenizers import spacy_tokenizer, spacy_sentencizer
+
+from benchmarks.corpus import RESOURCES_DIR, _read_files
+
+
+def rules_nlp(language: str = 'en') -> Language:
+    """
+    A SpaCy pipeline which splits sentences with rules, it doesn't need a model.
+    """
+    nlp = spacy.blank(language)
+    nlp.tokenizer = spacy_tokenizer(nlp)
+    return spacy_sentencizer(nlp)
+
+
+def parser_nlp(model: str = "en_core_web_sm") -> Language:
+    """
+    A SpaCy pipeline configured like the default pipeline of *PartOfSpeech*, which splits sentences with the parser.
+    """
+    nlp = spacy.load(model)
+    nlp.tokenizer = spacy_tokenizer(nlp)
+    for component in ['ner', 'attribute_ruler', 'lemmatizer']:
+        nlp.disable_pipe(component)
+    return nlp
+
+
+def _sentences(nlp: Language, texts: List[str]) -> List[List[List[str]]]:
+    return [[[token.text for token in sentence] for sentence in doc.sents] for doc in nlp.pipe(texts)]
+
+
+def _starts(sentences: List[List[str]]) -> List[int]:
+    starts = []
+    position = 0
+    for sentence in sentences:
+        starts.append(position)
+        position += len(sentence)
+    return starts
+
+
+def compare(reference: List[List[List[str]]], predicted: List[List[List[str]]]) -> Dict[str, Any]:
+    """
+    Compare sentences of the same documents.
+
+    Args:
+        reference (List[List[List[str]]]): for each document its sentences of the parser, a sentence is a list of
+        tokens
+        predicted (List[List[List[str]]]): for each document its sentences of the rules
+
+    Returns:
+        Dict[str, Any]: number of sentences of both methods, precision, recall and F1 of the sentence boundaries,
+        number of the same sentences and the sentences which are different
+    """
+    matched = 0
+    reference_boundaries = 0
+    predicted_boundaries = 0
+    same_sentences = 0
+    differences = []
+
+    for reference_doc, predicted_doc in zip(reference, predicted):
+        reference_tokens = [token for sentence in reference_doc for token in sentence if token.strip()]
+        predicted_tokens = [token for sentence in predicted_doc for token in sentence if token.strip()]
+        if reference_tokens != predicted_tokens:
+            raise Exception('Tokens of the compared documents are different')
+
+        # whitespace tokens are left out, the parser and the rules attach them to different sentences
+        reference_doc = [[token for token in sentence if token.strip()] for sentence in reference_doc]
+        predicted_doc = [[token for token in sentence if token.strip()] for sentence in predicted_doc]
+        reference_doc = [sentence for sentence in reference_doc if len(sentence) > 0]
+        predicted_doc = [sentence for sentence in predicted_doc if len(sentence) > 0]
+
+        reference_starts = set(_starts(reference_doc)[1:])
+        predicted_starts = set(_starts(predicted_doc)[1:])
+        matched += len(reference_starts & predicted_starts)
+        reference_boundaries += len(reference_starts)
+        predicted_boundaries += len(predicted_starts)
+
+        predicted_set = [tuple(sentence) for sentence in predicted_doc]
+        for sentence in reference_doc:
+            if tuple(sentence) in predicted_set:
+                same_sentences += 1
+            else:
+                differences.append(" ".join(sentence))
+
+    precision = matched / predicted_boundaries if predicted_boundaries > 0 else 1.0
+    recall = matched / reference_boundaries if reference_boundaries > 0 else 1.0
+    return {
+        'parser_sentences': sum(len(doc) for doc in reference),
+        'rules_sentences': sum(len(doc) for doc in predicted),
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0,
+        'same_sentences': same_sentences,
+        'different_parser_sentences': differences,
+    }
+
+
+def _best_time(nlp: Language, texts: List[str], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for doc in nlp.pipe(texts):
+            list(doc.sents)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def agreement_report(repeats: int = 3, model: str = "en_core_web_sm") -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    """
+    Compare the rules with the parser on the tests resources.
+
+    Args:
+        repeats (int): each time measurement is repeated and the best time is reported
+        model (str): SpaCy model of the parser
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]: comparison (see *compare*) for each of the sources and the
+        time of both methods (the parser time is None and an error is reported if the model can't be loaded)
+    """
+    rules = rules_nlp()
+    pipelines_dir = os.path.join(RESOURCES_DIR, "test_pipelines")
+
+    reports = {}
+    pos_texts = []
+    for name in sorted(os.listdir(pipelines_dir)):
+        if not name.endswith("_gt.json"):
+            continue
+        with open(os.path.join(pipelines_dir, name.replace("_gt.json", ".txt")), encoding="utf8") as f:
+            text = f.read()
+        with open(os.path.join(pipelines_dir, name), encoding="utf8") as f:
+            reference = [[sentence for sentence, _ in json.load(f)['sentences']]]
+        pos_texts.append(text)
+        reports['saved parser: ' + name] = compare(reference, _sentences(rules, [text]))
+
+    processed_texts = _read_files(os.path.join(RESOURCES_DIR, "test_processors"), "_gt.txt")
+    timing: Dict[str, Union[float, str, None]] = {
+        'characters': sum(len(text) for text in pos_texts + processed_texts),
+        'rules': _best_time(rules, pos_texts + processed_texts, repeats),
+        'parser': None,
+    }
+
+    try:
+        parser = parser_nlp(model)
+    except OSError as e:
+        timing['parser_error'] = "{}: {}".format(type(e).__name__, e)
+        return reports, timing
+
+    for name, texts in [('parser: test_pipelines', pos_texts), ('parser: test_processors', processed_texts)]:
+        reports[name] = compare(_sentences(parser, texts), _sentences(rules, texts))
+    timing['parser'] = _best_time(parser, pos_texts + processed_texts, repeats)
+    return reports, timing
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare rule based sentence segmentation with the SpaCy parser")
+    parser.add_argument("--repeats", type=int, default=3, help="how many times each time measurement is repeated")
+    parser.add_argument("--model", default="en_core_web_sm", help="SpaCy model of the parser")
+    parser.add_argument("--show", action="store_true", help="print parser sentences which the rules split differently")
+    args = parser.parse_args()
+
+    reports, timing = agreement_report(args.repeats, args.model)
+
+    print("{:<40} {:>8} {:>8} {:>9} {:>7} {:>7} {:>6}".format(
+        "source", "parser", "rules", "precision", "recall", "f1", "same"
+    ))
+    for name, report in reports.items():
+        print("{:<40} {:>8} {:>8} {:>9.3f} {:>7.3f} {:>7.3f} {:>6}".format(
+            name,
+            report['parser_sentences'],
+            report['rules_sentences'],
+            report['precision'],
+            report['recall'],
+            report['f1'],
+            report['same_sentences']
+        ))
+        if args.show:
+            for sentence in report['different_parser_sentences']:
+                print("    " + sentence)
+
+    print("\n{} characters, rules {:.2f} ms".format(timing['characters'], timing['rules'] * 1000), end="")
+    if timing['parser'] is not None:
+        print(", parser {:.2f} ms, speedup {:.1f}x".format(timing['parser'] * 1000, timing['parser'] / timing['rules']))
+    else:
+        print(", parser not available ({})".format(timing['parser_error']))
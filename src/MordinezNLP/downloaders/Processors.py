@@ -1,9 +1,6 @@
 import gzip
 from io import BytesIO
 
-from ..parsers import process_pdf
-# from src.MordinezNLP.parsers import process_pdf
-
 
 def text_data_processor(data: BytesIO) -> str:
     """
@@ -29,6 +26,10 @@ def pdf_data_processor(data: BytesIO) -> str:
        str: parsed input, more informations about parsing PDFs can be found in method
         MordinezNLP.parsers.process_pdf
     """
+    # pdfplumber is imported only when PDF files are processed
+    from ..parsers import process_pdf
+    # from src.MordinezNLP.parsers import process_pdf
+
     return "\n".join(process_pdf(data))
 
 
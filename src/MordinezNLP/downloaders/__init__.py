@@ -1,3 +1,10 @@
-from .Basic import BasicDownloader
-from .CommonCrawlDownloader import CommonCrawlDownloader
-from .ElasticSearchDownloader import ElasticSearchDownloader
+from ..utils.lazy_attributes import lazy_attributes
+
+# attributes are imported on the first access, see *MordinezNLP.utils.lazy_attributes*
+__all__ = ['BasicDownloader', 'CommonCrawlDownloader', 'ElasticSearchDownloader']
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'BasicDownloader': '.Basic',
+    'CommonCrawlDownloader': '.CommonCrawlDownloader',
+    'ElasticSearchDownloader': '.ElasticSearchDownloader',
+})
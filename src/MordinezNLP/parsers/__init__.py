@@ -1,2 +1,9 @@
-from .process_pdf import process_pdf
-from .HTML_Parser import HTML_Parser
\ No newline at end of file
+from ..utils.lazy_attributes import lazy_attributes
+
+# attributes are imported on the first access, see *MordinezNLP.utils.lazy_attributes*
+__all__ = ['process_pdf', 'HTML_Parser']
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'process_pdf': '.process_pdf',
+    'HTML_Parser': '.HTML_Parser',
+})
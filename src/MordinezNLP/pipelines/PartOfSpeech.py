@@ -1,17 +1,22 @@
+import itertools
 import os
-from typing import List, Union, Generator, Tuple, Dict
+from collections import OrderedDict
+from typing import List, Union, Generator, Tuple, Dict, Iterable
 
 import spacy
-import stanza
 from spacy.language import Language
-from spacy.tokens import Token
+from spacy.tokens import Doc, Token
 from tqdm.auto import tqdm
 
 try:
-    from src.MordinezNLP.tokenizers import spacy_tokenizer
+    from src.MordinezNLP.pipelines.PosBackends import PosBackend, StanzaBackend, SpacyBackend
+    from src.MordinezNLP.pipelines.PosCache import PosCache
+    from src.MordinezNLP.tokenizers import spacy_tokenizer, spacy_sentencizer
     from src.MordinezNLP.utils import pos_replacement_list, token_replacement_list
 except:
-    from ..tokenizers import spacy_tokenizer
+    from .PosBackends import PosBackend, StanzaBackend, SpacyBackend
+    from .PosCache import PosCache
+    from ..tokenizers import spacy_tokenizer, spacy_sentencizer
     from ..utils import pos_replacement_list, token_replacement_list
 
 
@@ -20,17 +25,53 @@ class PartOfSpeech:
     The aim of the class is to tag each token (which comes from MordinezNLP processors) with its POS tag.
     """
 
-    def __init__(self, nlp: Language, language: str = 'en'):
+    def __init__(
+            self,
+            nlp: Language,
+            language: str = 'en',
+            sentence_segmentation: str = 'parser',
+            backend: Union[str, PosBackend] = 'stanza'
+    ):
         """
         Initializer of spacy and stanza models.
 
+        SpaCy pipeline is used only to tokenize texts and to split them into sentences. By default sentences come from
+        the dependency parser. *sentence_segmentation='rules'* replaces the parser with the rule based
+        *MordinezNLP.tokenizers.spacy_sentencizer*, which knows about special tokens and disables the parser and
+        tok2vec, so tokenization is many times faster. Sentences may be a little different than sentences of the
+        parser, run *python -m benchmarks.sentences* to compare them.
+
+        Tokens are tagged by a *backend* (see *MordinezNLP.pipelines.PosBackends*):
+         - 'stanza' (default) - the Stanza neural tagger, the most accurate, but on CPU the slowest part of the
+           processing,
+         - 'spacy' - POS tags of the SpaCy pipeline (*token.pos_*), its tagger and attribute ruler are kept enabled.
+           It is many times faster on CPU and doesn't need Stanza, but tags are a little less accurate, run
+           *python -m benchmarks.pos_backends* to compare both backends on Your data. With
+           *sentence_segmentation='rules'* only the parser is disabled, the tagger needs tok2vec.
+
+        You can pass Your own *PosBackend* object too.
+
         Remember to download Stanza model with ```stanza.download('en')```
         Args:
             nlp (Language): a SpaCy Language object -> You have to load spacy model on Your own
             language (str): a language code from stanza -> see https://stanfordnlp.github.io/stanza/available_models.html
+            sentence_segmentation (str): 'parser' or 'rules', how texts are split into sentences
+            backend (Union[str, PosBackend]): 'stanza', 'spacy' or a *PosBackend* object, which tags the tokens
         """
+        if sentence_segmentation not in ['parser', 'rules']:
+            raise Exception(
+                'Unknown sentence segmentation "{}", use "parser" or "rules"'.format(sentence_segmentation)
+            )
+
+        if backend == 'stanza':
+            backend = StanzaBackend(language)
+        elif backend == 'spacy':
+            backend = SpacyBackend()
+        elif not isinstance(backend, PosBackend):
+            raise Exception('Unknown POS backend "{}", use "stanza", "spacy" or a PosBackend object'.format(backend))
+
         self.spacy_nlp = nlp
-        self.nlp_stanza = None
+        self.backend = backend
 
         self.language = language
 
@@ -46,23 +87,47 @@ class PartOfSpeech:
         ]
 
         for module in modules_to_disable:
-            self.spacy_nlp.disable_pipe(module)
+            if module not in self.backend.spacy_components:
+                self.spacy_nlp.disable_pipe(module)
+        for module in self.backend.spacy_components:
+            if module in self.spacy_nlp.disabled:
+                self.spacy_nlp.enable_pipe(module)
+
+        self.sentence_segmentation = sentence_segmentation
+        if sentence_segmentation == 'rules':
+            spacy_sentencizer(self.spacy_nlp, keep_components=self.backend.spacy_components)
+
+    @property
+    def nlp_stanza(self):
+        """
+        The Stanza pipeline of the Stanza backend, None if it is not built yet or if an other backend is used.
+        """
+        return getattr(self.backend, 'pipeline', None)
+
+    @nlp_stanza.setter
+    def nlp_stanza(self, pipeline):
+        if not isinstance(self.backend, StanzaBackend):
+            raise Exception('Stanza pipeline can be set only for the "stanza" backend')
+        self.backend.pipeline = pipeline
 
     def process(
             self,
-            texts: List[str],
+            texts: Iterable[str],
             tokenizer_threads: int = 8,
             tokenizer_batch_size: int = 50,
             pos_batch_size: int = 3000,
             pos_replacement_list: Union[Dict[str, str], None] = None,
             token_replacement_list: Union[Dict[str, str], None] = None,
             return_docs: bool = False,
-            return_string_tokens: bool = False
+            return_string_tokens: bool = False,
+            window: Union[int, None] = None,
+            cache: Union[PosCache, None] = None,
+            pos_batch_tokens: Union[int, None] = None
     ) -> Union[Generator[Tuple[List[Union[Token, str]], List[str]], None, None], Generator[
         Tuple[List[List[Union[Token, str]]], List[List[str]]], None, None]]:
         """
         Main processing function. First step is to tokenize a list of input texts to sentences and then to the tokens.
-        Then such input goes to the StanzaNLP.
+        Then such input goes to the POS tagging backend (StanzaNLP by default).
 
         For the function List[str] object which comes as an input is a list of docs to process. Each item
         in a list is a document (SpaCy logic in pipelines). In such case You can specify if You want to
@@ -78,8 +143,26 @@ class PartOfSpeech:
         Each token parsed by SpaCy tokenizer will by converted to its normal version. For example each *n't* will be replaced
         by *not*.
 
+        By default all of the texts are tokenized first and then all of the sentences are POS tagged at once, so nothing
+        is returned until the whole input is tagged and tokens of all of the texts are kept in memory. Pass *window* to
+        stream a large input (eg. lines of a file): texts are tokenized and tagged in windows of *window* documents, so
+        tagged documents of a window are returned as soon as the window is done and only a single window is kept in
+        memory. SpaCy tokenizes the next texts in its own processes while a window is tagged (if *tokenizer_threads* is
+        greater than 1). The output is in the same order as the input in both modes.
+
+        Corpora which repeat the same sentences (eg. web pages with the same footers) can be tagged with a *cache*, see
+        *PosCache*.
+
+        By default sentences of a window are sent to the backend in a single call. With *pos_batch_tokens* they are
+        sorted by the number of tokens and split into calls of similar length sentences, each of them at most
+        *pos_batch_tokens* tokens long when its sentences are padded to the longest one (a longer sentence is tagged
+        on its own). A few very long sentences (eg. rows of scraped tables) don't make the batches of short sentences
+        bigger then and a single call of Stanza never gets the whole window, which bounds its memory. Tags are returned
+        in the original order. Run *python -m benchmarks.pos_batching* to choose the value for Your data.
+
         Args:
-            texts (List[str]): an input texts, each item in a list is a document (SpaCy logic in pipelines)
+            texts (Iterable[str]): an input texts, each item in a list is a document (SpaCy logic in pipelines), it can
+            be any iterable (eg. an opened file) if *window* is set
             tokenizer_threads (int): How many threads You want to use in SpaCy tokenization
             tokenizer_batch_size (int): Batch size for SpaCy tokenizer
             pos_batch_size (int) = Batch size for Stanza POS tagger (if enabled). Be careful! It uses GPU if cuda is available in Your system.
@@ -90,37 +173,214 @@ class PartOfSpeech:
             return_docs (bool): If True function will keep a "documents" layer on output.
             return_string_tokens (bool): Function can return tokens as SpaCy Token object (if You need to access token
             specified data such as norm_) or can return tokens as a string object. If True returns a string tokens.
+            window (Union[int, None]): how many documents are tokenized and tagged together, if None, the whole input
+            is a single window. Bigger windows make better use of *pos_batch_size*, smaller use less memory.
+            cache (Union[PosCache, None]): A cache of POS tags of sentences. Only sentences which are not in the cache
+            are tagged by the backend (each of them once in a window) and their tags are added to the cache.
+            pos_batch_tokens (Union[int, None]): the maximum number of padded tokens in a single call of the backend,
+            if None, all of the sentences of a window are tagged in a single call.
 
         Returns:
             Union[Generator[Tuple[List[Union[Token, str]], List[str]], None, None], Generator[Tuple[List[List[Union[Token, str]]], List[List[str]]],
             None, None]]: a list of doc(if return docs is set) with list of sentences with list of tokens and its pos tags.
         """
-        sentences: List[List[str]] = []
-        sentence_to_doc_mapping: List[tuple] = []
+        if window is not None and window < 1:
+            raise Exception('Window has to be a positive number')
+        if pos_batch_tokens is not None and pos_batch_tokens < 1:
+            raise Exception('POS batch tokens has to be a positive number')
 
         function_pos_replacement_list = self.pos_replacement_list if pos_replacement_list is None else pos_replacement_list
         function_token_replacement_list = self.token_replacement_list if token_replacement_list is None else token_replacement_list
 
-        # stanza
-        if self.nlp_stanza is None:
-            self.nlp_stanza = stanza.Pipeline(
-                lang=self.language,
-                tokenize_pretokenized=True,
-                processors='tokenize, pos',
-                pos_batch_size=pos_batch_size,
-                logging_level='CRITICAL'
-            )
+        # models of the backend, they are loaded once even if many threads call the function at the same time
+        self.backend.load(pos_batch_size)
 
-        # tokenize
+        # tokenize, SpaCy reads the texts lazily
         pipe = self.spacy_nlp.pipe(
             texts,
             n_process=tokenizer_threads,
             batch_size=tokenizer_batch_size
         )
+        docs = iter(tqdm(pipe, desc='Tokenizing', total=len(texts) if hasattr(texts, '__len__') else None))
+
+        if window is None:
+            windows = [docs]
+        else:
+            windows = iter(lambda: list(itertools.islice(docs, window)), [])
+
+        print('POS tagging data, it can take up to couple hours, but also it can take just a seconds, everything '
+              'depends how much data You feed.')
+        for window_docs in windows:
+            yield from self._tag_documents(
+                window_docs,
+                function_pos_replacement_list,
+                function_token_replacement_list,
+                return_docs,
+                return_string_tokens,
+                cache,
+                pos_batch_tokens
+            )
+
+    def _tag_sentences(
+            self,
+            sentences: List[List[str]],
+            raw_sentences_with_tokens: List[List[Token]],
+            function_pos_replacement_list: Dict[str, str],
+            function_token_replacement_list: Dict[str, str],
+            pos_batch_tokens: Union[int, None] = None
+    ) -> List[List[str]]:
+        """
+        POS tag pretokenized sentences with the backend and apply the replacement lists.
+
+        Args:
+            sentences (List[List[str]]): pretokenized sentences
+            raw_sentences_with_tokens (List[List[Token]]): the same sentences with SpaCy tokens
+            function_pos_replacement_list (Dict[str, str]): the same as *pos_replacement_list* in *process*
+            function_token_replacement_list (Dict[str, str]): the same as *token_replacement_list* in *process*
+            pos_batch_tokens (Union[int, None]): the same as in the *process* function
+
+        Returns:
+            List[List[str]]: POS tags of the tokens of each of the sentences
+        """
+        poss: List[List[str]] = []
+
+        if pos_batch_tokens is None:
+            tagged = self.backend.tag(sentences, raw_sentences_with_tokens)
+        else:
+            tagged = [None] * len(sentences)
+            for batch in self._length_batches(sentences, pos_batch_tokens):
+                batch_tagged = self.backend.tag(
+                    [sentences[i] for i in batch],
+                    [raw_sentences_with_tokens[i] for i in batch]
+                )
+                # back to the original positions
+                for i, sentence_tags in zip(batch, batch_tagged):
+                    tagged[i] = sentence_tags
+
+        for sentence in tagged:
+            sentence_pos = []
+            for word, upos in sentence:
+                if word in function_token_replacement_list.keys():
+                    # print('tag replacement', word, function_token_replacement_list[word])
+                    sentence_pos.append(function_token_replacement_list[word])
+                else:
+                    sentence_pos.append(function_pos_replacement_list[upos])
+            poss.append(sentence_pos)
+        return poss
+
+    @staticmethod
+    def _length_batches(sentences: List[List[str]], pos_batch_tokens: int) -> List[List[int]]:
+        """
+        Sort sentences by the number of tokens and split them into batches, a batch padded to its longest sentence
+        has at most *pos_batch_tokens* tokens. A sentence longer than *pos_batch_tokens* is a batch on its own.
+
+        Args:
+            sentences (List[List[str]]): pretokenized sentences
+            pos_batch_tokens (int): the maximum number of padded tokens in a batch
+
+        Returns:
+            List[List[int]]: indexes of the sentences in each of the batches
+        """
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        # sorted is stable, sentences of the same length stay in the original order
+        for i in sorted(range(len(sentences)), key=lambda index: len(sentences[index])):
+            # sentences are sorted, so the current sentence is the longest one in the batch
+            if len(batch) > 0 and (len(batch) + 1) * len(sentences[i]) > pos_batch_tokens:
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+        if len(batch) > 0:
+            batches.append(batch)
+        return batches
+
+    def _tag_sentences_with_cache(
+            self,
+            sentences: List[List[str]],
+            raw_sentences_with_tokens: List[List[Token]],
+            function_pos_replacement_list: Dict[str, str],
+            function_token_replacement_list: Dict[str, str],
+            cache: PosCache,
+            pos_batch_tokens: Union[int, None] = None
+    ) -> List[List[str]]:
+        """
+        The same as *_tag_sentences*, but POS tags of sentences are taken from the cache if they are there. Only the
+        cache misses are sent to the backend, each of them once even if it is repeated in the sentences, and their
+        tags are added to the cache.
+
+        Args:
+            sentences (List[List[str]]): pretokenized sentences
+            raw_sentences_with_tokens (List[List[Token]]): the same sentences with SpaCy tokens
+            function_pos_replacement_list (Dict[str, str]): the same as *pos_replacement_list* in *process*
+            function_token_replacement_list (Dict[str, str]): the same as *token_replacement_list* in *process*
+            cache (PosCache): a cache of POS tags
+            pos_batch_tokens (Union[int, None]): the same as in the *process* function
+
+        Returns:
+            List[List[str]]: POS tags of the tokens of each of the sentences
+        """
+        tagging_key = cache.tagging_key(
+            self.language,
+            function_pos_replacement_list,
+            function_token_replacement_list,
+            self.backend.name
+        )
+        keys = [cache.sentence_key(sentence, tagging_key) for sentence in sentences]
+        poss = cache.get_tags(keys)
+
+        # indexes of the sentences which are not cached, grouped by the key
+        missing: Dict[str, List[int]] = OrderedDict()
+        for i, key in enumerate(keys):
+            if poss[i] is None:
+                missing.setdefault(key, []).append(i)
+
+        if len(missing) > 0:
+            tagged = self._tag_sentences(
+                [sentences[indexes[0]] for indexes in missing.values()],
+                [raw_sentences_with_tokens[indexes[0]] for indexes in missing.values()],
+                function_pos_replacement_list,
+                function_token_replacement_list,
+                pos_batch_tokens
+            )
+            for indexes, sentence_pos in zip(missing.values(), tagged):
+                for i in indexes:
+                    poss[i] = list(sentence_pos)
+            cache.set_tags(zip(missing.keys(), tagged))
+        return poss
 
+    def _tag_documents(
+            self,
+            docs: Iterable[Doc],
+            function_pos_replacement_list: Dict[str, str],
+            function_token_replacement_list: Dict[str, str],
+            return_docs: bool,
+            return_string_tokens: bool,
+            cache: Union[PosCache, None] = None,
+            pos_batch_tokens: Union[int, None] = None
+    ) -> Union[Generator[Tuple[List[Union[Token, str]], List[str]], None, None], Generator[
+        Tuple[List[List[Union[Token, str]]], List[List[str]]], None, None]]:
+        """
+        POS tag sentences of tokenized documents with a single call of the backend (or with calls of at most
+        *pos_batch_tokens* padded tokens), used by *process* for each of the windows.
+
+        Args:
+            docs (Iterable[Doc]): documents tokenized by SpaCy
+            function_pos_replacement_list (Dict[str, str]): the same as *pos_replacement_list* in *process*
+            function_token_replacement_list (Dict[str, str]): the same as *token_replacement_list* in *process*
+            return_docs (bool): the same as in the *process* function
+            return_string_tokens (bool): the same as in the *process* function
+            cache (Union[PosCache, None]): the same as in the *process* function
+            pos_batch_tokens (Union[int, None]): the same as in the *process* function
+
+        Returns:
+            Union[Generator[Tuple[List[Union[Token, str]], List[str]], None, None], Generator[Tuple[List[List[Union[Token, str]]], List[List[str]]],
+            None, None]]: the same as the *process* function, for the documents
+        """
+        sentences: List[List[str]] = []
+        sentence_to_doc_mapping: List[tuple] = []
         raw_sentences_with_tokens: List[List[Token]] = []
 
-        for doc_num, doc in enumerate(tqdm(pipe, desc='Tokenizing', total=len(texts))):
+        for doc in docs:
             sent_begin_index = len(sentences)
             for sent_num, sent in enumerate(doc.sents):
                 sentence = []
@@ -141,21 +401,24 @@ class PartOfSpeech:
                 raw_sentences_with_tokens.append(raw_sentence_tokens)
             sentence_to_doc_mapping.append((sent_begin_index, len(sentences)))
 
-        poss: List[List[str]] = []
-
         # pos
-        print('POS tagging data, it can take up to couple hours, but also it can take just a seconds, everything '
-              'depends how much data You feed.')
-        stanza_pipe = self.nlp_stanza(sentences)
-        for sentence in stanza_pipe.sentences:
-            sentence_pos = []
-            for token in sentence.words:
-                if str(token.text) in function_token_replacement_list.keys():
-                    # print('tag replacement', token, function_token_replacement_list[token.text])
-                    sentence_pos.append(function_token_replacement_list[token.text])
-                else:
-                    sentence_pos.append(function_pos_replacement_list[token.upos])
-            poss.append(sentence_pos)
+        if cache is None:
+            poss = self._tag_sentences(
+                sentences,
+                raw_sentences_with_tokens,
+                function_pos_replacement_list,
+                function_token_replacement_list,
+                pos_batch_tokens
+            )
+        else:
+            poss = self._tag_sentences_with_cache(
+                sentences,
+                raw_sentences_with_tokens,
+                function_pos_replacement_list,
+                function_token_replacement_list,
+                cache,
+                pos_batch_tokens
+            )
 
         if return_docs:
             for sentence_begin_index, sentence_end_index in sentence_to_doc_mapping:
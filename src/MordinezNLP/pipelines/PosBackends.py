@@ -0,0 +1,98 @@
+import threading
+from typing import List, Tuple
+
+from spacy.tokens import Token
+
+
+class PosBackend:
+    """
+    A POS tagger used by *PartOfSpeech*. SpaCy tokenizes texts and splits them into sentences, then a backend tags
+    the tokens of each of the sentences with Universal POS tags (UPOS), *PartOfSpeech* maps the tags with its
+    replacement lists.
+
+    Subclasses implement *tag* and can set:
+     - *name*, it is a part of the *PosCache* keys, so tags of different backends are not mixed,
+     - *spacy_components*, SpaCy pipeline components which the backend needs, *PartOfSpeech* doesn't disable them.
+    """
+
+    name: str = ''
+    spacy_components: Tuple[str, ...] = ()
+
+    def load(self, pos_batch_size: int):
+        """
+        Load models of the backend, called by *PartOfSpeech.process* before texts are tokenized.
+
+        Args:
+            pos_batch_size (int): POS tagging batch size
+        """
+
+    def tag(self, sentences: List[List[str]], spacy_sentences: List[List[Token]]) -> List[List[Tuple[str, str]]]:
+        """
+        Tag pretokenized sentences.
+
+        Args:
+            sentences (List[List[str]]): sentences with string tokens ("n't" is already replaced with "not")
+            spacy_sentences (List[List[Token]]): the same sentences with SpaCy tokens
+
+        Returns:
+            List[List[Tuple[str, str]]]: for each of the sentences pairs of a word and its UPOS tag
+        """
+        raise NotImplementedError
+
+
+class StanzaBackend(PosBackend):
+    """
+    Stanza neural POS tagger. It is the most accurate backend, but on CPU it is much slower than the SpaCy
+    tokenization. The Stanza pipeline is built on the first use, once even if many threads need it at the same time.
+    """
+
+    name = 'stanza'
+
+    def __init__(self, language: str = 'en'):
+        """
+        Args:
+            language (str): a language code from stanza -> see https://stanfordnlp.github.io/stanza/available_models.html
+        """
+        self.language = language
+        self.pipeline = None
+        self._lock = threading.Lock()
+
+    def load(self, pos_batch_size: int):
+        if self.pipeline is None:
+            with self._lock:
+                if self.pipeline is None:
+                    # Stanza imports torch, so it is imported only when the pipeline is built
+                    import stanza
+
+                    self.pipeline = stanza.Pipeline(
+                        lang=self.language,
+                        tokenize_pretokenized=True,
+                        processors='tokenize, pos',
+                        pos_batch_size=pos_batch_size,
+                        logging_level='CRITICAL'
+                    )
+
+    def tag(self, sentences: List[List[str]], spacy_sentences: List[List[Token]]) -> List[List[Tuple[str, str]]]:
+        stanza_pipe = self.pipeline(sentences)
+        return [[(str(word.text), word.upos) for word in sentence.words] for sentence in stanza_pipe.sentences]
+
+
+class SpacyBackend(PosBackend):
+    """
+    POS tags (*token.pos_*) of the SpaCy pipeline, which tokenizes the texts anyway. The tagger of the trained SpaCy
+    pipelines runs on the tok2vec layer computed for the parser, so tags cost very little, but they are less accurate
+    than tags of Stanza. The tagger (or the morphologizer) and the attribute ruler, which maps tags to UPOS, are kept
+    enabled.
+    """
+
+    name = 'spacy'
+    spacy_components = ('tok2vec', 'tagger', 'morphologizer', 'attribute_ruler')
+
+    def tag(self, sentences: List[List[str]], spacy_sentences: List[List[Token]]) -> List[List[Tuple[str, str]]]:
+        tagged = []
+        for sentence, spacy_sentence in zip(sentences, spacy_sentences):
+            sentence_tags = [(word, token.pos_) for word, token in zip(sentence, spacy_sentence)]
+            if any(upos == '' for _, upos in sentence_tags):
+                raise Exception('SpaCy pipeline doesn\'t set POS tags, load a trained SpaCy model with a tagger')
+            tagged.append(sentence_tags)
+        return tagged
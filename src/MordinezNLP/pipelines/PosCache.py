@@ -0,0 +1,126 @@
+import hashlib
+import json
+from typing import List, Union, Dict, Iterable, Tuple
+
+try:
+    from src.MordinezNLP.utils.TwoTierCache import TwoTierCache
+except:
+    from MordinezNLP.utils.TwoTierCache import TwoTierCache
+
+
+class PosCache(TwoTierCache):
+    """
+    A two-tier cache of POS tags of sentences, used by *PartOfSpeech.process* (and by *BasicProcessor.process* with
+    *pos_cache*) to skip tagging of sentences which were already tagged. Web corpora repeat the same sentences very
+    often (eg. "Click here to subscribe." or legal footers), and the Stanza tagger is the slowest part of the
+    processing.
+
+    Tiers are described in *MordinezNLP.utils.TwoTierCache*: an in-memory LRU cache of *memory_items* sentences and an optional sqlite
+    database which survives restarts and can be shared by many processes (eg. workers which tag parts of the same
+    corpus, each of them creates its own cache with the same *db_path*).
+
+    Keys are built from the pretokenized sentence, the language, both replacement lists and the name of the POS
+    tagging backend, so sentences tagged with other options are different entries. You have to *clear* the on-disk
+    cache after updating Stanza or SpaCy models.
+
+    Besides the statistics of *TwoTierCache*, *stats* returns the number of sentences tagged by the backend
+    ("tagged_sentences"). A sentence repeated in a single call of *PartOfSpeech.process* is tagged once, but each of its
+    repetitions is a cache miss.
+
+    ::
+
+        cache = PosCache(memory_items=1000000, db_path="pos_cache.sqlite")
+        tagged = list(pos_tagger.process(texts, cache=cache))
+        print(cache.stats())
+    """
+
+    # bump it when the output of the POS tagging changes, so old on-disk entries are not used
+    format_version: int = 1
+
+    def __init__(
+            self,
+            memory_items: int = 1000000,
+            db_path: Union[str, None] = None,
+            disk_items: Union[int, None] = 100000000
+    ):
+        """
+        Args:
+            memory_items (int): how many sentences are kept in the in-memory tier
+            db_path (Union[str, None]): a path to the sqlite database of the on-disk tier, if None, only the
+            in-memory tier is used
+            disk_items (Union[int, None]): how many sentences are kept in the on-disk tier, if None, the on-disk tier
+            is never evicted
+        """
+        super().__init__(memory_items=memory_items, db_path=db_path, disk_items=disk_items)
+        self._stats['tagged_sentences'] = 0
+
+    def tagging_key(
+            self,
+            language: str,
+            pos_replacement_list: Dict[str, str],
+            token_replacement_list: Dict[str, str],
+            backend: str = 'stanza'
+    ) -> str:
+        """
+        Build a hash of the POS tagging options.
+
+        Args:
+            language (str): a language of the Stanza pipeline
+            pos_replacement_list (Dict[str, str]): POS tags replacements used by the tagger
+            token_replacement_list (Dict[str, str]): token replacements used by the tagger
+            backend (str): a name of the POS tagging backend
+
+        Returns:
+            str: hash of the options
+        """
+        options = (
+            self.format_version,
+            language,
+            sorted(pos_replacement_list.items()),
+            sorted(token_replacement_list.items())
+        )
+        if backend != 'stanza':
+            # keys of the Stanza backend are the same as before the backends were added
+            options += (backend,)
+        description = repr(options)
+        return hashlib.blake2b(description.encode('utf8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def sentence_key(sentence: List[str], tagging_key: str) -> str:
+        """
+        Build a cache key of a sentence tagged with the options.
+
+        Args:
+            sentence (List[str]): tokens of a pretokenized sentence
+            tagging_key (str): hash of the options built by *tagging_key*
+
+        Returns:
+            str: cache key
+        """
+        return TwoTierCache.make_key(json.dumps(sentence, ensure_ascii=False), tagging_key)
+
+    def get_tags(self, keys: List[str]) -> List[Union[List[str], None]]:
+        """
+        Get cached POS tags of sentences.
+
+        Args:
+            keys (List[str]): cache keys built by *sentence_key*
+
+        Returns:
+            List[Union[List[str], None]]: POS tags of the tokens of each sentence in the same order as keys, None for
+            sentences which are not cached
+        """
+        return [None if value is None else json.loads(value) for value in self.get_many(keys)]
+
+    def set_tags(self, items: Iterable[Tuple[str, List[str]]]):
+        """
+        Add POS tags of sentences to the cache.
+
+        Args:
+            items (Iterable[Tuple[str, List[str]]]): pairs of a cache key built by *sentence_key* and POS tags of the
+            tokens of the sentence
+        """
+        items = [(key, json.dumps(tags, ensure_ascii=False)) for key, tags in items]
+        with self._lock:
+            self._stats['tagged_sentences'] += len(items)
+            self.set_many(items)
@@ -1 +1,12 @@
-from .PartOfSpeech import PartOfSpeech
+from ..utils.lazy_attributes import lazy_attributes
+
+# attributes are imported on the first access, see *MordinezNLP.utils.lazy_attributes*
+__all__ = ['PartOfSpeech', 'PosCache', 'PosBackend', 'StanzaBackend', 'SpacyBackend']
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'PartOfSpeech': '.PartOfSpeech',
+    'PosCache': '.PosCache',
+    'PosBackend': '.PosBackends',
+    'StanzaBackend': '.PosBackends',
+    'SpacyBackend': '.PosBackends',
+})
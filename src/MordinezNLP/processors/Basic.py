@@ -1,152 +1,125 @@
 import itertools
 import os
 import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import Executor
+from concurrent.futures.process import ProcessPoolExecutor
 from concurrent.futures.thread import ThreadPoolExecutor
 from itertools import repeat
 from multiprocessing import Pool
-from typing import List, Callable, Union
+from typing import List, Callable, Union, Iterable, Generator, Tuple
 
-import spacy
-from cleantext import clean
-from tqdm.auto import tqdm
 from ftfy import fix_text
+from tqdm.auto import tqdm
 
 try:
-    from src.MordinezNLP.pipelines import PartOfSpeech
-    from src.MordinezNLP.tokenizers import spacy_tokenizer
-    from src.MordinezNLP.utils import pos_replacement_list
+    from src.MordinezNLP.pipelines.PosCache import PosCache
+    from src.MordinezNLP.processors.DocumentGuard import DocumentGuard
+    from src.MordinezNLP.processors.EntityTagger import EntityTagger
+    from src.MordinezNLP.processors.LanguageResources import LanguageResources, language_days, language_months, \
+        numerals, ordinals, date_ordinals
+    from src.MordinezNLP.processors.ProcessingPlan import ProcessingPlan, Rule
+    from src.MordinezNLP.processors.ResultCache import ResultCache
+    from src.MordinezNLP.processors.RuleProfiler import RuleProfiler
+    from src.MordinezNLP.processors.Segments import split_into_segments, join_segments
+    from src.MordinezNLP.processors.UnicodeRepair import needs_unicode_repair, repair_unicode
+    from src.MordinezNLP.utils import pos_replacement_list, size_aware_chunks
 except:
-    from MordinezNLP.tokenizers import spacy_tokenizer
-    from MordinezNLP.pipelines import PartOfSpeech
-    from MordinezNLP.utils import pos_replacement_list
+    from MordinezNLP.pipelines.PosCache import PosCache
+    from MordinezNLP.processors.DocumentGuard import DocumentGuard
+    from MordinezNLP.processors.EntityTagger import EntityTagger
+    from MordinezNLP.processors.LanguageResources import LanguageResources, language_days, language_months, \
+        numerals, ordinals, date_ordinals
+    from MordinezNLP.processors.ProcessingPlan import ProcessingPlan, Rule
+    from MordinezNLP.processors.ResultCache import ResultCache
+    from MordinezNLP.processors.RuleProfiler import RuleProfiler
+    from MordinezNLP.processors.Segments import split_into_segments, join_segments
+    from MordinezNLP.processors.UnicodeRepair import needs_unicode_repair, repair_unicode
+    from MordinezNLP.utils import pos_replacement_list, size_aware_chunks
+
+
+@lru_cache(maxsize=1024)
+def _multiple_characters_entity_regex(entity: str):
+    """
+    Build a regex which matches a word with at least 3 repeated *entity* characters. Groups are: part of the word
+    before the repeated characters, repeated characters and part of the word after them.
+
+    Args:
+        entity (str): a repeated character
+
+    Returns:
+        Pattern: compiled regex
+    """
+    # secure entity if it is a regex character
+    entity_to_find = re.escape(entity)
+    return re.compile(
+        "([^" + entity_to_find + r"^\s.]*)([" + entity_to_find + "]{3,})([^" + entity_to_find + r"^\s.]*)"
+    )
 
 
 class BasicProcessor:
     """
     The aim of the class is to make use of NLP-dirty texts
+
+    SpaCy pipeline and POS tagger are loaded on the first use (eg. by *process* with *use_pos_tagging=True*), so
+    processing without POS tagging doesn't load any models. Use *warmup* to load them upfront.
+
+    A single processor can be used by many threads at once (eg. by all of the threads of a web service), each call of
+    *process* keeps its state (the processing plan, its options and special tokens) in local variables. Compiled plans
+    and the models are shared, models are loaded once even if many threads need them at the same time.
     """
 
-    def __init__(self, language: str = 'en'):
+    # how many compiled processing plans are kept by a single processor
+    plans_cache_size: int = 64
+
+    # SpaCy models used for each of the languages
+    spacy_models = {
+        'en': "en_core_web_sm",
+        'de': "de_core_news_sm",
+    }
+
+    def __init__(self, language: str = 'en', sentence_segmentation: str = 'parser', pos_backend: str = 'stanza'):
         """
         Initializer of all of regexes, to make processing function as fast as possible
 
         Args:
             language (str): a language shortcut in which we want to clean the input text
+            sentence_segmentation (str): how texts are split into sentences for POS tagging, 'parser' uses the SpaCy
+            dependency parser, 'rules' uses a faster rule based sentencizer (see *PartOfSpeech*)
+            pos_backend (str): which POS tagger is used, 'stanza' or 'spacy', which is much faster on CPU, but a little
+            less accurate (see *PartOfSpeech*)
         """
         self.language = language
+        self.sentence_segmentation = sentence_segmentation
+        self.pos_backend = pos_backend
 
         # check language
         if language not in ['en', 'de']:
             raise Exception('Cant\'t load language specified data')
-
-        # load SpaCy
-        if language == 'en':
-            self.nlp = spacy.load("en_core_web_sm")
-        if language == 'de':
-            self.nlp = spacy.load("de_core_news_sm")
-
-        # get tokenizer
-        self.nlp.tokenizer = spacy_tokenizer(self.nlp)
-
-        # pos tagger
-        self.pos_tagger = PartOfSpeech(
-            self.nlp,
-            self.language
-        )
-
-        # create pos replacement list from basic list
-        self._pos_replacement_list_ = pos_replacement_list
-        self._pos_replacement_list_['NUM'] = 'NUM'
-
-        # ==== BASE PROCESSING RULES SECTION ====
-        # remove everything what is in a html tags
-        self.base_brackets_regex = re.compile(r"<([^\s]*)>")
-        # replace sequence of digit more/more or equal than digit to <digit> <more> <digit>
-        self.more_than_regex = re.compile(r"\d+\s*(>|>=)\s*\d+")
-        # replace sequence of digit less/less or equal than digit to <digit> <less> <digit>
-        self.less_than_regex = re.compile(r"\d+\s*(<|<=)\s*\d+")
-
-        # process lists
-        #                                           /---- Positive and Negative Lookbehind
-        self.list_last_item_regex = re.compile(r"(?<=\n)(-|>)\s*([^,\n]*)\n([^-^>]|$)")
-        #                                       /---- Positive and Negative Lookbehind
-        self.list_item_regex = re.compile(r"(?<=\n)(-|>)\s*([^,\n]*),*\n")
-
-        # fix a>>>>> <<<<another>>  ->   a another
-        self.fix_base_brackets_1 = re.compile(r"(\s+(<|>)+\s+)|(\s+>+)+|(<+\s+)+|(\s+(<|>){2,}\s+)")
-        # fix other> -> other
-        self.fix_base_brackets_2_left = re.compile(r"(\s+([a-zA-Z0-9äöüÄÖÜßùàûâüæÿçéèêëïîôœ,.()!?\-:']+)(>+)\s+)")
-        # fix <and -> and
-        self.fix_base_brackets_2_right = re.compile(r"(\s+(<+)([a-zA-Z0-9äöüÄÖÜßùàûâüæÿçéèêëïîôœ,.()!?\-:']+)\s+)")
-
-        # fix la<te don>'t  ->  late don't
-        self.fix_brackets_in_words = re.compile(r"\s+(([^\s^<^>])+)(<|>)+(([^\s^<^>])+)\s+")
-
-        # limit to a specified set of characters
-        self.limit_regex = re.compile(r"(([^a-zA-Z0-9,\.<> !?äöüÄÖÜßùàûâüæÿçéèêëïîôœ@\-:()\[\]'])|([^\s]{30,}))",
-                                      re.IGNORECASE)
-
-        # replace more than 2 spaces to a single one
-        self.space_regex = re.compile(r"(\s{2,})")
-        # split each word which has two uppercase letters ReCure -> Re Cure
-        self.double_upper_case_letters = re.compile(r"([A-Z][^\s^A-Z^\-^.^,^?^!]+)([A-Z][^\s^A-Z^\-^.^,^?^!]+)")
-        # escape eveything what is in brackets
-        self.none_regex = re.compile(r"(\s*(((\()([^\)]+)(\)))|((\[)([^\]]+)(\])))\s*)", re.IGNORECASE)
-
-        # place space before and after all digits
-        self.no_space_digits_regex = re.compile(r"(\d+)(th|st|nd|rd)*")
-
-        # match space before punct
-        self.space_and_punct = re.compile(r"(\s+)([?!.,:])")
-
-        # replace all custom tags where one exists after one to a single one, from <date> <date>    <date> -> <date>
-        self.multi_tag_regex = re.compile(
-            r"(((<currency>[\s,]*){2,})|((<date>[\s,]*){2,})|((<unk>[\s,]*){2,})|((<number>[\s,]*){2,})|((<url>[\s,]*){2,})|((<email>[\s,]*){2,})|((<less>[\s,]*){2,})|((<more>[\s,]*){2,})|((<bracket>[\s,]*){2,}))",
-            re.IGNORECASE)
-        # replace special token occurences one by one with colons
-        self.multi_tag_colon_regex = re.compile(
-            r"(((<currency>[:]*){2,})|((<date>[:]*){2,})|((<unk>[:]*){2,})|((<number>[:]*){2,})|((<url>[:]*){2,})|((<email>[:]*){2,})|((<less>[:]*){2,})|((<more>[:]*){2,})|((<bracket>[:]*){2,}))",
-            re.IGNORECASE)
-
-        # remove starting space
-        self.starting_space_regex = re.compile(r"^(\s)+", re.IGNORECASE)
-        # remove ending space
-        self.ending_space_regex = re.compile(r"(\s)+$", re.IGNORECASE)
-
-        # match emails
-        self.email_regex = re.compile(
-            r"[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*")
-        # match urls and emails that where not matched by a *self.email_regex*
-        self.url_email_regex = re.compile(
-            r"(https?:\/\/)?(www\.)?[-a-zA-Z0-9@:%._\+~#=]{2,256}\.[a-z]{2,6}\b([-a-zA-Z0-9@:%_\+.~#?&\/=]*)")
-        # fix cleantext url removing dot "." at the end of string
-        self.url_fix_regex = re.compile("(<url>)\s+([A-Z])")
-
-        # remove quote marks
-        self.quote_regex = re.compile(r'["\'‘’]([^ts])', re.IGNORECASE)
-
-        # regexes used by *process_multiple_characters* function #
-        self.multiple_characters_regex = re.compile(r"(.)\1{3,}")
-        self.multiple_characters_non_sense = re.compile(
-            r"(<number>|<date>|<unknown>|<url>|<email>|<more>|<less>|<currency>)|[,\.<>!?]", re.IGNORECASE)
-
-        # final regex which removes double dots and newline (from HTML_Parser)
-        self.double_dots = re.compile(r"\.\.\n")
-
-        # remove hyphenated
-        self.hyphenated_regex = re.compile(r"\s+([^\-<>\s]+)-([^\-<>\s]+)\s+")
-
-        # ==== DATES SECTION ====
-        # common dates - a common dates formats used in multiple languages
-        self.common_dates = re.compile(r"(\s+\d{1,4}\s*([-./])\s*\d{1,4}([-./])\s*\d{2,4})", re.IGNORECASE)
-        self.common_dates_combined = re.compile(
-            r"((" + "|".join(BasicProcessor.load_language_days(language)) + ")*\s*((" + "|".join(
-                BasicProcessor._load_date_ordinals(
-                    language)) + ")|(0*([1-9]{1,2})(st|nd|rd|th)*))\s+(of\s+)*(" + "|".join(
-                BasicProcessor.load_language_months(language)) + "))\s*\d{0,4}s*", re.IGNORECASE)
-
-        # en dates
-        self.en_dates = re.compile(r"(((early|late)\s*\d{2,4}s*)|(in\s+\d{2,4}s*)|(\d{2,4}s))", re.IGNORECASE)
+        if sentence_segmentation not in ['parser', 'rules']:
+            raise Exception(
+                'Unknown sentence segmentation "{}", use "parser" or "rules"'.format(sentence_segmentation)
+            )
+        if pos_backend not in ['stanza', 'spacy']:
+            raise Exception('Unknown POS backend "{}", use "stanza" or "spacy"'.format(pos_backend))
+
+        # SpaCy and POS tagger are loaded by *nlp* and *pos_tagger* properties
+        self._models_lock = threading.RLock()
+        self._nlp = None
+        self._pos_tagger = None
+
+        # create pos replacement list from basic list, the basic list is shared, so it is copied
+        self._pos_replacement_list_ = dict(pos_replacement_list, NUM='NUM')
+
+        # word lists and compiled regexes are built once per process and shared by all of the processors of the language
+        # (see *LanguageResources*), each of the regexes is also an attribute of the processor
+        self.resources = LanguageResources.get(language)
+        for name, pattern in self.resources.patterns.items():
+            setattr(self, name, pattern)
 
         # aggregate language specific dates processing into a list
         self.dates = []
@@ -162,8 +135,103 @@ class BasicProcessor:
             raise Exception('Cant\'t load language specified data')
 
         # remeber last used tokens
-        # needed for tokenizer such as SentencePiece
-        self.used_special_tokens: List[str] = []
+        # needed for tokenizer such as SentencePiece, each thread remembers tokens of its own last call
+        self._last_call = threading.local()
+
+        # compiled processing plans, see *compile* function
+        self._plans: OrderedDict = OrderedDict()
+        self._plans_lock = threading.Lock()
+
+    @property
+    def used_special_tokens(self) -> List[str]:
+        """
+        Special tokens used by the last call of *process* or *process_iter* in the current thread. Calls in other
+        threads don't change them, so a single processor can be used by many threads at once.
+
+        Returns:
+            List[str]: special tokens, empty if *process* wasn't called in the current thread
+        """
+        return getattr(self._last_call, 'special_tokens', [])
+
+    @used_special_tokens.setter
+    def used_special_tokens(self, special_tokens: List[str]):
+        self._last_call.special_tokens = special_tokens
+
+    @property
+    def nlp(self):
+        """
+        SpaCy pipeline with the *spacy_tokenizer*, loaded on the first use.
+
+        Returns:
+            Language: SpaCy pipeline
+        """
+        if self._nlp is None:
+            with self._models_lock:
+                if self._nlp is None:
+                    import spacy
+                    try:
+                        from src.MordinezNLP.tokenizers import spacy_tokenizer
+                    except:
+                        from MordinezNLP.tokenizers import spacy_tokenizer
+
+                    nlp = spacy.load(self.spacy_models[self.language])
+                    nlp.tokenizer = spacy_tokenizer(nlp)
+                    self._nlp = nlp
+        return self._nlp
+
+    @nlp.setter
+    def nlp(self, nlp):
+        self._nlp = nlp
+
+    @property
+    def pos_tagger(self):
+        """
+        POS tagger which uses *nlp* pipeline, created on the first use.
+
+        Returns:
+            PartOfSpeech: POS tagger
+        """
+        if self._pos_tagger is None:
+            with self._models_lock:
+                if self._pos_tagger is None:
+                    try:
+                        from src.MordinezNLP.pipelines import PartOfSpeech
+                    except:
+                        from MordinezNLP.pipelines import PartOfSpeech
+
+                    self._pos_tagger = PartOfSpeech(
+                        self.nlp,
+                        self.language,
+                        self.sentence_segmentation,
+                        self.pos_backend
+                    )
+        return self._pos_tagger
+
+    @pos_tagger.setter
+    def pos_tagger(self, pos_tagger):
+        self._pos_tagger = pos_tagger
+
+    def warmup(self, use_pos_tagging: bool = True, pos_batch_size: int = 7000):
+        """
+        Load everything what is needed to process texts upfront, instead of on the first call of *process*. It is
+        useful for services which shouldn't be slow when they process the first request.
+
+        Args:
+            use_pos_tagging (bool): if True, SpaCy pipeline, POS tagger and Stanza models are loaded too
+            pos_batch_size (int): POS tagging batch size of the Stanza pipeline, it can't be changed after the pipeline
+            is loaded
+        """
+        plan = self.compile(language=self.language)
+        processed_text = plan.run("Warm up text written on 1st of January 2021 by user@example.com.")
+
+        if use_pos_tagging:
+            self._pos_tag_texts(
+                [processed_text],
+                plan.options['replace_with_number'],
+                tokenizer_threads=1,
+                tokenizer_batch_size=1,
+                pos_batch_size=pos_batch_size
+            )
 
     def _run_dates(self, text: str, date_token: str) -> str:
         """
@@ -190,16 +258,7 @@ class BasicProcessor:
         Returns:
             List[str]: a list of day names in specified language
         """
-        if language == 'en':
-            return [
-                'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'
-            ]
-        elif language == 'de':
-            return [
-                'montag', 'dienstag', 'mittwoch', 'donnerstag', 'freitag', 'samstag', 'sonntag'
-            ]
-        else:
-            raise Exception('Cant\'t load language specified data')
+        return list(language_days(language))
 
     @staticmethod
     def load_language_months(language: str) -> List[str]:
@@ -212,22 +271,7 @@ class BasicProcessor:
         Returns:
             List[str]: a list of months in specified language
         """
-        if language == 'en':
-            return [
-                'january', 'february', 'march',
-                'april', 'may', 'june',
-                'july', 'october', 'september',
-                'august', 'november', 'december'
-            ]
-        elif language == 'de':
-            return [
-                'januar', 'februar', 'märz',
-                'april', 'mai', 'juni',
-                'juli', 'august', 'september',
-                'oktober', 'november', 'dezember'
-            ]
-        else:
-            raise Exception('Cant\'t load language specified data')
+        return list(language_months(language))
 
     @staticmethod
     def _load_date_ordinals(language: str) -> List[str]:
@@ -240,22 +284,7 @@ class BasicProcessor:
         Returns:
             List[str]: a list of regex ready date ordinals
         """
-        if language == 'en':
-            to_return = []
-            for ordinal in BasicProcessor.load_ordinals(language)[:31]:
-                if ' ' in ordinal:
-                    to_return.append(ordinal.replace(' ', ''))
-
-                if '-' in ordinal:
-                    to_return.append(ordinal.replace('-', ''))
-
-                to_return.append(ordinal)
-            return to_return
-        elif language == 'de':
-            # todo add german language version
-            raise Exception('Cant\'t load language specified data')
-        else:
-            raise Exception('Cant\'t load language specified data')
+        return list(date_ordinals(language))
 
     @staticmethod
     def load_ordinals(language: str) -> List[str]:
@@ -269,26 +298,7 @@ class BasicProcessor:
         Returns:
             List[str]: a list of ordinals in specified language
         """
-        if language == 'en':
-            base_numerals = BasicProcessor.load_numerals(language)
-            ordinals_base = ['first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'nineth']
-            ordinals = ordinals_base[:]
-
-            for i, num in enumerate(base_numerals[9:19]):
-                ordinals.append("".join([num, 'th']))
-
-            for tenth_num in range(19, len(base_numerals), 10):
-                ordinals.append("".join([base_numerals[tenth_num][:-1], 'ieth']))
-
-                for num in ordinals_base:
-                    ordinals.append("-".join([base_numerals[tenth_num], num]))
-
-            return ordinals
-        elif language == 'de':
-            # todo add german language version
-            raise Exception('Cant\'t load language specified data')
-        else:
-            raise Exception('Cant\'t load language specified data')
+        return list(ordinals(language))
 
     @staticmethod
     def load_numerals(language: str) -> List[str]:
@@ -302,25 +312,7 @@ class BasicProcessor:
         Returns:
             List[str]: a list of numerals in specified language
         """
-        if language == 'en':
-            base = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
-            tenths = ['ten', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
-
-            numerals = base + \
-                       tenths[0:1] + \
-                       ['eleven', 'twelve', 'thirteen'] + \
-                       [''.join([base_num, 'teen']) for base_num in base[3:]]
-
-            for i, tenth in enumerate(tenths[1:]):
-                numerals += tenths[i + 1:i + 2]
-                numerals += [' '.join([tenths[i + 1], base_num]) for base_num in base]
-
-            return numerals
-        elif language == 'de':
-            # todo add german language version
-            raise Exception('Cant\'t load language specified data')
-        else:
-            raise Exception('Cant\'t load language specified data')
+        return list(numerals(language))
 
     @staticmethod
     def _basic_clean(
@@ -344,7 +336,9 @@ class BasicProcessor:
             replace_with_currency_symbol: str = "<currency>",
     ) -> str:
         """
-        A cleantext wrapper designed for MordinezNLP
+        Replace urls, emails, phone numbers, numbers, digits and currency symbols with special tokens and normalize
+        whitespaces. The output is the same as the output of *cleantext.clean*, but all of the entities are replaced
+        in a single scan of the text (see *EntityTagger*).
 
         Args:
             text_to_clean (str): a text input to process
@@ -369,10 +363,10 @@ class BasicProcessor:
         Returns:
             str: post-processed text
         """
-        return clean(
-            text_to_clean,
-            fix_unicode=fix_unicode,
-            to_ascii=False,
+        if fix_unicode:
+            text_to_clean = repair_unicode(text_to_clean)
+
+        tagger = EntityTagger(
             lower=lower,
             no_line_breaks=no_line_breaks,
             no_urls=no_urls,
@@ -382,15 +376,14 @@ class BasicProcessor:
             no_digits=no_digits,
             no_currency_symbols=no_currency_symbols,
             no_punct=no_punct,
-            replace_with_punct="",
             replace_with_url=replace_with_url,
             replace_with_email=replace_with_email,
             replace_with_phone_number=replace_with_phone_number,
             replace_with_number=replace_with_number,
             replace_with_digit=replace_with_digit,
-            replace_with_currency_symbol=replace_with_currency_symbol,
-            lang=language
+            replace_with_currency_symbol=replace_with_currency_symbol
         )
+        return tagger.tag(text_to_clean)
 
     def process(
             self,
@@ -427,7 +420,15 @@ class BasicProcessor:
             list_processing_threads: int = 8,
             tokenizer_threads: int = 8,
             tokenizer_batch_size: int = 60,
-            pos_batch_size: int = 7000
+            pos_batch_size: int = 7000,
+            executor: str = 'thread',
+            list_chunk_size: Union[int, None] = None,
+            cache: Union[ResultCache, None] = None,
+            profiler: Union[RuleProfiler, None] = None,
+            guard: Union[DocumentGuard, None] = None,
+            segment_size: Union[int, None] = None,
+            pos_cache: Union[PosCache, None] = None,
+            pos_batch_tokens: Union[int, None] = None
     ) -> Union[str, List[str]]:
         """
         Main text processing function. It mainly uses regexes to find specified patterns in texts and replace them by
@@ -568,98 +569,730 @@ class BasicProcessor:
             tokenizer_threads (int): How many threads to use during tokenization, this value is passed to the SpaCy pipeline.
             tokenizer_batch_size (int) = Batch size to use during tokenization, this value is passed to the SpaCy pipeline.
             pos_batch_size (int) = POS tagging batch size, be careful if You have got CUDA enabled system!
+            executor (str): How to process List(str) input, 'thread' uses a threads pool, 'process' uses a processes
+            pool which is not limited by the GIL. In 'process' mode *pre_rules* and *post_rules* have to be picklable
+            (for example module level functions instead of lambdas).
+            list_chunk_size (Union[int, None]): A total number of characters of texts in a single chunk processed by one
+            worker. If None, it will be computed from the total size of the input list and the number of workers.
+            cache (Union[ResultCache, None]): A cache of processed texts. Texts which are in the cache are not processed
+            again and the new results are added to it. Repeated texts in the input list are processed only once.
+            profiler (Union[RuleProfiler, None]): A profiler which records time, calls and substitutions of each rule
+            and of the POS tagging. Profiling is disabled if None.
+            guard (Union[DocumentGuard, None]): Limits of size and wall-clock time of a single document, documents which
+            exceed them are segmented, processed without the costly rules or dropped (see *DocumentGuard*). No limits
+            if None.
+            segment_size (Union[int, None]): If set, texts longer than *segment_size* characters are split into
+            segments at safe boundaries, which are processed in parallel like separate texts and joined (see
+            *MordinezNLP.processors.Segments.split_into_segments*). It makes processing of very large documents
+            parallel and keeps copies made by the rules small. Results may be a little different at segment boundaries
+            than results of whole texts. POS tagging is done on joined texts. A *guard* and a *profiler* count each
+            segment as a document.
+            pos_cache (Union[PosCache, None]): A cache of POS tags of sentences (see
+            *MordinezNLP.pipelines.PosCache*), only sentences which are not in the cache are tagged by Stanza. It is
+            used only if *use_pos_tagging* is True.
+            pos_batch_tokens (Union[int, None]): If set, sentences are sorted by length and tagged in batches of at
+            most *pos_batch_tokens* padded tokens (see *PartOfSpeech.process*). It is used only if *use_pos_tagging*
+            is True.
 
         Returns:
             Union[str, List[str]]: Post-processed text
 
         """
+        plan = self.compile(
+            pre_rules=pre_rules,
+            post_rules=post_rules,
+            language=language,
+            fix_unicode=fix_unicode,
+            lower=lower,
+            no_line_breaks=no_line_breaks,
+            no_urls=no_urls,
+            no_emails=no_emails,
+            no_phone_numbers=no_phone_numbers,
+            no_numbers=no_numbers,
+            no_digits=no_digits,
+            no_currency_symbols=no_currency_symbols,
+            no_punct=no_punct,
+            no_math=no_math,
+            no_dates=no_dates,
+            no_multiple_chars=no_multiple_chars,
+            no_lists=no_lists,
+            no_brackets=no_brackets,
+            replace_with_url=replace_with_url,
+            replace_with_email=replace_with_email,
+            replace_with_phone_number=replace_with_phone_number,
+            replace_with_number=replace_with_number,
+            replace_with_digit=replace_with_digit,
+            replace_with_currency_symbol=replace_with_currency_symbol,
+            replace_with_date=replace_with_date,
+            replace_with_bracket=replace_with_bracket,
+            replace_more=replace_more,
+            replace_less=replace_less
+        )
+
         # add all special tokens to list of used special tokens
-        self.used_special_tokens = [
-            replace_with_url,
-            replace_with_email,
-            replace_with_phone_number,
+        self.used_special_tokens = plan.special_tokens[:]
+
+        def process_single(texts: List[str]) -> List[str]:
+            processed_texts = [plan.run(texts[0], profiler, guard)]
+            if use_pos_tagging:
+                processed_texts = self._pos_tag_texts(
+                    processed_texts,
+                    replace_with_number,
+                    tokenizer_threads=tokenizer_threads,
+                    tokenizer_batch_size=tokenizer_batch_size,
+                    pos_batch_size=pos_batch_size,
+                    profiler=profiler,
+                    pos_cache=pos_cache,
+                    pos_batch_tokens=pos_batch_tokens
+                )
+            return processed_texts
+
+        def process_list(texts: List[str]) -> List[str]:
+            with self._create_executor(plan, pre_rules, post_rules, list_processing_threads, executor) as pool:
+                progress = tqdm(desc="Processing text list", total=len(texts))
+                processed_texts = self._process_list(
+                    texts,
+                    plan,
+                    pool,
+                    list_processing_threads,
+                    list_chunk_size,
+                    progress,
+                    profiler,
+                    guard,
+                    segment_size
+                )
+                progress.close()
+
+            if use_pos_tagging:
+                processed_texts = self._pos_tag_texts(
+                    processed_texts,
+                    replace_with_number,
+                    tokenizer_threads=tokenizer_threads,
+                    tokenizer_batch_size=tokenizer_batch_size,
+                    pos_batch_size=pos_batch_size,
+                    profiler=profiler,
+                    pos_cache=pos_cache,
+                    pos_batch_tokens=pos_batch_tokens
+                )
+            return processed_texts
+
+        if type(text_to_process) is str:
+            # a text which will be segmented is processed by a pool, like a list of its segments
+            if segment_size is not None and len(text_to_process) > segment_size:
+                process_function = process_list
+            else:
+                process_function = process_single
+            return self._process_with_cache(
+                [text_to_process],
+                plan,
+                use_pos_tagging,
+                cache,
+                process_function,
+                guard,
+                segment_size
+            )[0]
+        else:
+            return self._process_with_cache(
+                text_to_process,
+                plan,
+                use_pos_tagging,
+                cache,
+                process_list,
+                guard,
+                segment_size
+            )
+
+    def _process_with_cache(
+            self,
+            texts: List[str],
+            plan: ProcessingPlan,
+            use_pos_tagging: bool,
+            cache: Union[ResultCache, None],
+            process_function: Callable[[List[str]], List[str]],
+            guard: Union[DocumentGuard, None] = None,
+            segment_size: Union[int, None] = None
+    ) -> List[str]:
+        """
+        Process texts with *process_function*, skipping texts which are already in the cache. Each of the texts which
+        are not in the cache is processed once, even if it is repeated in the input list.
+
+        Args:
+            texts (List[str]): a list of texts to process
+            plan (ProcessingPlan): a compiled plan used to process texts
+            use_pos_tagging (bool): if POS tagging is used by *process_function*
+            cache (Union[ResultCache, None]): a cache of processed texts, if None, all of the texts are processed
+            process_function (Callable[[List[str]], List[str]]): a function which processes a list of texts
+            guard (Union[DocumentGuard, None]): limits used by *process_function*, they are a part of the cache key
+            segment_size (Union[int, None]): a segment size used by *process_function*, it is a part of the cache key
+
+        Returns:
+            List[str]: Post-processed texts
+        """
+        if cache is None:
+            return process_function(texts)
+
+        options_key = cache.options_key(
+            plan,
+            use_pos_tagging,
+            guard,
+            segment_size,
+            self.sentence_segmentation,
+            self.pos_backend
+        )
+        keys = [cache.make_key(text, options_key) for text in texts]
+        processed_texts = cache.get_many(keys)
+
+        missing = OrderedDict()
+        for key, text, processed_text in zip(keys, texts, processed_texts):
+            if processed_text is None and key not in missing:
+                missing[key] = text
+
+        if len(missing) > 0:
+            processed_missing = dict(zip(missing.keys(), process_function(list(missing.values()))))
+            cache.set_many(processed_missing.items())
+
+            processed_texts = [
+                processed_missing[key] if processed_text is None else processed_text
+                for key, processed_text in zip(keys, processed_texts)
+            ]
+        return processed_texts
+
+    def process_iter(
+            self,
+            texts: Iterable[str],
+            window: int = 10000,
+            use_pos_tagging: bool = True,
+            list_processing_threads: int = 8,
+            tokenizer_threads: int = 8,
+            tokenizer_batch_size: int = 60,
+            pos_batch_size: int = 7000,
+            executor: str = 'thread',
+            list_chunk_size: Union[int, None] = None,
+            cache: Union[ResultCache, None] = None,
+            profiler: Union[RuleProfiler, None] = None,
+            guard: Union[DocumentGuard, None] = None,
+            segment_size: Union[int, None] = None,
+            pos_cache: Union[PosCache, None] = None,
+            pos_batch_tokens: Union[int, None] = None,
+            **options
+    ) -> Generator[str, None, None]:
+        """
+        Streaming version of the *process* function. It consumes any iterable of texts (for example lines of a file or
+        a generator over a JSONL dump) and yields post-processed texts in the same order.
+
+        Texts are read and processed in windows of *window* texts, so at most *window* texts (and their POS tagging
+        data if *use_pos_tagging* is True) are kept in memory at the same time, no matter how long the input is.
+        A single threads or processes pool is used for the whole stream.
+
+        ::
+
+            with open("dump.txt", encoding="utf8") as f_in, open("dump_clean.txt", "w", encoding="utf8") as f_out:
+                for text in bp.process_iter(f_in, window=5000, use_pos_tagging=False):
+                    f_out.write(text + "\\n")
+
+        Args:
+            texts (Iterable[str]): an iterable of texts to process
+            window (int): how many texts are processed at once
+            use_pos_tagging (bool): the same as in the *process* function
+            list_processing_threads (int): the same as in the *process* function
+            tokenizer_threads (int): the same as in the *process* function
+            tokenizer_batch_size (int): the same as in the *process* function
+            pos_batch_size (int): the same as in the *process* function
+            executor (str): the same as in the *process* function
+            list_chunk_size (Union[int, None]): the same as in the *process* function
+            cache (Union[ResultCache, None]): the same as in the *process* function
+            profiler (Union[RuleProfiler, None]): the same as in the *process* function
+            guard (Union[DocumentGuard, None]): the same as in the *process* function
+            segment_size (Union[int, None]): the same as in the *process* function
+            pos_cache (Union[PosCache, None]): the same as in the *process* function
+            pos_batch_tokens (Union[int, None]): the same as in the *process* function
+            **options: processing options passed to the *compile* function (*pre_rules*, *language*, *no_urls*, ...)
+
+        Returns:
+            Generator[str, None, None]: Post-processed texts
+        """
+        if window < 1:
+            raise Exception('Window has to be a positive number')
+
+        plan = self.compile(**options)
+        self.used_special_tokens = plan.special_tokens[:]
+
+        texts_iterator = iter(texts)
+
+        with self._create_executor(
+                plan,
+                options.get('pre_rules', []),
+                options.get('post_rules', []),
+                list_processing_threads,
+                executor
+        ) as pool:
+            progress = tqdm(desc="Processing texts stream")
+
+            def process_window(texts_to_process: List[str]) -> List[str]:
+                processed_texts = self._process_list(
+                    texts_to_process,
+                    plan,
+                    pool,
+                    list_processing_threads,
+                    list_chunk_size,
+                    progress,
+                    profiler,
+                    guard,
+                    segment_size
+                )
+
+                if use_pos_tagging:
+                    processed_texts = self._pos_tag_texts(
+                        processed_texts,
+                        plan.options['replace_with_number'],
+                        tokenizer_threads=tokenizer_threads,
+                        tokenizer_batch_size=tokenizer_batch_size,
+                        pos_batch_size=pos_batch_size,
+                        profiler=profiler,
+                        pos_cache=pos_cache,
+                        pos_batch_tokens=pos_batch_tokens
+                    )
+                return processed_texts
+
+            while True:
+                window_texts = list(itertools.islice(texts_iterator, window))
+                if len(window_texts) == 0:
+                    break
+
+                processed_texts = self._process_with_cache(
+                    window_texts,
+                    plan,
+                    use_pos_tagging,
+                    cache,
+                    process_window,
+                    guard,
+                    segment_size
+                )
+                del window_texts
+
+                for processed_text in processed_texts:
+                    yield processed_text
+
+            progress.close()
+
+    def _create_executor(
+            self,
+            plan: ProcessingPlan,
+            pre_rules: List[Callable],
+            post_rules: List[Callable],
+            workers: int,
+            executor: str
+    ) -> Executor:
+        """
+        Create a threads or a processes pool for processing lists of texts with a plan.
+
+        Processes pool workers don't receive the plan (it's a list of lambdas), they build their own plan once in the
+        initializer from the plan options. Workers get language resources of the processor (see *LanguageResources*),
+        so they don't build them again.
+
+        Args:
+            plan (ProcessingPlan): a compiled plan used to process texts
+            pre_rules (List[Callable]): *pre_rules* used to build the plan
+            post_rules (List[Callable]): *post_rules* used to build the plan
+            workers (int): how many threads or processes to use
+            executor (str): 'thread' or 'process'
+
+        Returns:
+            Executor: a pool, use it as a context manager
+        """
+        if executor == 'thread':
+            return ThreadPoolExecutor(workers)
+        elif executor == 'process':
+            if sys.version_info < (3, 7):
+                # language resources are not sent with each task, workers build them once
+                return _LazyInitProcessPoolExecutor(workers, (self.language, plan.options, pre_rules, post_rules))
+            return ProcessPoolExecutor(
+                workers,
+                initializer=_init_process_worker,
+                initargs=(self.language, plan.options, pre_rules, post_rules, self.resources)
+            )
+        else:
+            raise Exception('Unknown executor "{}", use "thread" or "process"'.format(executor))
+
+    def _process_list(
+            self,
+            texts: List[str],
+            plan: ProcessingPlan,
+            pool: Executor,
+            workers: int,
+            chunk_size: Union[int, None],
+            progress: Union[tqdm, None],
+            profiler: Union[RuleProfiler, None] = None,
+            guard: Union[DocumentGuard, None] = None,
+            segment_size: Union[int, None] = None
+    ) -> List[str]:
+        """
+        Process a list of texts with a compiled plan using a pool created by *_create_executor*. Texts are split into
+        chunks with a similar number of characters (see *MordinezNLP.utils.size_aware_chunks*). Order of the output
+        texts is the same as on the input.
+
+        Args:
+            texts (List[str]): a list of texts to process
+            plan (ProcessingPlan): a compiled plan used to process texts
+            pool (Executor): a threads or processes pool
+            workers (int): how many threads or processes are in the pool
+            chunk_size (Union[int, None]): a total number of characters in a single chunk, computed if None
+            progress (Union[tqdm, None]): tqdm progress bar updated after processed texts
+            profiler (Union[RuleProfiler, None]): a profiler to record rules measurements
+            guard (Union[DocumentGuard, None]): limits of size and processing time of each document
+            segment_size (Union[int, None]): if set, texts longer than *segment_size* characters are split into
+            segments, which are processed like separate texts and joined
+
+        Returns:
+            List[str]: Post-processed texts
+        """
+        if segment_size is not None:
+            # segments of all of the texts are chunked together, so segments of a single large text are processed by
+            # all of the workers
+            texts_segments = [split_into_segments(text, segment_size) for text in texts]
+            processed_segments = iter(self._process_list(
+                list(itertools.chain(*texts_segments)),
+                plan,
+                pool,
+                workers,
+                chunk_size,
+                None,
+                profiler,
+                guard
+            ))
+
+            processed_texts = [
+                join_segments(list(itertools.islice(processed_segments, len(text_segments))))
+                for text_segments in texts_segments
+            ]
+            if progress is not None:
+                progress.update(len(processed_texts))
+            return processed_texts
+
+        chunks = size_aware_chunks(texts, workers, chunk_size)
+
+        if isinstance(pool, ThreadPoolExecutor):
+            post_processed_list = list(pool.map(
+                plan.run_batch,
+                chunks,
+                repeat(progress),
+                repeat(profiler),
+                repeat(guard)
+            ))
+        else:
+            post_processed_list = []
+            guard_settings = None if guard is None else guard.settings()
+            init_args = pool.init_args if isinstance(pool, _LazyInitProcessPoolExecutor) else None
+            for processed_chunk, stats, report, guard_report in pool.map(
+                    _run_process_worker,
+                    chunks,
+                    repeat(profiler is not None),
+                    repeat(guard_settings),
+                    repeat(init_args)
+            ):
+                post_processed_list.append(processed_chunk)
+                plan.add_stats(*stats)
+                if report is not None:
+                    profiler.merge(report)
+                if guard_report is not None:
+                    guard.merge(guard_report)
+                if progress is not None:
+                    progress.update(len(processed_chunk))
+
+        return list(itertools.chain(*post_processed_list))
+
+    def _pos_tag_texts(
+            self,
+            texts: List[str],
+            replace_with_number: str,
+            tokenizer_threads: int,
+            tokenizer_batch_size: int,
+            pos_batch_size: int,
+            profiler: Union[RuleProfiler, None] = None,
+            pos_cache: Union[PosCache, None] = None,
+            pos_batch_tokens: Union[int, None] = None
+    ) -> List[str]:
+        """
+        Run *pos_tag_data* on post-processed texts and merge special tokens repeated after POS tagging.
+
+        Args:
+            texts (List[str]): a postprocessed texts list
+            replace_with_number (str): a special token to replace numbers with
+            tokenizer_threads (int): How many threads to use for tokenization
+            tokenizer_batch_size (int): Batch size for tokenization
+            pos_batch_size (int): POS tagging batch size
+            profiler (Union[RuleProfiler, None]): a profiler to record POS tagging as the "pos_tagging" stage
+            pos_cache (Union[PosCache, None]): a cache of POS tags of sentences
+            pos_batch_tokens (Union[int, None]): the maximum number of padded tokens in a single POS tagging call
+
+        Returns:
+            List[str]: postprocessed texts
+        """
+        start = time.perf_counter()
+        processed_texts = self.pos_tag_data(
+            texts,
             replace_with_number,
-            replace_with_digit,
-            replace_with_currency_symbol,
-            replace_with_date,
-            replace_with_bracket,
-            replace_more,
-            replace_less
-        ]
+            tokenizer_threads=tokenizer_threads,
+            tokenizer_batch_size=tokenizer_batch_size,
+            pos_batch_size=pos_batch_size,
+            pos_cache=pos_cache,
+            pos_batch_tokens=pos_batch_tokens
+        )
+
+        for i, item in enumerate(processed_texts):
+            processed_texts[i] = re.sub(self.multi_tag_regex, r"\3\5\7\9\11\13\15", item)
+
+        if profiler is not None:
+            profiler.add_stage("pos_tagging", time.perf_counter() - start, texts, processed_texts)
+        return processed_texts
+
+    def compile(
+            self,
+            pre_rules: List[Callable] = [],
+            post_rules: List[Callable] = [],
+            language: str = 'en',
+            fix_unicode: bool = True,
+            lower: bool = False,
+            no_line_breaks: bool = False,
+            no_urls: bool = True,
+            no_emails: bool = True,
+            no_phone_numbers: bool = True,
+            no_numbers: bool = True,
+            no_digits: bool = False,
+            no_currency_symbols: bool = True,
+            no_punct: bool = False,
+            no_math: bool = True,
+            no_dates: bool = True,
+            no_multiple_chars: bool = True,
+            no_lists: bool = True,
+            no_brackets: bool = True,
+            replace_with_url: str = "<url>",
+            replace_with_email: str = "<email>",
+            replace_with_phone_number: str = "<phone>",
+            replace_with_number: str = "<number>",
+            replace_with_digit: str = "0",
+            replace_with_currency_symbol: str = "<currency>",
+            replace_with_date: str = "<date>",
+            replace_with_bracket: str = "<bracket>",
+            replace_more: str = "<more>",
+            replace_less: str = "<less>",
+    ) -> ProcessingPlan:
+        """
+        Build a reusable processing plan for the specified options. The plan contains the whole rules chain used by
+        *process* function, so it can be run many times without rebuilding the rules. Plans are cached by the options,
+        calling this function twice with the same options returns the same plan.
+
+        Use it when You want to process a lot of short texts in Your own loop:
+
+        ::
+
+            plan = bp.compile(no_dates=False)
+            for text in texts:
+                cleaned = plan.run(text)
+
+        Args are the same as for the *process* function (without the threading and the POS tagging options).
+
+        Returns:
+            ProcessingPlan: a compiled processing plan
+        """
+        options = dict(
+            language=language,
+            fix_unicode=fix_unicode,
+            lower=lower,
+            no_line_breaks=no_line_breaks,
+            no_urls=no_urls,
+            no_emails=no_emails,
+            no_phone_numbers=no_phone_numbers,
+            no_numbers=no_numbers,
+            no_digits=no_digits,
+            no_currency_symbols=no_currency_symbols,
+            no_punct=no_punct,
+            no_math=no_math,
+            no_dates=no_dates,
+            no_multiple_chars=no_multiple_chars,
+            no_lists=no_lists,
+            no_brackets=no_brackets,
+            replace_with_url=replace_with_url,
+            replace_with_email=replace_with_email,
+            replace_with_phone_number=replace_with_phone_number,
+            replace_with_number=replace_with_number,
+            replace_with_digit=replace_with_digit,
+            replace_with_currency_symbol=replace_with_currency_symbol,
+            replace_with_date=replace_with_date,
+            replace_with_bracket=replace_with_bracket,
+            replace_more=replace_more,
+            replace_less=replace_less,
+        )
+        plan_key = (tuple(pre_rules), tuple(post_rules), tuple(sorted(options.items())))
+
+        with self._plans_lock:
+            if plan_key in self._plans:
+                self._plans.move_to_end(plan_key)
+                return self._plans[plan_key]
+
+        plan = ProcessingPlan(
+            [
+                rule if isinstance(rule, Rule) else Rule(rule, name="pre_rule_{}".format(i))
+                for i, rule in enumerate(pre_rules)
+            ] + self._build_rules(**options) + [
+                rule if isinstance(rule, Rule) else Rule(rule, name="post_rule_{}".format(i))
+                for i, rule in enumerate(post_rules)
+            ],
+            options,
+            [
+                replace_with_url,
+                replace_with_email,
+                replace_with_phone_number,
+                replace_with_number,
+                replace_with_digit,
+                replace_with_currency_symbol,
+                replace_with_date,
+                replace_with_bracket,
+                replace_more,
+                replace_less
+            ],
+            pre_rules=pre_rules,
+            post_rules=post_rules
+        )
+
+        with self._plans_lock:
+            # another thread could compile the same plan in the meantime, all of the callers get the same plan
+            if plan_key in self._plans:
+                self._plans.move_to_end(plan_key)
+                return self._plans[plan_key]
+
+            self._plans[plan_key] = plan
+            if len(self._plans) > self.plans_cache_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def _build_rules(
+            self,
+            language: str,
+            fix_unicode: bool,
+            lower: bool,
+            no_line_breaks: bool,
+            no_urls: bool,
+            no_emails: bool,
+            no_phone_numbers: bool,
+            no_numbers: bool,
+            no_digits: bool,
+            no_currency_symbols: bool,
+            no_punct: bool,
+            no_math: bool,
+            no_dates: bool,
+            no_multiple_chars: bool,
+            no_lists: bool,
+            no_brackets: bool,
+            replace_with_url: str,
+            replace_with_email: str,
+            replace_with_phone_number: str,
+            replace_with_number: str,
+            replace_with_digit: str,
+            replace_with_currency_symbol: str,
+            replace_with_date: str,
+            replace_with_bracket: str,
+            replace_more: str,
+            replace_less: str,
+    ) -> List[Rule]:
+        """
+        Build a list of rules used by the *process* function. All of the replacement strings are formatted here, so
+        rules don't do any setup work when they are called.
+
+        Rules which can't match anything without some characters have those characters set as triggers, so they are
+        skipped for texts without them (see *ProcessingPlan.Rule*). Triggers are checked on a text processed by all of
+        the previous rules, because the previous rules may add them (eg. special tokens contain "<" and ">").
+
+        Each rule has a stable name used in profiling reports. Rules used more than once have a number suffix
+        (eg. "space_2").
+
+        Args are the same as for the *compile* function.
+
+        Returns:
+            List[Rule]: a list of rules, each rule takes a str and returns a str
+        """
+        more_replacement = "{replace_with_number} {replace_more} {replace_with_number}".format(
+            replace_more=replace_more, replace_with_number=replace_with_number)
+        less_replacement = "{replace_with_number} {replace_less} {replace_with_number}".format(
+            replace_less=replace_less, replace_with_number=replace_with_number)
+        bracket_replacement = r" {replace_with_bracket} \5 \9 {replace_with_bracket} ".format(
+            replace_with_bracket=replace_with_bracket)
+        number_replacement = " {replace_with_number} ".format(replace_with_number=replace_with_number)
+        url_replacement = r" {replace_with_url} ".format(replace_with_url=replace_with_url)
 
         rules = [
-            lambda x: re.sub(self.base_brackets_regex, r"\1 ", x),
-            lambda x: re.sub(self.double_dots, ".\n", x),
+            Rule.regex(self.base_brackets_regex, r"\1 ", ["<"], name="base_brackets", costly=True),
+            Rule.regex(self.double_dots, ".\n", ["..\n"], name="double_dots"),
         ]
 
         if no_lists:
             rules += [
-                lambda x: re.sub(self.list_last_item_regex, r" \2. \3", x),
-                # lambda x: print(x)
-                lambda x: re.sub(self.list_item_regex, r"\2, ", x)
+                Rule.regex(self.list_last_item_regex, r" \2. \3", ["\n-", "\n>"], name="list_last_item"),
+                Rule.regex(self.list_item_regex, r"\2, ", ["\n-", "\n>"], name="list_item")
             ]
 
         if no_math:
             rules += [
-                lambda x: re.sub(self.more_than_regex,
-                                 "{replace_with_number} {replace_more} {replace_with_number}".format(
-                                     replace_more=replace_more, replace_with_number=replace_with_number), x),
-                lambda x: re.sub(self.less_than_regex,
-                                 "{replace_with_number} {replace_less} {replace_with_number}".format(
-                                     replace_less=replace_less, replace_with_number=replace_with_number), x),
+                Rule.regex(self.more_than_regex, more_replacement, [">"], name="more_than"),
+                Rule.regex(self.less_than_regex, less_replacement, ["<"], name="less_than"),
             ]
 
         rules += [
-            lambda x: re.sub(self.fix_base_brackets_1, " ", x),
-            lambda x: re.sub(self.fix_base_brackets_2_left, r" \2 ", x),
-            lambda x: re.sub(self.fix_base_brackets_2_right, r" \3 ", x),
-            lambda x: re.sub(self.fix_brackets_in_words, r" \1\4 ", x),
-            lambda x: re.sub(self.quote_regex, r"\1", x),
+            Rule.regex(self.fix_base_brackets_1, " ", ["<", ">"], name="fix_base_brackets_1", costly=True),
+            Rule.regex(self.fix_base_brackets_2_left, r" \2 ", [">"], name="fix_base_brackets_2_left", costly=True),
+            Rule.regex(self.fix_base_brackets_2_right, r" \3 ", ["<"], name="fix_base_brackets_2_right", costly=True),
+            Rule.regex(self.fix_brackets_in_words, r" \1\4 ", ["<", ">"], name="fix_brackets_in_words", costly=True),
+            Rule.regex(self.quote_regex, r"\1", ['"', "'", "‘", "’"], name="quote"),
         ]
 
         if no_multiple_chars:
             rules += [
-                lambda x: self.process_multiple_characters(x),
+                Rule(lambda x: self.process_multiple_characters(x), name="multiple_characters"),
             ]
 
         if no_dates:
             rules += [
-                lambda x: self._run_dates(x, replace_with_date),
+                Rule(lambda x: self._run_dates(x, replace_with_date), name="dates"),
             ]
 
+        if fix_unicode:
+            # the second repair of *_basic_clean*, the first one is the "fix_text" rule of the plan
+            rules += [
+                Rule(fix_text, needs_unicode_repair, name="repair_unicode"),
+            ]
+
+        # unicode is repaired by the rule above, so the tagger does only what *_basic_clean* does after repairing it
+        tagger = EntityTagger(
+            lower=lower,
+            no_line_breaks=no_line_breaks,
+            no_urls=no_urls,
+            no_emails=no_emails,
+            no_phone_numbers=no_phone_numbers,
+            no_numbers=no_numbers,
+            no_digits=no_digits,
+            no_currency_symbols=no_currency_symbols,
+            no_punct=no_punct,
+            replace_with_url=replace_with_url,
+            replace_with_email=replace_with_email,
+            replace_with_phone_number=replace_with_phone_number,
+            replace_with_number=replace_with_number,
+            replace_with_digit=replace_with_digit,
+            replace_with_currency_symbol=replace_with_currency_symbol
+        )
+
         rules += [
-            lambda x: self._basic_clean(
-                text_to_clean=x,
-                language=language,
-                fix_unicode=fix_unicode,
-                lower=lower,
-                no_line_breaks=no_line_breaks,
-                no_urls=no_urls,
-                no_emails=no_emails,
-                no_phone_numbers=no_phone_numbers,
-                no_numbers=no_numbers,
-                no_digits=no_digits,
-                no_currency_symbols=no_currency_symbols,
-                no_punct=no_punct,
-                replace_with_url=replace_with_url,
-                replace_with_email=replace_with_email,
-                replace_with_phone_number=replace_with_phone_number,
-                replace_with_number=replace_with_number,
-                replace_with_digit=replace_with_digit,
-                replace_with_currency_symbol=replace_with_currency_symbol
-            ),
-            lambda x: re.sub(self.space_regex, " ", x),
-            lambda x: re.sub(self.double_upper_case_letters, r" \1 \2 ", x),
+            Rule(tagger.tag, name="basic_clean", count_function=tagger.count),
+            Rule.regex(self.space_regex, " ", name="space"),
+            Rule.regex(self.double_upper_case_letters, r" \1 \2 ", name="double_upper_case_letters", costly=True),
         ]
 
         if no_brackets:
             rules += [
-                lambda x: re.sub(self.none_regex, r" {replace_with_bracket} \5 \9 {replace_with_bracket} ".format(
-                    replace_with_bracket=replace_with_bracket), x),
+                Rule.regex(self.none_regex, bracket_replacement, ["(", "["], name="brackets", costly=True),
             ]
         else:
             rules += [
-                lambda x: re.sub(self.none_regex, r" \4\8 \5\9 \6\10 ", x),
+                Rule.regex(self.none_regex, r" \4\8 \5\9 \6\10 ", ["(", "["], name="brackets", costly=True),
             ]
 
         # if there will be occurences where multiple characters were not removed, uncomment this section
@@ -667,98 +1300,47 @@ class BasicProcessor:
         #
         # if no_multiple_chars:
         #     rules += [
-        #         lambda x: self.process_multiple_characters(x),
+        #         Rule(lambda x: self.process_multiple_characters(x), name="multiple_characters_2"),
         #     ]
 
         if no_numbers:
             rules += [
-                lambda x: re.sub(self.no_space_digits_regex,
-                                 " {replace_with_number} ".format(replace_with_number=replace_with_number), x),
+                Rule.regex(self.no_space_digits_regex, number_replacement, self.digit_regex, name="numbers"),
             ]
 
         rules += [
-            lambda x: re.sub(self.limit_regex, " ", x),
-            lambda x: re.sub(self.space_and_punct, r"\2 ", x),
-            # lambda x: print(x),
-            # lambda x: re.sub(self.space_and_punct, r"\1 ", x),
-            # lambda x: re.sub(self.com_regex, ",", x),
-            # lambda x: print(x),
-            lambda x: re.sub(self.multi_tag_regex, r"\3\5\7\9\11\13\15", x),
-            lambda x: re.sub(self.starting_space_regex, "", x),
-            lambda x: re.sub(self.ending_space_regex, "", x)
+            Rule.regex(self.limit_regex, " ", name="limit"),
+            Rule.regex(self.space_and_punct, r"\2 ", ["?", "!", ".", ",", ":"], name="space_and_punct"),
+            Rule.regex(self.multi_tag_regex, r"\3\5\7\9\11\13\15", ["<"], name="multi_tag"),
+            # the same as removing *self.starting_space_regex* and *self.ending_space_regex* without scanning regexes
+            Rule(lambda x: x.strip(), name="strip")
         ]
 
         if no_urls or no_emails:
             rules += [
-                lambda x: re.sub(self.url_email_regex,
-                                 r" {replace_with_url} ".format(replace_with_url=replace_with_url), x),
+                Rule.regex(self.url_email_regex, url_replacement, ["."], name="url_email"),
             ]
 
         rules += [
-            lambda x: x.replace(" > ", " "),
-            lambda x: x.replace(" < ", " "),
-            lambda x: re.sub(self.space_regex, " ", x),
-            lambda x: re.sub(self.multi_tag_regex, r"\3\5\7\9\11\13\15", x),
-            lambda x: re.sub(self.url_fix_regex, r"\1. \2", x),
-            # lambda x: re.sub(self.hyphenated_regex, r" \1\2 ", x),
-            lambda x: x.replace("-", " "),
-            lambda x: re.sub(self.space_regex, " ", x),
-            lambda x: re.sub(self.multi_tag_colon_regex, r"\3\5\7\9\11\13\15 : \3\5\7\9\11\13\15", x),
-            lambda x: x.replace("e mail", "email"),
-            lambda x: x.replace("><", "> <")
+            Rule(lambda x: x.replace(" > ", " "), name="remove_more_sign"),
+            Rule(lambda x: x.replace(" < ", " "), name="remove_less_sign"),
+            Rule.regex(self.space_regex, " ", name="space_2"),
+            Rule.regex(self.multi_tag_regex, r"\3\5\7\9\11\13\15", ["<"], name="multi_tag_2"),
+            Rule.regex(self.url_fix_regex, r"\1. \2", ["<url>"], name="url_fix"),
+            # Rule.regex(self.hyphenated_regex, r" \1\2 ", name="hyphenated"),
+            Rule(lambda x: x.replace("-", " "), name="hyphens"),
+            Rule.regex(self.space_regex, " ", name="space_3"),
+            Rule.regex(
+                self.multi_tag_colon_regex,
+                r"\3\5\7\9\11\13\15 : \3\5\7\9\11\13\15",
+                ["><", ">:"],
+                name="multi_tag_colon"
+            ),
+            Rule(lambda x: x.replace("e mail", "email"), name="email_word"),
+            Rule(lambda x: x.replace("><", "> <"), name="separate_tags")
         ]
 
-        rules = pre_rules + rules + post_rules
-
-        if type(text_to_process) is str:
-            processed_texts = BasicProcessor.__process_entity(text_to_process, rules, None)
-            if use_pos_tagging:
-                processed_texts = self.pos_tag_data(
-                    [processed_texts],
-                    replace_with_number,
-                    tokenizer_threads=tokenizer_threads,
-                    tokenizer_batch_size=tokenizer_batch_size,
-                    pos_batch_size=pos_batch_size
-                )
-                processed_texts = re.sub(self.multi_tag_regex, r"\3\5\7\9\11\13\15", processed_texts[0])
-            return processed_texts
-        else:
-            chunks = BasicProcessor.chunk_list(text_to_process, list_processing_threads)
-            with ThreadPoolExecutor(list_processing_threads) as ex:
-                progress = tqdm(desc="Processing text list", total=len(text_to_process))
-                post_processed_list = list(ex.map(
-                    BasicProcessor.__process_entity,
-                    chunks,
-                    repeat(rules),
-                    repeat(progress)
-                ))
-
-                progress.close()
-
-            processed_texts = list(itertools.chain(*post_processed_list))
-
-            if use_pos_tagging:
-                processed_texts = self.pos_tag_data(
-                    processed_texts,
-                    replace_with_number,
-                    tokenizer_threads=tokenizer_threads,
-                    tokenizer_batch_size=tokenizer_batch_size,
-                    pos_batch_size=pos_batch_size
-                )
-
-                for i, item in enumerate(processed_texts):
-                    processed_texts[i] = re.sub(self.multi_tag_regex, r"\3\5\7\9\11\13\15", item)
-            return processed_texts
-
-            # processed_texts = []
-            # for text in tqdm(text_to_process, desc="Processing text list"):
-            #     for i, rule in enumerate(rules):
-            #         text = rule(text)
-            #         # print(text, "\n\n")
-            #     processed_texts.append(text)
-            #     # if text_num % 1000 == 0:
-            #     # print(text_num)
-            # return processed_texts
+        return rules
 
     def pos_tag_data(
             self,
@@ -766,7 +1348,9 @@ class BasicProcessor:
             replace_with_number: str,
             tokenizer_threads: int,
             tokenizer_batch_size: int,
-            pos_batch_size: int
+            pos_batch_size: int,
+            pos_cache: Union[PosCache, None] = None,
+            pos_batch_tokens: Union[int, None] = None
     ) -> List[str]:
         """
         A helper function to postprocess numbers tags and replace according tokens with special token. It also uses SpaCy
@@ -780,6 +1364,9 @@ class BasicProcessor:
             tokenizer_threads (int): How many threads to use for tokenization
             tokenizer_batch_size (int): Batch size for tokenization
             pos_batch_size (int): POS tagging batch size, be careful when CUDA is availabe in Your system!
+            pos_cache (Union[PosCache, None]): a cache of POS tags of sentences, see *MordinezNLP.pipelines.PosCache*
+            pos_batch_tokens (Union[int, None]): the maximum number of padded tokens in a single POS tagging call, see
+            *PartOfSpeech.process*
 
         Returns:
             str: postprocessed texts
@@ -790,8 +1377,9 @@ class BasicProcessor:
             tokenizer_batch_size=tokenizer_batch_size,
             pos_batch_size=pos_batch_size,
             return_docs=True,
-            pos_replacement_list=self._pos_replacement_list_
-
+            pos_replacement_list=self._pos_replacement_list_,
+            cache=pos_cache,
+            pos_batch_tokens=pos_batch_tokens
         )
 
         outputs = []
@@ -822,40 +1410,22 @@ class BasicProcessor:
         for i in range(0, len(input_list), size):
             yield input_list[i:i + size]
 
-    @staticmethod
-    def __process_entity(entity: Union[str, List[str]], rules: List[Callable], progress: Union[tqdm, None]) -> Union[str, List[str]]:
+    def process_multiple_characters(self, text_to_process: str) -> str:
         """
-        A multiprocessing wrapper for *process* func. Process function builds rules list and then uses this function
-        to process entity (if input is a string) or to process list elements if input of *process* is a list of string.
-
-        Args:
-            entity (Union[str, List[str]]): a single entity to process
-            rules (List[Callable]): list of lambda rules
-            progress (Union[tqdm, None]): tqdm progress bar used when processing a list of str
+        Function can detect multiplied characters in a word and replace them by a single one.
 
-        Returns:
-            Union[str, List[str]]: Processed entity
-        """
-        if type(entity) is str:
-            entity = fix_text(entity)
-            for rule in rules:
-                entity = rule(entity)
-            return entity
-        else:
-            processed = []
-            for text in entity:
-                text = fix_text(text)
-                for rule in rules:
-                    text = rule(text)
-                processed.append(text)
+        Text is scanned once to find characters repeated at least 4 times and then once for each of such characters,
+        so processing time is linear in the text length.
 
-                if progress is not None:
-                    progress.update()
-            return processed
+        Each word is replaced where it was found. Older versions replaced every occurrence of a matched word in the
+        whole text (*str.replace*), so their output depended on other words of the text and it differs when:
 
-    def process_multiple_characters(self, text_to_process: str) -> str:
-        """
-        Function can detect multiplied characters in a word and replace them by a single one.
+        - a matched word is a part of another matched word with the same character, eg. 'soooo sooooo' gives
+          'so so' (was 'so soo') and 'EEEE xEEEEy' gives ' xEy' (was ' xy'),
+        - a run of the character starts right after another matched word, eg. 'soooonoooo noooo' gives 'son no'
+          (was 'son n'),
+        - a removed word joins the same characters around it into a new run and the character is repeated again
+          later in the text, eg. 'wait.... ..EEEE!.. ok....' gives 'wait. .... ok.' (was 'wait. . ok.').
 
         ==================  ===========
         Before              After
@@ -872,29 +1442,39 @@ class BasicProcessor:
         Returns:
             str: Text with removed duplicated characters in each word
         """
+        # each character repeated at least 4 times is processed once, in order of the first occurrence
+        entities = []
+        for entity_match in self.multiple_characters_regex.finditer(text_to_process):
+            if entity_match.group(1) not in entities:
+                entities.append(entity_match.group(1))
+
+        for entity in entities:
+            text_to_process = _multiple_characters_entity_regex(entity).sub(
+                lambda match: self._replace_multiple_characters(match, entity),
+                text_to_process
+            )
+        return text_to_process
 
-        for entity in re.findall(self.multiple_characters_regex, text_to_process):
-            match = ""
-            if match not in ['.']:
-                # secure entity if it is a regex character
-                entity_to_find = re.escape(entity)
+    def _replace_multiple_characters(self, match, entity: str) -> str:
+        """
+        *re.sub* callback used by *process_multiple_characters*. Removes the whole word if it contains only the
+        repeated character (and special tokens or punctuation) or reduces the repeated character to a single one.
 
-                for match in re.findall(
-                        "(([^" + entity_to_find + "^\s.]*)([" + entity_to_find + "]{3,})([^" + entity_to_find + "^\s.]*))",
-                        text_to_process):
-                    text_replaced = re.sub(self.multiple_characters_non_sense, "", match[0])
+        Args:
+            match (Match): a match of the *_multiple_characters_entity_regex* regex
+            entity (str): the repeated character
 
-                    if text_replaced == match[2]:
-                        text_to_process = text_to_process.replace(match[0], "")
-                    else:
-                        text_to_process = text_to_process.replace(match[1] + match[2] + match[3],
-                                                                  match[1] + entity + match[3])
-        return text_to_process
+        Returns:
+            str: replacement of the matched word
+        """
+        if re.sub(self.multiple_characters_non_sense, "", match.group(0)) == match.group(2):
+            return ""
+        return match.group(1) + entity + match.group(3)
 
     def get_special_tokens(self) -> List[str]:
         """
-        Function can return all of the special tokens used by *process* function. It can be needed when
-        training SentencePiece tokenizer.
+        Function can return all of the special tokens used by the last call of *process* function in the current
+        thread. It can be needed when training SentencePiece tokenizer.
 
         Returns:
              List[str]: all of the special tokens used in *process* function
@@ -905,6 +1485,81 @@ class BasicProcessor:
             return self.used_special_tokens
 
 
+# a plan built by each of the processes pool workers
+_worker_plan: Union[ProcessingPlan, None] = None
+
+
+class _LazyInitProcessPoolExecutor(ProcessPoolExecutor):
+    """
+    A processes pool for Python < 3.7, where *ProcessPoolExecutor* has no *initializer*. Arguments of
+    *_init_process_worker* are sent with each of the tasks and each worker builds its plan in its first task.
+    """
+
+    def __init__(self, workers: int, init_args: tuple):
+        super().__init__(workers)
+        self.init_args = init_args
+
+
+def _init_process_worker(
+        language: str,
+        options: dict,
+        pre_rules: List[Callable],
+        post_rules: List[Callable],
+        resources: Union[LanguageResources, None] = None
+):
+    """
+    Processes pool initializer. Builds a processing plan once per worker from a picklable description of the plan.
+
+    Args:
+        language (str): a language of the BasicProcessor
+        options (dict): options of the plan, see *BasicProcessor.compile*
+        pre_rules (List[Callable]): picklable *pre_rules*
+        post_rules (List[Callable]): picklable *post_rules*
+        resources (Union[LanguageResources, None]): language resources of the main process, they are inherited by
+        forked workers and unpickled by spawned workers
+    """
+    global _worker_plan
+    if resources is not None:
+        LanguageResources.register(resources)
+    _worker_plan = BasicProcessor(language).compile(pre_rules=pre_rules, post_rules=post_rules, **options)
+
+
+def _run_process_worker(
+        texts: List[str],
+        profile: bool = False,
+        guard_settings: Union[dict, None] = None,
+        init_args: Union[tuple, None] = None
+) -> Tuple[List[str], Tuple[int, List[int]], Union[dict, None], Union[dict, None]]:
+    """
+    Processes pool task, process a chunk of texts with a plan built in *_init_process_worker*.
+
+    Args:
+        texts (List[str]): a chunk of texts to process
+        profile (bool): if True, rules are profiled
+        guard_settings (Union[dict, None]): settings of a *DocumentGuard* (see *DocumentGuard.settings*), no limits if
+        None
+        init_args (Union[tuple, None]): arguments of *_init_process_worker*, if the pool has no initializer (see
+        *_LazyInitProcessPoolExecutor*), the plan is built by the first task of the worker
+
+    Returns:
+        Tuple[List[str], Tuple[int, List[int]], Union[dict, None], Union[dict, None]]: Post-processed texts, prefilter
+        statistics, a profiler report (None if *profile* is False) and a guard report (None if *guard_settings* is
+        None) of the chunk, which are merged in the main process
+    """
+    if _worker_plan is None and init_args is not None:
+        _init_process_worker(*init_args)
+
+    profiler = RuleProfiler() if profile else None
+    guard = None if guard_settings is None else DocumentGuard(**guard_settings)
+    processed = _worker_plan.run_batch(texts, profiler=profiler, guard=guard)
+    return (
+        processed,
+        _worker_plan.pop_stats(),
+        None if profiler is None else profiler.report(),
+        None if guard is None else guard.report()
+    )
+
+
 if __name__ == '__main__':
     # from helper import BASE_DIR
     # import pandas as pd
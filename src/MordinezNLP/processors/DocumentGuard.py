@@ -0,0 +1,208 @@
+import json
+import threading
+from collections import Counter, deque
+from typing import List, Union, Dict, Any
+
+# reason codes of documents which exceeded the limits of a *DocumentGuard*
+OVERSIZE_SEGMENTED = 'oversize_segmented'
+OVERSIZE_DEGRADED = 'oversize_degraded'
+OVERSIZE_DROPPED = 'oversize_dropped'
+TIMEOUT_DEGRADED = 'timeout_degraded'
+TIMEOUT_DROPPED = 'timeout_dropped'
+
+
+class DocumentGuard:
+    """
+    Limits of a single document processing, so a few malformed or huge documents can't stall a whole batch. Some of
+    the processing rules take much more than a linear time on adversarial inputs (eg. a long text with many "(" or "<"
+    and no closing brackets), they are marked as costly (see *ProcessingPlan.Rule*).
+
+    Pass a guard to *BasicProcessor.process*, *BasicProcessor.process_iter* or *ProcessingPlan.run*:
+
+    ::
+
+        guard = DocumentGuard(max_document_size=2000, time_budget=2.0)
+        processed = bp.process(texts, guard=guard)
+
+        print(guard)
+        guard.to_json("guard.json")
+
+    Documents longer than *max_document_size* characters are handled as set by *on_oversize*:
+     - 'segment' - the document is split into segments of at most *segment_size* characters (see
+       *MordinezNLP.processors.Segments.split_into_segments*), each segment is processed separately and the results
+       are joined. Rules can't match across segment boundaries, so the result may be a little different than the
+       result of a whole document,
+     - 'degrade' - the document is processed without the costly rules,
+     - 'drop' - the document is not processed, an empty string is returned.
+
+    *time_budget* is a wall-clock time of the document processing in seconds, checked before each of the costly rules
+    (and so in each segment). A running rule can't be interrupted, so the budget holds only if the costly rules run on
+    short texts. Their time grows with the square of the length of the text (about 0.1 s for 1000 characters and 7 s
+    for 8000 characters of an adversarial input), that's why the default limits are small: documents longer than 2000
+    characters are segmented into segments of at most 1000 characters, so a document can't take much longer than its
+    budget. Most of the documents have safe boundaries (see *MordinezNLP.processors.Segments.safe_boundaries*), their
+    segmented result is the same as the result of the whole document. If the budget is exceeded, the document is
+    handled as set by *on_timeout*:
+     - 'degrade' - the remaining costly rules are skipped (in all of the remaining segments),
+     - 'drop' - processing is stopped, an empty string is returned.
+
+    Each document which exceeded a limit gets reason codes (*OVERSIZE_SEGMENTED*, *OVERSIZE_DEGRADED*,
+    *OVERSIZE_DROPPED*, *TIMEOUT_DEGRADED*, *TIMEOUT_DROPPED*), which are counted in the *report*. The report contains
+    also the last *max_events* guarded documents: their size, processing time, reason codes and the beginning of the
+    text.
+
+    When a *ResultCache* is used, guard settings are a part of the cache key, but results of documents which ran out of
+    the time budget depend on the load of the machine and they are cached like the other results.
+    """
+
+    def __init__(
+            self,
+            max_document_size: Union[int, None] = 2000,
+            time_budget: Union[float, None] = 5.0,
+            on_oversize: str = 'segment',
+            on_timeout: str = 'degrade',
+            segment_size: int = 1000,
+            max_events: int = 100
+    ):
+        """
+        Args:
+            max_document_size (Union[int, None]): maximal number of characters of a document, no limit if None
+            time_budget (Union[float, None]): wall-clock time budget of a single document in seconds, no limit if None
+            on_oversize (str): 'segment', 'degrade' or 'drop', what to do with documents longer than
+            *max_document_size*
+            on_timeout (str): 'degrade' or 'drop', what to do with documents which exceed *time_budget*
+            segment_size (int): maximal number of characters of a segment when *on_oversize* is 'segment'
+            max_events (int): how many of the last guarded documents are kept in the report
+        """
+        if on_oversize not in ['segment', 'degrade', 'drop']:
+            raise Exception('Unknown on_oversize "{}", use "segment", "degrade" or "drop"'.format(on_oversize))
+        if on_timeout not in ['degrade', 'drop']:
+            raise Exception('Unknown on_timeout "{}", use "degrade" or "drop"'.format(on_timeout))
+        if segment_size < 1:
+            raise Exception('Segment size has to be a positive number')
+
+        self.max_document_size = max_document_size
+        self.time_budget = time_budget
+        self.on_oversize = on_oversize
+        self.on_timeout = on_timeout
+        self.segment_size = segment_size
+        self.max_events = max_events
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def settings(self) -> Dict[str, Any]:
+        """
+        Return arguments of the guard, *DocumentGuard(**guard.settings())* builds a guard with the same limits (eg. in
+        a processes pool worker).
+
+        Returns:
+            Dict[str, Any]: arguments of the initializer
+        """
+        return {
+            'max_document_size': self.max_document_size,
+            'time_budget': self.time_budget,
+            'on_oversize': self.on_oversize,
+            'on_timeout': self.on_timeout,
+            'segment_size': self.segment_size,
+            'max_events': self.max_events,
+        }
+
+    def add(self, text: str, seconds: float, reasons: List[str]):
+        """
+        Add a processed document.
+
+        Args:
+            text (str): an input text of the document
+            seconds (float): wall-clock time of the document processing
+            reasons (List[str]): reason codes of the exceeded limits, empty if the document was within the limits
+        """
+        with self._lock:
+            self._documents += 1
+            self._time += seconds
+            self._max_time = max(self._max_time, seconds)
+
+            if len(reasons) > 0:
+                self._guarded += 1
+                self._reasons.update(reasons)
+                self._events.append({
+                    'size': len(text),
+                    'time': seconds,
+                    'reasons': list(reasons),
+                    'text': text[:80],
+                })
+
+    def merge(self, report: Dict[str, Any]):
+        """
+        Add documents from a report of another guard, for example from a processes pool worker.
+
+        Args:
+            report (Dict[str, Any]): a report returned by *report* function
+        """
+        with self._lock:
+            self._documents += report['documents']
+            self._guarded += report['guarded']
+            self._time += report['time']
+            self._max_time = max(self._max_time, report['max_time'])
+            self._reasons.update(report['reasons'])
+            self._events.extend(report['events'])
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Return collected metrics.
+
+        Returns:
+            Dict[str, Any]: number of processed documents, number of documents which exceeded any of the limits, total
+            and maximal wall-clock time of a document, number of documents for each of the reason codes and the last
+            guarded documents
+        """
+        with self._lock:
+            return {
+                'documents': self._documents,
+                'guarded': self._guarded,
+                'time': self._time,
+                'max_time': self._max_time,
+                'reasons': dict(self._reasons),
+                'events': [dict(event) for event in self._events],
+            }
+
+    def to_json(self, path: Union[str, None] = None, indent: int = 2) -> str:
+        """
+        Dump the report as JSON.
+
+        Args:
+            path (Union[str, None]): if set, JSON will be also saved to this file
+            indent (int): JSON indentation
+
+        Returns:
+            str: the report in the JSON format
+        """
+        report_json = json.dumps(self.report(), indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf8") as f:
+                f.write(report_json)
+        return report_json
+
+    def reset(self):
+        """
+        Remove all of the collected metrics.
+        """
+        with self._lock:
+            self._documents = 0
+            self._guarded = 0
+            self._time = 0.0
+            self._max_time = 0.0
+            self._reasons = Counter()
+            self._events = deque(maxlen=self.max_events)
+
+    def __str__(self) -> str:
+        report = self.report()
+        lines = ["{} documents, {} guarded, {:.4f} s, the slowest document {:.4f} s".format(
+            report['documents'],
+            report['guarded'],
+            report['time'],
+            report['max_time']
+        )]
+        for reason, count in sorted(report['reasons'].items()):
+            lines.append("{:<28} {:>9}".format(reason, count))
+        return "\n".join(lines)
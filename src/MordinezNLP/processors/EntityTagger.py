@@ -0,0 +1,376 @@
+import re
+import sys
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union, Pattern
+
+# Regexes below are taken from clean-text 0.3.0 (*cleantext.constants*) together with their quirks (eg. "\\u00a1" in
+# the host name which is a range of ASCII characters, not a range of unicode characters), so the output is the same as
+# the output of *cleantext.clean*. Regexes which start with a lookbehind are split into a class of characters which
+# are allowed before a match and a body, see *EntityTagger*. Lookaheads at the beginning of the bodies are not a part of
+# the clean-text regexes. They check the first characters of a match (for emails: "@" or "(at)" after the local part),
+# so the regexes fail fast at most of the positions in a text, without changing what is matched.
+
+CURRENCIES = ["$", "zł", "£", "¥", "฿", "₡", "₦", "₩", "₪", "₫", "€", "₱", "₲", "₴", "₹"]
+currency_regex = re.compile("({})+".format("|".join(re.escape(currency) for currency in CURRENCIES)))
+
+URL_BODY = (
+    r"(?=[hfw])(?:(?:https?:\/\/|ftp:\/\/|www\d{0,3}\.))"
+    r"(?:\S+(?::\S*)?@)?"
+    r"(?:"
+    r"(?!(?:10|127)(?:\.\d{1,3}){3})"
+    r"(?!(?:169\.254|192\.168)(?:\.\d{1,3}){2})"
+    r"(?!172\.(?:1[6-9]|2\d|3[0-1])(?:\.\d{1,3}){2})"
+    r"(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])"
+    r"(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}"
+    r"(?:\.(?:[1-9]\d?|1\d\d|2[0-4]\d|25[0-4]))"
+    r"|"
+    r"(?:(?:[a-z\\u00a1-\\uffff0-9]-?)*[a-z\\u00a1-\\uffff0-9]+)"
+    r"(?:\.(?:[a-z\\u00a1-\\uffff0-9]-?)*[a-z\\u00a1-\\uffff0-9]+)*"
+    r"(?:\.(?:[a-z\\u00a1-\\uffff]{2,}))"
+    r"|"
+    r"(?:(localhost))"
+    r")"
+    r"(?::\d{2,5})?"
+    r"(?:\/[^\)\]\}\s]*)?"
+)
+EMAIL_BODY = (
+    r"(?=[\w+.-]*[@(<{\[])"
+    r"([\w+-](\.(?!\.))?)*?[\w+-](@|[(<{\[]at[)>}\]])(?:(?:[a-z\\u00a1-\\uffff0-9]-?)*[a-z\\u00a1-\\uffff0-9]+)"
+    r"(?:\.(?:[a-z\\u00a1-\\uffff0-9]-?)*[a-z\\u00a1-\\uffff0-9]+)*(?:\.(?:[a-z\\u00a1-\\uffff]{2,}))"
+)
+PHONE_BODY = (
+    r"(?=[+(\d])"
+    r"(((\+?[01])|(\+\d{2}))[ .-]?)?(\(?\d{3,4}\)?/?[ .-]?)?(\d{3}[ .-]?\d{4})(\s?(?:ext\.?|[#x-])\s?\d{2,6})?"
+    r"(?:$|(?=\W))"
+)
+# "\+?\d{4,5}[ .-/]\d{6,9}" written so that it starts with a class of characters, see *_entity_regexes*
+PHONE_BODY_WITHOUT_LOOKBEHIND = r"[+\d](?:(?<=\+)\d{4,5}|(?<=\d)\d{3,4})[ .-/]\d{6,9}"
+NUMBER_BODY = (
+    r"(?=[+–\-\d.,])"
+    r"[+–-]?(([1-9]\d{0,2}(,\d{3})+(\.\d*)?)|([1-9]\d{0,2}([ .]\d{3})+(,\d*)?)|(\d*?[.,]\d+)|\d+)(?:$|(?=\b))"
+)
+
+# Entities in the order in which *cleantext.clean* replaces them. For each entity a list of alternatives: a class of
+# characters allowed before a match (None if there is no such condition), a body and regex flags.
+ENTITIES = ['url', 'email', 'phone', 'number']
+ENTITY_BRANCHES = {
+    'url': [(r"[^\w\/\.]", URL_BODY, re.IGNORECASE)],
+    'email': [(r"[^\w@.)]", EMAIL_BODY, re.IGNORECASE)],
+    'phone': [(r"[^\w)]", PHONE_BODY, 0), (None, PHONE_BODY_WITHOUT_LOOKBEHIND, 0)],
+    'number': [(r"[^\w,.]", NUMBER_BODY, 0)],
+}
+
+# texts without any of these can't contain an url, an email, a phone number or a number
+ENTITY_TRIGGERS = {
+    'url': r"https?:|ftp:|www",
+    'email': r"@|[(<{\[]at[)>}\]]",
+    'phone': r"\d",
+    'number': r"\d",
+}
+
+linebreak_regex = re.compile(r"((\r\n)|[\n\v])+")
+multi_whitespace_to_one_regex = re.compile(r"\s+")
+# the same as "(?!\n)\s+" in clean-text, but it starts with a class of characters, so it is faster
+nonbreaking_space_regex = re.compile(r"[^\S\n]\s*")
+digit_regex = re.compile(r"\d")
+
+# special tokens which can't be a part of any entity and can't change which entities are found next to them
+safe_token_regex = re.compile(r"<[a-zA-Z_]+>")
+
+
+def _branch_regex(allowed_before: Union[str, None], body: str, flags: int) -> str:
+    scoped_flags = "(?i:{})" if flags & re.IGNORECASE else "(?:{})"
+    if allowed_before is None:
+        return scoped_flags.format(body)
+    return scoped_flags.format(r"(?:^|(?<={}))(?:{})".format(allowed_before, body))
+
+
+@lru_cache(maxsize=None)
+def _entity_regexes(entities: Tuple[str, ...]) -> Dict[str, Union[Pattern, None]]:
+    """
+    Compile regexes of the enabled entities. They don't depend on the replacement tokens, so they are shared by all
+    of the taggers with the same entities enabled.
+
+    The "scan" regex is searched in a text with a space prepended. Alternatives which have a condition on the preceding
+    character consume it instead of checking it with a lookbehind, so every alternative starts with a class of
+    characters and the regex engine skips positions which can't start a match (eg. letters inside words) much faster.
+    Such an alternative matches an entity one character after the start of the match, so alternatives without the
+    condition are placed first and are excluded by a negative lookahead from the entities replaced after them.
+
+    Args:
+        entities (Tuple[str, ...]): enabled entities in the *ENTITIES* order
+
+    Returns:
+        Dict[str, Union[Pattern, None]]: "scan" - a regex with a named group for each of the alternatives of all
+        entities, "<entity>" - a full regex of the entity, "higher_<entity>" - a regex of all entities replaced before
+        the entity (None for the first one), "start" - a regex which matches if any entity can start at a position
+        (whatever the preceding character is), "trigger" - a regex of characters needed by any of the entities
+    """
+    regexes = {}
+    groups = []
+    bodies = []
+    without_before = []
+    scan_without_before = []
+    scan_with_before = []
+    for entity in entities:
+        alternatives = [
+            "(?P<{}_{}>{})".format(entity, index, _branch_regex(*branch))
+            for index, branch in enumerate(ENTITY_BRANCHES[entity])
+        ]
+        regexes['higher_' + entity] = re.compile("|".join(groups)) if len(groups) > 0 else None
+        regexes[entity] = re.compile("|".join(alternatives))
+        groups += alternatives
+
+        exclude = "(?!{})".format("|".join(without_before)) if len(without_before) > 0 else ""
+        for index, (allowed_before, body, flags) in enumerate(ENTITY_BRANCHES[entity]):
+            scoped_body = ("(?i:{})" if flags & re.IGNORECASE else "(?:{})").format(body)
+            bodies.append(scoped_body)
+            if allowed_before is None:
+                without_before.append(scoped_body)
+                scan_without_before.append("(?P<{}_{}>{})".format(entity, index, scoped_body))
+            else:
+                scan_with_before.append("(?P<{}_{}_before>{}{}{})".format(entity, index, allowed_before, exclude,
+                                                                    scoped_body))
+
+    regexes['scan'] = re.compile("|".join(scan_without_before + scan_with_before))
+    regexes['start'] = re.compile("|".join(bodies))
+    regexes['trigger'] = re.compile("|".join(sorted(set(ENTITY_TRIGGERS[entity] for entity in entities))),
+                                    re.IGNORECASE)
+    return regexes
+
+
+@lru_cache(maxsize=None)
+def _branches(entity: str) -> List[Tuple[Union[Pattern, None], Pattern]]:
+    # compiled alternatives of the entity, used to match it right after a replaced entity
+    return [
+        (None if allowed_before is None else re.compile(allowed_before), re.compile(body, flags))
+        for allowed_before, body, flags in ENTITY_BRANCHES[entity]
+    ]
+
+
+@lru_cache(maxsize=1)
+def _punct_translation() -> Dict[int, str]:
+    # built on the first use, it takes a while to check all of the unicode characters
+    return dict.fromkeys(
+        (i for i in range(sys.maxunicode) if unicodedata.category(chr(i)).startswith("P")),
+        ""
+    )
+
+
+class EntityTagger:
+    """
+    Replace urls, emails, phone numbers, numbers and currency symbols with special tokens, like *cleantext.clean*
+    does, but in a single left to right scan of a text instead of a separate pass for each of the entities.
+
+    *cleantext.clean* replaces entities one after another (currency symbols, urls, emails, phone numbers, numbers),
+    so a token inserted in place of one entity is a context for the next ones (eg. "<url>-5" is replaced with
+    "<url><number>", but "com-5" with "com-<number>"). The scan reproduces it:
+     - currency symbols are replaced first, only in texts which contain them,
+     - all of the other entities are found by a single regex, if two of them start at the same position, the one
+       replaced earlier by *cleantext.clean* wins,
+     - right after a replaced entity, the entities are matched once more, with the special token as the preceding
+       character.
+
+    Rare texts in which an entity overlaps an entity which is replaced earlier by *cleantext.clean* (eg. "info@www.
+    example.com", where *cleantext.clean* replaces the url first), are processed entity after entity. The same is done
+    for all texts if any of the replacements is not a simple special token like "<url>".
+    """
+
+    def __init__(
+            self,
+            lower: bool = False,
+            no_line_breaks: bool = False,
+            no_urls: bool = False,
+            no_emails: bool = True,
+            no_phone_numbers: bool = True,
+            no_numbers: bool = True,
+            no_digits: bool = False,
+            no_currency_symbols: bool = True,
+            no_punct: bool = False,
+            replace_with_url: str = "<url>",
+            replace_with_email: str = "<email>",
+            replace_with_phone_number: str = "<phone>",
+            replace_with_number: str = "<number>",
+            replace_with_digit: str = "0",
+            replace_with_currency_symbol: str = "<currency>",
+    ):
+        """
+        Args are the same as for the *BasicProcessor._basic_clean* function.
+        """
+        self.lower = lower
+        self.no_line_breaks = no_line_breaks
+        self.no_digits = no_digits
+        self.no_currency_symbols = no_currency_symbols
+        self.no_punct = no_punct
+        self.replace_with_digit = replace_with_digit
+        self.replace_with_currency_symbol = replace_with_currency_symbol
+
+        enabled = {'url': no_urls, 'email': no_emails, 'phone': no_phone_numbers, 'number': no_numbers}
+        self.entities = tuple(entity for entity in ENTITIES if enabled[entity])
+        self.tokens = {
+            'url': replace_with_url,
+            'email': replace_with_email,
+            'phone': replace_with_phone_number,
+            'number': replace_with_number,
+        }
+        self.ranks = {entity: rank for rank, entity in enumerate(self.entities)}
+
+        self.regexes = _entity_regexes(self.entities) if len(self.entities) > 0 else None
+        self.single_scan = all(safe_token_regex.fullmatch(self.tokens[entity]) for entity in self.entities)
+
+    def __call__(self, text: str) -> str:
+        return self.tag(text)
+
+    def tag(self, text: str) -> str:
+        """
+        Replace entities in a text with special tokens.
+
+        Args:
+            text (str): a text to process
+
+        Returns:
+            str: processed text
+        """
+        return self.tag_and_count(text)[0]
+
+    def count(self, text: str) -> Tuple[str, int]:
+        """
+        The same as *tag*, but returns also a number of replaced entities (like *re.subn*).
+
+        Args:
+            text (str): a text to process
+
+        Returns:
+            Tuple[str, int]: processed text and a number of replaced entities
+        """
+        text, counts = self.tag_and_count(text)
+        return text, sum(counts.values())
+
+    def tag_and_count(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Replace entities in a text with special tokens and report what was replaced.
+
+        Args:
+            text (str): a text to process
+
+        Returns:
+            Tuple[str, Dict[str, int]]: processed text and a number of replacements of each entity ("currency",
+            "url", "email", "phone", "number" and "digit"), entities which weren't found are omitted
+        """
+        counts = Counter()
+
+        if self.no_currency_symbols:
+            text, replaced = currency_regex.subn(self.replace_with_currency_symbol, text)
+            if replaced > 0:
+                counts['currency'] = replaced
+
+        if self.regexes is not None and self.regexes['trigger'].search(text) is not None:
+            tagged = self._scan(text, counts) if self.single_scan else None
+            text = tagged if tagged is not None else self._tag_one_by_one(text, counts)
+
+        if self.no_digits:
+            text, replaced = digit_regex.subn(self.replace_with_digit, text)
+            if replaced > 0:
+                counts['digit'] = replaced
+        if self.no_punct:
+            text = text.translate(_punct_translation())
+        if self.lower:
+            text = text.lower()
+
+        if self.no_line_breaks:
+            text = multi_whitespace_to_one_regex.sub(" ", text)
+        else:
+            text = nonbreaking_space_regex.sub(" ", linebreak_regex.sub(r"\n", text))
+        return text.strip(), dict(counts)
+
+    def _scan(self, text: str, counts: Counter) -> Union[str, None]:
+        """
+        Replace urls, emails, phone numbers and numbers in a single scan.
+
+        Args:
+            text (str): a text to process
+            counts (Counter): number of replacements of each entity, updated only if the text is processed
+
+        Returns:
+            Union[str, None]: processed text or None if entities overlap and the text has to be processed entity after
+            entity
+        """
+        # the space is allowed before all of the entities, like the beginning of the text
+        text = " " + text
+        search = self.regexes['scan'].search
+        parts = []
+        found = Counter()
+        position = 1
+        # an entity replaced right before *position*
+        previous = None
+
+        while position < len(text):
+            match = self._match_after(text, position, previous) if previous is not None else None
+            if match is None:
+                # the character before *position* is a part of the replaced entity, so the next one can start at
+                # *position* + 1 at the earliest (an entity starting at *position* is matched by *_match_after*)
+                regex_match = search(text, position - 1 if previous is None else position)
+                if regex_match is None:
+                    break
+                group = regex_match.lastgroup
+                start = regex_match.start() + (1 if group.endswith("_before") else 0)
+                match = (group.split("_", 1)[0], start, regex_match.end())
+
+            entity, start, end = match
+            if self._overlaps_higher(text, entity, start, end):
+                return None
+
+            parts.append(text[position:start])
+            parts.append(self.tokens[entity])
+            found[entity] += 1
+            position = end
+            previous = entity
+
+        parts.append(text[position:])
+        counts.update(found)
+        return "".join(parts)
+
+    def _match_after(self, text: str, position: int, previous: str) -> Union[Tuple[str, int, int], None]:
+        """
+        Match an entity which starts right after a replaced *previous* entity. Entities replaced after the *previous*
+        one by *cleantext.clean* see its special token as the preceding character, the other see the original text.
+        """
+        if self.regexes['start'].match(text, position) is None:
+            return None
+
+        for entity in self.entities:
+            if self.ranks[entity] > self.ranks[previous]:
+                before = self.tokens[previous][-1]
+            else:
+                before = text[position - 1]
+
+            for allowed_before, body in _branches(entity):
+                if allowed_before is not None and allowed_before.match(before) is None:
+                    continue
+                match = body.match(text, position)
+                if match is not None:
+                    return entity, position, match.end()
+        return None
+
+    def _overlaps_higher(self, text: str, entity: str, start: int, end: int) -> bool:
+        # Check if any entity which is replaced earlier by *cleantext.clean* starts inside the matched entity or right
+        # after it. In the second case its special token could change the end of the matched entity (eg. "1 000," in
+        # "1 000,john@example.com" is a number, but in "1 000,<email>" only "1 000" is).
+        higher = self.regexes['higher_' + entity]
+        if higher is None:
+            return False
+
+        for position in range(start + 1, min(end + 1, len(text))):
+            if higher.match(text, position) is not None:
+                return True
+        return False
+
+    def _tag_one_by_one(self, text: str, counts: Counter) -> str:
+        # the same as *cleantext.clean*, a separate pass for each of the entities
+        for entity in self.entities:
+            text, replaced = self.regexes[entity].subn(self.tokens[entity], text)
+            if replaced > 0:
+                counts[entity] += replaced
+        return text
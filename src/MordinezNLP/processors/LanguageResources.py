@@ -0,0 +1,346 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Tuple, Pattern
+
+try:
+    from src.MordinezNLP.utils.trie_regex import trie_regex
+except:
+    from MordinezNLP.utils.trie_regex import trie_regex
+
+# re.Pattern is available since Python 3.7
+_pattern_type = type(re.compile(""))
+
+
+@lru_cache(maxsize=None)
+def language_days(language: str) -> Tuple[str, ...]:
+    """
+    Return language specific names of days of the week. Names are built once per process, see
+    *BasicProcessor.load_language_days*.
+
+    Args:
+        language (str): a language in which return name of days of the week
+
+    Returns:
+        Tuple[str, ...]: day names in specified language
+    """
+    if language == 'en':
+        return (
+            'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'
+        )
+    elif language == 'de':
+        return (
+            'montag', 'dienstag', 'mittwoch', 'donnerstag', 'freitag', 'samstag', 'sonntag'
+        )
+    else:
+        raise Exception('Cant\'t load language specified data')
+
+
+@lru_cache(maxsize=None)
+def language_months(language: str) -> Tuple[str, ...]:
+    """
+    Return language specific names of months. Names are built once per process, see
+    *BasicProcessor.load_language_months*.
+
+    Args:
+        language (str): language in which return names
+
+    Returns:
+        Tuple[str, ...]: months in specified language
+    """
+    if language == 'en':
+        return (
+            'january', 'february', 'march',
+            'april', 'may', 'june',
+            'july', 'october', 'september',
+            'august', 'november', 'december'
+        )
+    elif language == 'de':
+        return (
+            'januar', 'februar', 'märz',
+            'april', 'mai', 'juni',
+            'juli', 'august', 'september',
+            'oktober', 'november', 'dezember'
+        )
+    else:
+        raise Exception('Cant\'t load language specified data')
+
+
+@lru_cache(maxsize=None)
+def numerals(language: str) -> Tuple[str, ...]:
+    """
+    Build language specific numerals once per process, see *BasicProcessor.load_numerals*.
+    Currently supported numerals are from 1 to 99.
+
+    Args:
+        language (str): a language in which function will return numerals
+
+    Returns:
+        Tuple[str, ...]: numerals in specified language
+    """
+    if language == 'en':
+        base = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+        tenths = ['ten', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+
+        language_numerals = base + \
+                            tenths[0:1] + \
+                            ['eleven', 'twelve', 'thirteen'] + \
+                            [''.join([base_num, 'teen']) for base_num in base[3:]]
+
+        for i, tenth in enumerate(tenths[1:]):
+            language_numerals += tenths[i + 1:i + 2]
+            language_numerals += [' '.join([tenths[i + 1], base_num]) for base_num in base]
+
+        return tuple(language_numerals)
+    elif language == 'de':
+        # todo add german language version
+        raise Exception('Cant\'t load language specified data')
+    else:
+        raise Exception('Cant\'t load language specified data')
+
+
+@lru_cache(maxsize=None)
+def ordinals(language: str) -> Tuple[str, ...]:
+    """
+    Build language specific ordinals once per process, see *BasicProcessor.load_ordinals*.
+    Currently supported ordinals from 1 to 99
+
+    Args:
+        language (str): a language in which function will return ordinals
+
+    Returns:
+        Tuple[str, ...]: ordinals in specified language
+    """
+    if language == 'en':
+        base_numerals = numerals(language)
+        ordinals_base = ['first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'nineth']
+        language_ordinals = ordinals_base[:]
+
+        for i, num in enumerate(base_numerals[9:19]):
+            language_ordinals.append("".join([num, 'th']))
+
+        for tenth_num in range(19, len(base_numerals), 10):
+            language_ordinals.append("".join([base_numerals[tenth_num][:-1], 'ieth']))
+
+            for num in ordinals_base:
+                language_ordinals.append("-".join([base_numerals[tenth_num], num]))
+
+        return tuple(language_ordinals)
+    elif language == 'de':
+        # todo add german language version
+        raise Exception('Cant\'t load language specified data')
+    else:
+        raise Exception('Cant\'t load language specified data')
+
+
+@lru_cache(maxsize=None)
+def date_ordinals(language: str) -> Tuple[str, ...]:
+    """
+    Load ordinals for dates and prepare it for multi use cases, once per process, see
+    *BasicProcessor._load_date_ordinals*.
+
+    Args:
+        language (str): an ordinals language
+
+    Returns:
+        Tuple[str, ...]: regex ready date ordinals
+    """
+    if language == 'en':
+        to_return = []
+        for ordinal in ordinals(language)[:31]:
+            if ' ' in ordinal:
+                to_return.append(ordinal.replace(' ', ''))
+
+            if '-' in ordinal:
+                to_return.append(ordinal.replace('-', ''))
+
+            to_return.append(ordinal)
+        return tuple(to_return)
+    elif language == 'de':
+        # todo add german language version
+        raise Exception('Cant\'t load language specified data')
+    else:
+        raise Exception('Cant\'t load language specified data')
+
+
+class LanguageResources:
+    """
+    Language specific word lists and compiled regexes used by *BasicProcessor*. They are built once per process for
+    each of the languages and shared by all of the processors, so creating a processor (per worker, per request or per
+    test) doesn't build them again:
+
+    ::
+
+        resources = LanguageResources.get('en')
+        resources.patterns['space_regex'].sub(" ", text)
+
+    Resources are picklable. A processes pool worker created by *fork* inherits them from the main process, a worker
+    created by *spawn* or *forkserver* gets them with the pool initializer arguments and adds them with *register*
+    (compiled regexes are unpickled from their pattern strings, so names of days, months and ordinals are not turned
+    into tries again).
+
+    Resources are shared, don't modify them. To use a different regex in a single processor, set its attribute (eg.
+    *bp.common_dates_combined*).
+    """
+
+    _instances: Dict[str, 'LanguageResources'] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, language: str):
+        """
+        Build resources of a language, use *get* to get resources shared in the process.
+
+        Args:
+            language (str): a language shortcut
+        """
+        self.language = language
+
+        # ==== BASE PROCESSING RULES SECTION ====
+        # Some of the regexes below start with a lookahead of the first characters of every alternative, eg. "(?=<)".
+        # It doesn't change what is matched, but the regex engine can jump between those characters instead of trying
+        # each alternative at every position of the text.
+
+        # find any digit, used as a precondition of the rules which need digits
+        self.digit_regex = re.compile(r"\d")
+
+        # remove everything what is in a html tags
+        self.base_brackets_regex = re.compile(r"<([^\s]*)>")
+        # replace sequence of digit more/more or equal than digit to <digit> <more> <digit>
+        self.more_than_regex = re.compile(r"\d+\s*(>|>=)\s*\d+")
+        # replace sequence of digit less/less or equal than digit to <digit> <less> <digit>
+        self.less_than_regex = re.compile(r"\d+\s*(<|<=)\s*\d+")
+
+        # process lists
+        #                                           /---- Positive and Negative Lookbehind
+        self.list_last_item_regex = re.compile(r"(?<=\n)(-|>)\s*([^,\n]*)\n([^-^>]|$)")
+        #                                       /---- Positive and Negative Lookbehind
+        self.list_item_regex = re.compile(r"(?<=\n)(-|>)\s*([^,\n]*),*\n")
+
+        # fix a>>>>> <<<<another>>  ->   a another
+        self.fix_base_brackets_1 = re.compile(r"(?=[\s<])(?:(\s+(<|>)+\s+)|(\s+>+)+|(<+\s+)+|(\s+(<|>){2,}\s+))")
+        # fix other> -> other
+        self.fix_base_brackets_2_left = re.compile(r"(\s+([a-zA-Z0-9äöüÄÖÜßùàûâüæÿçéèêëïîôœ,.()!?\-:']+)(>+)\s+)")
+        # fix <and -> and
+        self.fix_base_brackets_2_right = re.compile(r"(\s+(<+)([a-zA-Z0-9äöüÄÖÜßùàûâüæÿçéèêëïîôœ,.()!?\-:']+)\s+)")
+
+        # fix la<te don>'t  ->  late don't
+        self.fix_brackets_in_words = re.compile(r"\s+(([^\s^<^>])+)(<|>)+(([^\s^<^>])+)\s+")
+
+        # limit to a specified set of characters
+        self.limit_regex = re.compile(r"(([^a-zA-Z0-9,\.<> !?äöüÄÖÜßùàûâüæÿçéèêëïîôœ@\-:()\[\]'])|([^\s]{30,}))",
+                                      re.IGNORECASE)
+
+        # replace more than 2 spaces to a single one
+        self.space_regex = re.compile(r"(\s{2,})")
+        # split each word which has two uppercase letters ReCure -> Re Cure
+        self.double_upper_case_letters = re.compile(r"([A-Z][^\s^A-Z^\-^.^,^?^!]+)([A-Z][^\s^A-Z^\-^.^,^?^!]+)")
+        # escape eveything what is in brackets
+        self.none_regex = re.compile(r"(?=[\s(\[])(\s*(((\()([^\)]+)(\)))|((\[)([^\]]+)(\])))\s*)", re.IGNORECASE)
+
+        # place space before and after all digits
+        self.no_space_digits_regex = re.compile(r"(\d+)(th|st|nd|rd)*")
+
+        # match space before punct
+        self.space_and_punct = re.compile(r"(\s+)([?!.,:])")
+
+        # replace all custom tags where one exists after one to a single one, from <date> <date>    <date> -> <date>
+        self.multi_tag_regex = re.compile(
+            r"(?=<)(((<currency>[\s,]*){2,})|((<date>[\s,]*){2,})|((<unk>[\s,]*){2,})|((<number>[\s,]*){2,})|((<url>[\s,]*){2,})|((<email>[\s,]*){2,})|((<less>[\s,]*){2,})|((<more>[\s,]*){2,})|((<bracket>[\s,]*){2,}))",
+            re.IGNORECASE)
+        # replace special token occurences one by one with colons
+        self.multi_tag_colon_regex = re.compile(
+            r"(?=<)(((<currency>[:]*){2,})|((<date>[:]*){2,})|((<unk>[:]*){2,})|((<number>[:]*){2,})|((<url>[:]*){2,})|((<email>[:]*){2,})|((<less>[:]*){2,})|((<more>[:]*){2,})|((<bracket>[:]*){2,}))",
+            re.IGNORECASE)
+
+        # remove starting space
+        self.starting_space_regex = re.compile(r"^(\s)+", re.IGNORECASE)
+        # remove ending space
+        self.ending_space_regex = re.compile(r"(\s)+$", re.IGNORECASE)
+
+        # match emails
+        self.email_regex = re.compile(
+            r"[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*")
+        # match urls and emails that where not matched by a *self.email_regex*
+        self.url_email_regex = re.compile(
+            r"(https?:\/\/)?(www\.)?[-a-zA-Z0-9@:%._\+~#=]{2,256}\.[a-z]{2,6}\b([-a-zA-Z0-9@:%_\+.~#?&\/=]*)")
+        # fix cleantext url removing dot "." at the end of string
+        self.url_fix_regex = re.compile("(<url>)\s+([A-Z])")
+
+        # remove quote marks
+        self.quote_regex = re.compile(r'["\'‘’]([^ts])', re.IGNORECASE)
+
+        # regexes used by *process_multiple_characters* function #
+        self.multiple_characters_regex = re.compile(r"(.)\1{3,}")
+        self.multiple_characters_non_sense = re.compile(
+            r"(<number>|<date>|<unknown>|<url>|<email>|<more>|<less>|<currency>)|[,\.<>!?]", re.IGNORECASE)
+
+        # final regex which removes double dots and newline (from HTML_Parser)
+        self.double_dots = re.compile(r"\.\.\n")
+
+        # remove hyphenated
+        self.hyphenated_regex = re.compile(r"\s+([^\-<>\s]+)-([^\-<>\s]+)\s+")
+
+        # ==== DATES SECTION ====
+        # common dates - a common dates formats used in multiple languages
+        self.common_dates = re.compile(r"(\s+\d{1,4}\s*([-./])\s*\d{1,4}([-./])\s*\d{2,4})", re.IGNORECASE)
+        # names of days, ordinals and months are compiled into tries (see *trie_regex*), so each position of a text is
+        # rejected after a few characters, instead of trying each of the names
+        self.common_dates_combined = re.compile(
+            r"((" + trie_regex(language_days(language)) + r")*\s*((" + trie_regex(
+                date_ordinals(
+                    language)) + r")|(0*([1-9]{1,2})(st|nd|rd|th)*))\s+(of\s+)*(" + trie_regex(
+                language_months(language)) + r"))\s*\d{0,4}s*", re.IGNORECASE)
+
+        # en dates
+        self.en_dates = re.compile(r"(?=[eli\d])(((early|late)\s*\d{2,4}s*)|(in\s+\d{2,4}s*)|(\d{2,4}s))", re.IGNORECASE)
+
+    @property
+    def patterns(self) -> Dict[str, Pattern]:
+        """
+        Compiled regexes by their names (names of *BasicProcessor* attributes).
+
+        Returns:
+            Dict[str, Pattern]: compiled regexes
+        """
+        return {name: value for name, value in vars(self).items() if isinstance(value, _pattern_type)}
+
+    @classmethod
+    def get(cls, language: str) -> 'LanguageResources':
+        """
+        Return resources of a language shared in the process, build them if they are not built yet.
+
+        Args:
+            language (str): a language shortcut
+
+        Returns:
+            LanguageResources: shared resources of the language
+        """
+        resources = cls._instances.get(language)
+        if resources is None:
+            with cls._lock:
+                resources = cls._instances.get(language)
+                if resources is None:
+                    resources = cls(language)
+                    cls._instances[language] = resources
+        return resources
+
+    @classmethod
+    def register(cls, resources: 'LanguageResources'):
+        """
+        Share resources built in another process (eg. unpickled in a processes pool worker), *get* will return them.
+        Resources of a language which are already built in the process are kept.
+
+        Args:
+            resources (LanguageResources): resources to share
+        """
+        with cls._lock:
+            cls._instances.setdefault(resources.language, resources)
+
+    @classmethod
+    def clear(cls):
+        """
+        Remove all of the shared resources, they will be built again by *get*. Processors which already exist keep
+        their regexes.
+        """
+        with cls._lock:
+            cls._instances.clear()
@@ -0,0 +1,483 @@
+import threading
+import time
+from functools import partial
+from typing import List, Callable, Union, Dict, Any, Tuple
+
+from ftfy import fix_text
+from tqdm.auto import tqdm
+
+try:
+    from src.MordinezNLP.processors.DocumentGuard import DocumentGuard, OVERSIZE_SEGMENTED, OVERSIZE_DEGRADED, \
+        OVERSIZE_DROPPED, TIMEOUT_DEGRADED, TIMEOUT_DROPPED
+    from src.MordinezNLP.processors.RuleProfiler import RuleProfiler
+    from src.MordinezNLP.processors.Segments import split_into_segments, join_segments
+    from src.MordinezNLP.processors.UnicodeRepair import needs_unicode_repair
+except:
+    from MordinezNLP.processors.DocumentGuard import DocumentGuard, OVERSIZE_SEGMENTED, OVERSIZE_DEGRADED, \
+        OVERSIZE_DROPPED, TIMEOUT_DEGRADED, TIMEOUT_DROPPED
+    from MordinezNLP.processors.RuleProfiler import RuleProfiler
+    from MordinezNLP.processors.Segments import split_into_segments, join_segments
+    from MordinezNLP.processors.UnicodeRepair import needs_unicode_repair
+
+
+class Rule:
+    """
+    A single processing rule with an optional cheap precondition. If the precondition fails for a text, the rule
+    can't change it, so it is skipped.
+
+    Each rule has a name, which is used in profiling reports (see *RuleProfiler*).
+
+    Rules which can take much more than a linear time on some inputs (eg. regexes which backtrack on long texts
+    without closing brackets) are marked as costly. *DocumentGuard* skips them in documents which are too large or run
+    out of their time budget.
+    """
+
+    def __init__(
+            self,
+            function: Callable[[str], str],
+            triggers: Union[List[str], Any, None] = None,
+            name: Union[str, None] = None,
+            count_function: Union[Callable[[str], Tuple[str, int]], None] = None,
+            costly: bool = False
+    ):
+        """
+        Args:
+            function (Callable[[str], str]): a rule, takes a str and returns a str
+            triggers (Union[List[str], Pattern, Callable[[str], bool], None]): if it is a list of strings, the rule is
+            run only if at least one of them is in the text. If it is a compiled regex, the rule is run only if the
+            regex can be found in the text. If it is a function, the rule is run only if it returns True for the
+            text. If None, the rule is always run.
+            name (Union[str, None]): a name of the rule, if None, the plan will name it by its position
+            count_function (Union[Callable[[str], Tuple[str, int]], None]): the same rule, but returning also a number
+            of substitutions (like *re.subn*), used only when the rule is profiled
+            costly (bool): if True, the rule is skipped in degraded processing (see *DocumentGuard*)
+        """
+        self.function = function
+        self.triggers = triggers
+        self.name = name
+        self.count_function = count_function
+        self.costly = costly
+
+        if triggers is None:
+            self.precondition = None
+        elif type(triggers) is list:
+            self.precondition = lambda text: any(trigger in text for trigger in triggers)
+        elif callable(triggers):
+            self.precondition = triggers
+        else:
+            self.precondition = triggers.search
+
+    @classmethod
+    def regex(
+            cls,
+            pattern: Any,
+            replacement: str,
+            triggers: Union[List[str], Any, None] = None,
+            name: Union[str, None] = None,
+            costly: bool = False
+    ) -> 'Rule':
+        """
+        Build a rule which replaces all matches of a compiled regex, the same as *re.sub(pattern, replacement, text)*.
+
+        Args:
+            pattern (Pattern): a compiled regex
+            replacement (str): a replacement string, can contain groups references
+            triggers (Union[List[str], Pattern, None]): the same as in the initializer
+            name (Union[str, None]): the same as in the initializer
+            costly (bool): the same as in the initializer
+
+        Returns:
+            Rule: a regex rule
+        """
+        return cls(
+            partial(pattern.sub, replacement),
+            triggers,
+            name,
+            count_function=partial(pattern.subn, replacement),
+            costly=costly
+        )
+
+    def __call__(self, text: str) -> str:
+        if self.precondition is None or self.precondition(text):
+            return self.function(text)
+        return text
+
+
+class ProcessingPlan:
+    """
+    A compiled chain of processing rules built by *BasicProcessor.compile*. All of the rules (including *pre_rules* and
+    *post_rules*) are built once, so running a plan many times doesn't cost anything more than the rules themselves.
+
+    Rules with a precondition are skipped for texts in which they can't match anything. Use *prefilter_stats* to check
+    how many rule executions were avoided. Rules skipped by a *DocumentGuard* (costly rules of degraded documents and
+    all rules of dropped documents) are counted separately.
+
+    Pass a *RuleProfiler* to *run* or *run_batch* to measure each of the rules, and a *DocumentGuard* to limit size
+    and processing time of each document.
+
+    Unicode is repaired with *ftfy.fix_text* once, before all of the rules (the "fix_text" rule). Texts which ftfy can't
+    change (eg. pure ASCII texts) skip it, see *UnicodeRepair.needs_unicode_repair*.
+    """
+
+    def __init__(
+            self,
+            rules: List[Union[Rule, Callable]],
+            options: Dict[str, Any],
+            special_tokens: List[str],
+            pre_rules: List[Callable] = [],
+            post_rules: List[Callable] = []
+    ):
+        """
+        Args:
+            rules (List[Union[Rule, Callable]]): a ready to use list of rules, each rule takes a str and returns a str
+            options (Dict[str, Any]): processing options from which the plan was built
+            special_tokens (List[str]): special tokens which can be produced by the plan
+            pre_rules (List[Callable]): custom *pre_rules* included in *rules*
+            post_rules (List[Callable]): custom *post_rules* included in *rules*
+        """
+        rules = [rule if isinstance(rule, Rule) else Rule(rule) for rule in rules]
+        for index, rule in enumerate(rules):
+            if rule.name is None:
+                rule.name = "rule_{}".format(index)
+
+        self.rules = [Rule(fix_text, needs_unicode_repair, name="fix_text")] + rules
+        self.options = options
+        self.special_tokens = special_tokens
+        self.pre_rules = list(pre_rules)
+        self.post_rules = list(post_rules)
+
+        self._stats_lock = threading.Lock()
+        self._documents = 0
+        self._skipped = [0] * len(self.rules)
+        self._degraded = [0] * len(self.rules)
+        self._dropped = [0] * len(self.rules)
+
+    def _run_rules(
+            self,
+            text: str,
+            profiler: Union[RuleProfiler, None] = None,
+            guard: Union[DocumentGuard, None] = None
+    ) -> Tuple[str, List[int], List[int], List[int]]:
+        """
+        Process a single text with all of the rules.
+
+        Args:
+            text (str): an input text to process
+            profiler (Union[RuleProfiler, None]): a profiler to record rules measurements
+            guard (Union[DocumentGuard, None]): limits of the document processing
+
+        Returns:
+            Tuple[str, List[int], List[int], List[int]]: Post-processed text, indexes of rules skipped because of
+            failed preconditions, indexes of costly rules skipped in degraded processing and indexes of rules which
+            weren't run, because the document was dropped
+        """
+        if guard is not None:
+            return self._run_rules_guarded(text, guard, profiler)
+        if profiler is not None:
+            return self._run_rules_profiled(text, profiler)
+
+        skipped = []
+        for index, rule in enumerate(self.rules):
+            if rule.precondition is None or rule.precondition(text):
+                text = rule.function(text)
+            else:
+                skipped.append(index)
+        return text, skipped, [], []
+
+    def _run_rules_profiled(self, text: str, profiler: RuleProfiler) -> Tuple[str, List[int], List[int], List[int]]:
+        """
+        The same as *_run_rules*, but each of the rules is measured and recorded in the *profiler*.
+        """
+        skipped = []
+        records = []
+        for index, rule in enumerate(self.rules):
+            if rule.precondition is not None and not rule.precondition(text):
+                skipped.append(index)
+                records.append((rule.name, None, None, len(text), len(text), False))
+                continue
+
+            start = time.perf_counter()
+            if rule.count_function is not None:
+                processed_text, substitutions = rule.count_function(text)
+            else:
+                processed_text, substitutions = rule.function(text), None
+            seconds = time.perf_counter() - start
+            # only numbers are recorded, profiling doesn't keep texts of the documents alive
+            changed = processed_text is not text and processed_text != text
+            records.append((rule.name, seconds, substitutions, len(text), len(processed_text), changed))
+            text = processed_text
+
+        profiler.add(records)
+        return text, skipped, [], []
+
+    def _run_rules_guarded(
+            self,
+            text: str,
+            guard: DocumentGuard,
+            profiler: Union[RuleProfiler, None] = None
+    ) -> Tuple[str, List[int], List[int], List[int]]:
+        """
+        The same as *_run_rules*, but within the limits of the *guard*, see *DocumentGuard*. A rule is reported as
+        skipped (or degraded) only if it wasn't run in any of the segments of the text. A precondition skip is reported
+        before a degraded one, rules which weren't reached at all are reported as dropped.
+        """
+        start = time.perf_counter()
+        deadline = None if guard.time_budget is None else start + guard.time_budget
+        records = None if profiler is None else []
+        reasons = []
+        degraded = False
+        segments = [text]
+
+        if guard.max_document_size is not None and len(text) > guard.max_document_size:
+            if guard.on_oversize == 'drop':
+                segments = []
+                reasons.append(OVERSIZE_DROPPED)
+            elif guard.on_oversize == 'degrade':
+                degraded = True
+                reasons.append(OVERSIZE_DEGRADED)
+            else:
+                segments = split_into_segments(text, guard.segment_size)
+                reasons.append(OVERSIZE_SEGMENTED)
+
+        processed_segments = []
+        executed, skipped, degraded_rules = set(), set(), set()
+        for segment in segments:
+            processed_segment, segment_executed, segment_skipped, segment_degraded, timed_out = \
+                self._run_rules_within_budget(
+                    segment,
+                    records,
+                    None if degraded else deadline,
+                    degraded,
+                    guard.on_timeout == 'drop'
+                )
+            executed.update(segment_executed)
+            skipped.update(segment_skipped)
+            degraded_rules.update(segment_degraded)
+
+            if timed_out and guard.on_timeout == 'drop':
+                reasons.append(TIMEOUT_DROPPED)
+                processed_segments = []
+                break
+            elif timed_out:
+                reasons.append(TIMEOUT_DEGRADED)
+                degraded = True
+            processed_segments.append(processed_segment)
+
+        if len(segments) == 1 and len(processed_segments) == 1:
+            processed_text = processed_segments[0]
+        else:
+            processed_text = join_segments(processed_segments)
+
+        guard.add(text, time.perf_counter() - start, reasons)
+        if profiler is not None:
+            profiler.add(records)
+
+        skipped -= executed
+        degraded_rules -= executed | skipped
+        dropped = set(range(len(self.rules))) - executed - skipped - degraded_rules
+        return processed_text, sorted(skipped), sorted(degraded_rules), sorted(dropped)
+
+    def _run_rules_within_budget(
+            self,
+            text: str,
+            records: Union[List[tuple], None],
+            deadline: Union[float, None],
+            degraded: bool,
+            stop_on_timeout: bool
+    ) -> Tuple[str, List[int], List[int], List[int], bool]:
+        """
+        Process a text (a whole document or its segment) with all of the rules for *_run_rules_guarded*. The deadline
+        is checked before each of the costly rules, when it passes the costly rules are skipped or the processing is
+        stopped.
+
+        Args:
+            text (str): an input text to process
+            records (Union[List[tuple], None]): a list to which profiling records are added (see *RuleProfiler.add*),
+            rules are not measured if None
+            deadline (Union[float, None]): *time.perf_counter* after which costly rules are not run, no deadline if None
+            degraded (bool): if True, costly rules are skipped
+            stop_on_timeout (bool): if True, processing is stopped when the deadline passes, otherwise only the costly
+            rules are skipped
+
+        Returns:
+            Tuple[str, List[int], List[int], List[int], bool]: Post-processed text, indexes of executed rules, indexes
+            of rules skipped because of failed preconditions, indexes of costly rules skipped in degraded processing
+            and True if the deadline passed
+        """
+        executed = []
+        skipped = []
+        degraded_rules = []
+        timed_out = False
+        for index, rule in enumerate(self.rules):
+            if rule.costly and not degraded and deadline is not None and time.perf_counter() > deadline:
+                timed_out = True
+                if stop_on_timeout:
+                    break
+                degraded = True
+
+            rule_degraded = rule.costly and degraded
+            if rule_degraded or (rule.precondition is not None and not rule.precondition(text)):
+                (degraded_rules if rule_degraded else skipped).append(index)
+                if records is not None:
+                    records.append((rule.name, None, None, len(text), len(text), False))
+                continue
+
+            executed.append(index)
+            if records is None:
+                text = rule.function(text)
+                continue
+
+            start = time.perf_counter()
+            if rule.count_function is not None:
+                processed_text, substitutions = rule.count_function(text)
+            else:
+                processed_text, substitutions = rule.function(text), None
+            seconds = time.perf_counter() - start
+            changed = processed_text is not text and processed_text != text
+            records.append((rule.name, seconds, substitutions, len(text), len(processed_text), changed))
+            text = processed_text
+
+        return text, executed, skipped, degraded_rules, timed_out
+
+    def run(
+            self,
+            text: str,
+            profiler: Union[RuleProfiler, None] = None,
+            guard: Union[DocumentGuard, None] = None
+    ) -> str:
+        """
+        Process a single text with all of the rules.
+
+        Args:
+            text (str): an input text to process
+            profiler (Union[RuleProfiler, None]): a profiler to record rules measurements, profiling is disabled if
+            None
+            guard (Union[DocumentGuard, None]): limits of size and processing time of the document, no limits if None
+
+        Returns:
+            str: Post-processed text
+        """
+        text, skipped, degraded, dropped = self._run_rules(text, profiler, guard)
+        counts = [[0] * len(self.rules) for _ in range(3)]
+        for rule_counts, indexes in zip(counts, (skipped, degraded, dropped)):
+            for index in indexes:
+                rule_counts[index] += 1
+        self.add_stats(1, *counts)
+        return text
+
+    def run_batch(
+            self,
+            texts: List[str],
+            progress: Union[tqdm, None] = None,
+            profiler: Union[RuleProfiler, None] = None,
+            guard: Union[DocumentGuard, None] = None
+    ) -> List[str]:
+        """
+        Process a list of texts with all of the rules.
+
+        Args:
+            texts (List[str]): a list of input texts to process
+            progress (Union[tqdm, None]): tqdm progress bar updated after each processed text
+            profiler (Union[RuleProfiler, None]): a profiler to record rules measurements, profiling is disabled if
+            None
+            guard (Union[DocumentGuard, None]): limits of size and processing time of each document, no limits if
+            None
+
+        Returns:
+            List[str]: Post-processed texts in the same order as on the input
+        """
+        processed = []
+        counts = [[0] * len(self.rules) for _ in range(3)]
+        for text in texts:
+            text, *text_indexes = self._run_rules(text, profiler, guard)
+            processed.append(text)
+            for rule_counts, indexes in zip(counts, text_indexes):
+                for index in indexes:
+                    rule_counts[index] += 1
+
+            if progress is not None:
+                progress.update()
+
+        self.add_stats(len(texts), *counts)
+        return processed
+
+    def add_stats(
+            self,
+            documents: int,
+            skipped_counts: List[int],
+            degraded_counts: List[int],
+            dropped_counts: List[int]
+    ):
+        """
+        Add prefilter statistics, for example collected by a plan in other process.
+
+        Args:
+            documents (int): number of processed documents
+            skipped_counts (List[int]): for each rule (in the order of *rules*) how many times it was skipped because
+            of a failed precondition
+            degraded_counts (List[int]): for each rule how many times it was skipped in degraded processing
+            dropped_counts (List[int]): for each rule how many times it wasn't run, because a document was dropped
+        """
+        with self._stats_lock:
+            self._documents += documents
+            for index in range(len(self.rules)):
+                self._skipped[index] += skipped_counts[index]
+                self._degraded[index] += degraded_counts[index]
+                self._dropped[index] += dropped_counts[index]
+
+    def pop_stats(self) -> Tuple[int, List[int], List[int], List[int]]:
+        """
+        Return prefilter statistics in the *add_stats* format and reset them.
+
+        Returns:
+            Tuple[int, List[int], List[int], List[int]]: number of processed documents and for each rule how many times
+            it was skipped because of a failed precondition, skipped in degraded processing and not run in dropped
+            documents
+        """
+        with self._stats_lock:
+            stats = self._documents, self._skipped, self._degraded, self._dropped
+            self._documents = 0
+            self._skipped = [0] * len(self.rules)
+            self._degraded = [0] * len(self.rules)
+            self._dropped = [0] * len(self.rules)
+        return stats
+
+    def prefilter_stats(self) -> Dict[str, Any]:
+        """
+        Return statistics of rules skipped because of failed preconditions.
+
+        Unicode repair statistics show how many documents took the fast path (ftfy wasn't run, because it couldn't
+        change them) and how many were repaired by ftfy. Rules skipped by a *DocumentGuard* are reported in their own
+        counters and aren't included in the prefilter and unicode repair statistics.
+
+        Returns:
+            Dict[str, Any]: number of processed documents, number of all rule executions, number of skipped rule
+            executions, number of skipped executions for each rule name, the same numbers for rules skipped in degraded
+            processing and for rules of dropped documents and unicode repair statistics
+        """
+        with self._stats_lock:
+            skipped_total = sum(self._skipped)
+            degraded_total = sum(self._degraded)
+            dropped_total = sum(self._dropped)
+            fast_path = self._skipped[0]
+            repaired = self._documents - fast_path - self._degraded[0] - self._dropped[0]
+            return {
+                'documents': self._documents,
+                'rule_executions': self._documents * len(self.rules) - skipped_total - degraded_total - dropped_total,
+                'skipped_rule_executions': skipped_total,
+                'skipped_by_rule': {
+                    self.rules[index].name: count for index, count in enumerate(self._skipped) if count > 0
+                },
+                'degraded_rule_executions': degraded_total,
+                'degraded_by_rule': {
+                    self.rules[index].name: count for index, count in enumerate(self._degraded) if count > 0
+                },
+                'dropped_rule_executions': dropped_total,
+                'dropped_by_rule': {
+                    self.rules[index].name: count for index, count in enumerate(self._dropped) if count > 0
+                },
+                'unicode_repair': {
+                    'fast_path': fast_path,
+                    'repaired': repaired,
+                },
+            }
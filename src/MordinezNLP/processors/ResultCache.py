@@ -0,0 +1,91 @@
+import hashlib
+from typing import Union
+
+try:
+    from src.MordinezNLP.processors.DocumentGuard import DocumentGuard
+    from src.MordinezNLP.processors.ProcessingPlan import ProcessingPlan
+    from src.MordinezNLP.utils.TwoTierCache import TwoTierCache
+except:
+    from MordinezNLP.processors.DocumentGuard import DocumentGuard
+    from MordinezNLP.processors.ProcessingPlan import ProcessingPlan
+    from MordinezNLP.utils.TwoTierCache import TwoTierCache
+
+
+class ResultCache(TwoTierCache):
+    """
+    A two-tier cache of processed texts, used by *BasicProcessor.process* and *BasicProcessor.process_iter* to skip
+    texts which were already processed with the same options (cookie banners, footers, syndicated articles etc.).
+
+    Tiers are described in *MordinezNLP.utils.TwoTierCache*: an in-memory LRU cache of *memory_items* texts (and at
+    most *memory_chars* characters, if set) and an optional sqlite database of at most *disk_items* texts, which
+    survives restarts and can be shared by many processes.
+
+    Keys are built from a hash of the input text and a hash of the processing options, so the same text processed with
+    other options is a different entry. Custom *pre_rules* and *post_rules* are identified by their module and name,
+    so they have to be module level functions and You have to *clear* the on-disk cache after changing them (or after
+    updating MordinezNLP).
+
+    ::
+
+        cache = ResultCache(memory_items=100000, db_path="processed_cache.sqlite")
+        processed = bp.process(texts, cache=cache)
+        print(cache.stats())
+    """
+
+    # bump it when the output of the processing functions changes, so old on-disk entries are not used
+    format_version: int = 1
+
+    def options_key(
+            self,
+            plan: ProcessingPlan,
+            use_pos_tagging: bool,
+            guard: Union[DocumentGuard, None] = None,
+            segment_size: Union[int, None] = None,
+            sentence_segmentation: str = 'parser',
+            pos_backend: str = 'stanza'
+    ) -> str:
+        """
+        Build a hash of the processing options.
+
+        Args:
+            plan (ProcessingPlan): a compiled processing plan
+            use_pos_tagging (bool): if POS tagging is used after the plan
+            guard (Union[DocumentGuard, None]): limits of the documents processing, if set, its settings are a part of
+            the options
+            segment_size (Union[int, None]): a size of segments of large texts, if set, it is a part of the options
+            sentence_segmentation (str): how texts are split into sentences for POS tagging, 'parser' or 'rules'
+            pos_backend (str): a name of the POS tagging backend
+
+        Returns:
+            str: hash of the options
+        """
+        options = (
+            self.format_version,
+            sorted(plan.options.items()),
+            [self._rule_name(rule) for rule in plan.pre_rules],
+            [self._rule_name(rule) for rule in plan.post_rules],
+            use_pos_tagging
+        )
+        if guard is not None:
+            # keys without a guard are the same as before the guards were added
+            options += (sorted(guard.settings().items()),)
+        if segment_size is not None:
+            options += (('segment_size', segment_size),)
+        if use_pos_tagging and sentence_segmentation != 'parser':
+            # sentences change only the POS tags, keys of the parser segmentation are the same as before
+            options += (('sentence_segmentation', sentence_segmentation),)
+        if use_pos_tagging and pos_backend != 'stanza':
+            # keys of the Stanza backend are the same as before the backends were added
+            options += (('pos_backend', pos_backend),)
+        description = repr(options)
+        return hashlib.blake2b(description.encode('utf8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _rule_name(rule) -> str:
+        name = "{}.{}".format(getattr(rule, '__module__', ''), getattr(rule, '__qualname__', type(rule).__name__))
+        if '<lambda>' in name or '<locals>' in name:
+            raise Exception(
+                'Results can\'t be cached with a lambda or a local function in pre_rules or post_rules, '
+                'use module level functions instead'
+            )
+        return name
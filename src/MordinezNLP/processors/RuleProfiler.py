@@ -0,0 +1,174 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import List, Union, Dict, Any, Tuple
+
+
+class RuleProfiler:
+    """
+    Collects measurements of each of the processing rules. Pass it to *BasicProcessor.process*,
+    *BasicProcessor.process_iter* or *ProcessingPlan.run* and check the *report* afterwards:
+
+    ::
+
+        profiler = RuleProfiler()
+        bp.process(texts, profiler=profiler)
+
+        print(profiler)
+        profiler.to_json("profile.json")
+
+    For each rule the report contains:
+     - calls - how many times the rule was run,
+     - skipped - how many times the rule was skipped, because its precondition failed,
+     - time - cumulative time in seconds,
+     - substitutions - number of substitutions made by the regex rules (None for other rules),
+     - changed - how many texts were changed by the rule,
+     - chars_in and chars_out - total number of characters of the texts before and after the rule.
+
+    Profiling is disabled when no profiler is passed, the processing functions don't measure anything then.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = 0
+        self._rules = OrderedDict()
+
+    def _rule_entry(self, name: str) -> Dict[str, Any]:
+        entry = self._rules.get(name)
+        if entry is None:
+            entry = self._rules[name] = {
+                'name': name,
+                'calls': 0,
+                'skipped': 0,
+                'time': 0.0,
+                'substitutions': None,
+                'changed': 0,
+                'chars_in': 0,
+                'chars_out': 0,
+            }
+        return entry
+
+    def add(self, records: List[Tuple[str, Union[float, None], Union[int, None], int, int, bool]]):
+        """
+        Add measurements of all the rules run on a single document.
+
+        Args:
+            records (List[Tuple[str, Union[float, None], Union[int, None], int, int, bool]]): for each rule: its name,
+            time in seconds (None if the rule was skipped), number of substitutions (None if unknown), length of the
+            input text, length of the output text and True if the rule changed the text
+        """
+        with self._lock:
+            self._documents += 1
+
+            for name, seconds, substitutions, chars_in, chars_out, changed in records:
+                entry = self._rule_entry(name)
+
+                if seconds is None:
+                    entry['skipped'] += 1
+                    continue
+
+                entry['calls'] += 1
+                entry['time'] += seconds
+                if substitutions is not None:
+                    entry['substitutions'] = (entry['substitutions'] or 0) + substitutions
+                if changed:
+                    entry['changed'] += 1
+                entry['chars_in'] += chars_in
+                entry['chars_out'] += chars_out
+
+    def add_stage(self, name: str, seconds: float, texts_in: List[str], texts_out: List[str]):
+        """
+        Add a measurement of a stage which processes many texts at once (eg. POS tagging). Documents count is not
+        changed.
+
+        Args:
+            name (str): a name of the stage
+            seconds (float): time of the stage in seconds
+            texts_in (List[str]): input texts of the stage
+            texts_out (List[str]): output texts of the stage
+        """
+        with self._lock:
+            entry = self._rule_entry(name)
+            entry['calls'] += 1
+            entry['time'] += seconds
+            entry['changed'] += sum(text_in != text_out for text_in, text_out in zip(texts_in, texts_out))
+            entry['chars_in'] += sum(len(text) for text in texts_in)
+            entry['chars_out'] += sum(len(text) for text in texts_out)
+
+    def merge(self, report: Dict[str, Any]):
+        """
+        Add measurements from a report of another profiler, for example from a processes pool worker.
+
+        Args:
+            report (Dict[str, Any]): a report returned by *report* function
+        """
+        with self._lock:
+            self._documents += report['documents']
+
+            for rule in report['rules']:
+                entry = self._rule_entry(rule['name'])
+                for key in ['calls', 'skipped', 'time', 'changed', 'chars_in', 'chars_out']:
+                    entry[key] += rule[key]
+                if rule['substitutions'] is not None:
+                    entry['substitutions'] = (entry['substitutions'] or 0) + rule['substitutions']
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Return collected measurements.
+
+        Returns:
+            Dict[str, Any]: number of processed documents, total time and a list of measurements of each rule in the
+            pipeline order
+        """
+        with self._lock:
+            rules = [dict(entry) for entry in self._rules.values()]
+            return {
+                'documents': self._documents,
+                'time': sum(rule['time'] for rule in rules),
+                'rules': rules,
+            }
+
+    def to_json(self, path: Union[str, None] = None, indent: int = 2) -> str:
+        """
+        Dump the report as JSON.
+
+        Args:
+            path (Union[str, None]): if set, JSON will be also saved to this file
+            indent (int): JSON indentation
+
+        Returns:
+            str: the report in the JSON format
+        """
+        report_json = json.dumps(self.report(), indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf8") as f:
+                f.write(report_json)
+        return report_json
+
+    def reset(self):
+        """
+        Remove all of the collected measurements.
+        """
+        with self._lock:
+            self._documents = 0
+            self._rules = OrderedDict()
+
+    def __str__(self) -> str:
+        report = self.report()
+        total_time = report['time'] or 1.0
+
+        lines = ["{:<28} {:>9} {:>9} {:>10} {:>7} {:>13} {:>9}".format(
+            "rule", "calls", "skipped", "time [s]", "time %", "substitutions", "changed"
+        )]
+        for rule in report['rules']:
+            lines.append("{:<28} {:>9} {:>9} {:>10.4f} {:>6.1f}% {:>13} {:>9}".format(
+                rule['name'],
+                rule['calls'],
+                rule['skipped'],
+                rule['time'],
+                rule['time'] / total_time * 100,
+                '-' if rule['substitutions'] is None else rule['substitutions'],
+                rule['changed']
+            ))
+        lines.append("{} documents, {:.4f} s".format(report['documents'], report['time']))
+        return "\n".join(lines)
@@ -0,0 +1,159 @@
+import bisect
+import re
+from typing import List, Tuple
+
+# a line break with all of the whitespace after it, segments are cut after it
+_line_break_regex = re.compile(r"\n\s*")
+# a dot followed by a letter, it is in urls and emails
+_url_dot_regex = re.compile(r"\.[a-zA-Z]")
+# everything up to the last whitespace character
+_last_whitespace_regex = re.compile(r".*\s", re.DOTALL)
+
+
+def _is_inside(text: str, start: int, end: int, opening: str, closing: str, inside: bool) -> bool:
+    # if the text between *start* and *end* contains a bracket, the last one of them decides, otherwise nothing changes
+    last_opening = text.rfind(opening, start, end)
+    last_closing = text.rfind(closing, start, end)
+    if last_opening == last_closing:
+        return inside
+    return last_opening > last_closing
+
+
+def _ends_with_url(line: str) -> bool:
+    # words without letters and digits (eg. emojis) are removed by the limit rule, so they are skipped
+    for word in reversed(line.split()):
+        if any(character.isalnum() for character in word):
+            return _url_dot_regex.search(word) is not None
+    return False
+
+
+def safe_boundaries(text: str) -> Tuple[List[int], List[bool]]:
+    """
+    Find positions in a text where it can be cut into segments which are processed separately, with the same result as
+    processing the whole text. A boundary is placed after a line break (and all of the whitespace after it), which:
+     - is not inside round or square brackets (the brackets rule matches brackets across lines),
+     - doesn't end or start a list item, lines starting with "-" or ">" (the list rules match the next line too),
+     - is followed by a letter, so a segment doesn't start with a punctuation, a bracket, a tag or a number (the space
+       and punctuation rule and merging of special tokens match them together with the previous line),
+     - doesn't follow a word which looks like a url or an email (the url fix rule puts a dot between a url and a
+       capital letter).
+
+    Args:
+        text (str): a text to find boundaries in
+
+    Returns:
+        Tuple[List[int], List[bool]]: ascending positions of the boundaries and for each of them if it is a paragraph
+        boundary (there is more than one line break)
+    """
+    positions = []
+    paragraphs = []
+
+    previous_end = 0
+    line_start = 0
+    inside_round = False
+    inside_square = False
+    for match in _line_break_regex.finditer(text):
+        inside_round = _is_inside(text, previous_end, match.start(), "(", ")", inside_round)
+        inside_square = _is_inside(text, previous_end, match.start(), "[", "]", inside_square)
+        previous_end = match.end()
+
+        previous_line_start = line_start
+        line_start = text.rfind("\n", match.start(), match.end()) + 1
+
+        if inside_round or inside_square or match.end() == len(text):
+            continue
+        if text[previous_line_start:previous_line_start + 1] in ["-", ">"] or not text[match.end()].isalpha():
+            continue
+
+        if _ends_with_url(text[previous_line_start:match.start()]):
+            continue
+
+        positions.append(match.end())
+        paragraphs.append(line_start > match.start() + 1)
+
+    return positions, paragraphs
+
+
+def _fallback_end(text: str, start: int, segment_size: int) -> int:
+    # the last line break in the second half of the segment, the last whitespace or a hard cut
+    end = start + segment_size
+    line_break = text.rfind("\n", start + segment_size // 2, end)
+    if line_break != -1:
+        return line_break + 1
+
+    match = _last_whitespace_regex.match(text, start, end)
+    if match is not None:
+        return match.end()
+    return end
+
+
+def split_into_segments(text: str, segment_size: int, safe: bool = True) -> List[str]:
+    """
+    Split a text into consecutive segments of at most *segment_size* characters. Joining the segments gives the input
+    text.
+
+    If *safe* is True, segments end at the last safe boundary (see *safe_boundaries*) in the segment, paragraph
+    boundaries in the second half of the segment are preferred. If there is no safe boundary (or if *safe* is False),
+    a segment ends with the last line break in the second half of the segment, with the last whitespace character,
+    and if there is no whitespace at all, the text is cut after *segment_size* characters.
+
+    Processed segments joined by *join_segments* are the same as the processed text, except for:
+     - segments which don't end at a safe boundary (a text without safe boundaries, eg. a very long line or a HTML
+       page without lines starting with a letter), any of the rules may match differently at such boundary,
+     - multiple characters, a character repeated 3 times is reduced if the same character is repeated at least 4
+       times anywhere in the processed text, so in a segmented text only in the same segment (and characters are
+       reduced in order of their first occurrence in the text or in the segment).
+
+    Args:
+        text (str): a text to split
+        segment_size (int): maximal number of characters in a segment
+        safe (bool): if segments should end at safe boundaries
+
+    Returns:
+        List[str]: segments of the text
+    """
+    if segment_size < 1:
+        raise Exception('Segment size has to be a positive number')
+    if len(text) <= segment_size:
+        return [text]
+
+    positions, paragraphs = safe_boundaries(text) if safe else ([], [])
+
+    segments = []
+    start = 0
+    while len(text) - start > segment_size:
+        end = start + segment_size
+        first = bisect.bisect_right(positions, start)
+        last = bisect.bisect_right(positions, end)
+        half = bisect.bisect_left(positions, start + segment_size // 2, first, last)
+
+        cut = None
+        for index in range(last - 1, half - 1, -1):
+            if paragraphs[index]:
+                cut = positions[index]
+                break
+        if cut is None and last > first:
+            cut = positions[last - 1]
+        if cut is None:
+            cut = _fallback_end(text, start, segment_size)
+
+        segments.append(text[start:cut])
+        start = cut
+
+    segments.append(text[start:])
+    return segments
+
+
+def join_segments(processed_segments: List[str]) -> str:
+    """
+    Join processed segments of a text split by *split_into_segments*. Segments are separated with a space, the
+    processing rules don't keep line breaks (they are replaced with spaces by the limit rule), so a line break at the
+    boundary is a space in a result of the whole text too. Empty segments are skipped.
+
+    Args:
+        processed_segments (List[str]): processed segments, in the same order as in the text
+
+    Returns:
+        str: a processed text
+    """
+    return " ".join(segment for segment in processed_segments if len(segment) > 0)
@@ -0,0 +1,91 @@
+import re
+import unicodedata
+from typing import Pattern
+
+import ftfy.bad_codecs  # registers the "sloppy" encodings used by ftfy
+from ftfy import fix_text
+from ftfy.chardata import CHARMAP_ENCODINGS, CONTROL_CHARS, LIGATURES, WIDTH_MAP
+
+
+def _build_repair_trigger_regex() -> Pattern:
+    """
+    Build a regex which matches every character that any of the *ftfy.fix_text* fixers can change or use as a clue
+    of broken unicode:
+     - ASCII control characters (except tabs and line feeds), "\\r" and "&" (HTML entities),
+     - characters from all of the single byte encodings in which ftfy looks for mojibake,
+     - C1 control characters, ligatures, half and full width characters, curly quotes, unicode line breaks,
+       surrogates and other control characters removed by ftfy.
+
+    Returns:
+        Pattern: a compiled regex
+    """
+    characters = set(chr(i) for i in range(0x00, 0x20) if chr(i) not in "\t\n")
+    characters |= {"&", "\x7f", "\u02bc", "\u2028", "\u2029", "\ufeff", "\ufffd"}
+    characters |= set(chr(i) for i in range(0x80, 0x100))
+    characters |= set(chr(i) for i in range(0x2018, 0x2020))
+    characters |= set(chr(i) for i in range(0xd800, 0xe000))
+
+    byte_range = bytes(list(range(0x80, 0x100)) + [0x1a])
+    for encoding in CHARMAP_ENCODINGS:
+        characters |= set(byte_range.decode(encoding))
+
+    for mapping in [CONTROL_CHARS, LIGATURES, WIDTH_MAP]:
+        characters |= set(chr(codepoint) for codepoint in mapping.keys())
+
+    return re.compile("[" + "".join(re.escape(character) for character in sorted(characters)) + "]")
+
+
+repair_trigger_regex = _build_repair_trigger_regex()
+
+
+def _encodes_to_ascii(text: str) -> bool:
+    try:
+        text.encode("ascii")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+# str.isascii doesn't scan the text, CPython knows if a string is ASCII, Python < 3.7 has to encode it
+_is_ascii = str.isascii if hasattr(str, "isascii") else _encodes_to_ascii
+
+
+def _is_nfc(text: str) -> bool:
+    if hasattr(unicodedata, "is_normalized"):
+        return unicodedata.is_normalized("NFC", text)
+    # Python < 3.8
+    return unicodedata.normalize("NFC", text) == text
+
+
+def needs_unicode_repair(text: str) -> bool:
+    """
+    A cheap pre-scan which checks if *ftfy.fix_text* can change a text. Texts which are pure ASCII (without control
+    characters and HTML entities), or which are already NFC normalized and don't contain any of the characters
+    which ftfy looks for (mojibake, ligatures, curly quotes, ...), are returned by ftfy unchanged, so they don't have
+    to be repaired.
+
+    Args:
+        text (str): a text to check
+
+    Returns:
+        bool: False if *ftfy.fix_text* would return the text unchanged, True if it may change it
+    """
+    if repair_trigger_regex.search(text) is not None:
+        return True
+    return not _is_ascii(text) and not _is_nfc(text)
+
+
+def repair_unicode(text: str) -> str:
+    """
+    Fix broken unicode (mojibake, HTML entities, curly quotes, ...) with *ftfy.fix_text*. Texts which can't be
+    changed by ftfy (see *needs_unicode_repair*) are returned as they are.
+
+    Args:
+        text (str): a text to repair
+
+    Returns:
+        str: repaired text
+    """
+    if needs_unicode_repair(text):
+        return fix_text(text)
+    return text
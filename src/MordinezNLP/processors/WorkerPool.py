@@ -0,0 +1,277 @@
+import gc
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from typing import List, Union, Dict, Any, Tuple
+
+try:
+    from src.MordinezNLP.pipelines.PosCache import PosCache
+    from src.MordinezNLP.processors.Basic import BasicProcessor
+    from src.MordinezNLP.utils import size_aware_chunks
+except:
+    from MordinezNLP.pipelines.PosCache import PosCache
+    from MordinezNLP.processors.Basic import BasicProcessor
+    from MordinezNLP.utils import size_aware_chunks
+
+# processors and POS caches of the pools which exist in this process, forked workers inherit them with the loaded models
+_pool_processors: Dict[int, BasicProcessor] = {}
+_pool_pos_caches: Dict[int, Union[PosCache, None]] = {}
+_pool_ids = itertools.count()
+_pool_lock = threading.Lock()
+
+
+def _process_memory(pid: int) -> Dict[str, Union[float, None]]:
+    """
+    Read memory usage of a process from */proc/<pid>/smaps_rollup* (Linux only).
+
+    Args:
+        pid (int): a process id
+
+    Returns:
+        Dict[str, Union[float, None]]: resident set size ("rss", it counts also pages shared with the other processes)
+        and private memory of the process ("private", pages which are not shared) in MB, None if they can't be read
+    """
+    values = {}
+    try:
+        with open("/proc/{}/smaps_rollup".format(pid)) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    values[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return {'rss': None, 'private': None}
+
+    return {
+        'rss': values.get('Rss', 0) / 1024,
+        'private': (values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)) / 1024
+    }
+
+
+def _init_pool_worker(started: float, ready_queue):
+    """
+    Initializer of the *WorkerPool* processes, reports the startup time of a worker.
+
+    Args:
+        started (float): time when the pool was started
+        ready_queue (Queue): a queue of (pid, startup time) of ready workers
+    """
+    # each worker uses a single thread, a pool of N workers would use N times more threads than cores otherwise
+    if 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(1)
+    ready_queue.put((os.getpid(), time.time() - started))
+
+
+def _process_in_worker(pool_id: int, texts: Union[str, List[str]], options: Dict[str, Any]) -> Union[str, List[str]]:
+    return _pool_processors[pool_id].process(texts, pos_cache=_pool_pos_caches[pool_id], **options)
+
+
+def _pos_tag_in_worker(
+        pool_id: int,
+        texts: List[str],
+        options: Dict[str, Any]
+) -> List[Tuple[List[List[str]], List[List[str]]]]:
+    # SpaCy tokens can't be sent to the main process, so tokens are strings
+    return list(_pool_processors[pool_id].pos_tagger.process(
+        texts,
+        return_docs=True,
+        return_string_tokens=True,
+        cache=_pool_pos_caches[pool_id],
+        **options
+    ))
+
+
+class WorkerPool:
+    """
+    A pool of processes which share SpaCy and Stanza models loaded by the main process. Models are loaded once, before
+    the workers are forked, so workers don't load them again and the memory of the models is shared copy-on-write
+    (it is copied only if a worker changes it). The pool is started once and it can be used for many calls:
+
+    ::
+
+        bp = BasicProcessor()
+
+        with WorkerPool(bp, workers=4) as pool:
+            print(pool.stats())
+
+            processed = pool.process(texts, use_pos_tagging=True)
+            processed_other = pool.process(other_texts, no_brackets=False)
+            tagged = pool.pos_tag(processed)
+
+    Each of the workers processes its chunk of texts with *BasicProcessor.process* (or with *PartOfSpeech.process*)
+    in a single thread, so a pool shouldn't have more workers than cores. *stats* reports startup time and memory of
+    the workers, use it to choose the size of the pool. Memory pages shared with the main process count in the resident
+    set size ("rss") of each of the workers, private memory ("private") is what a worker really adds.
+
+    Python objects are copied on the first change of their reference count, garbage collector is frozen before forking
+    (see *gc.freeze*), so it doesn't touch all of the objects of the models in each worker. Weights of Stanza models are
+    torch tensors, they stay shared.
+
+    A *pos_cache* (see *MordinezNLP.pipelines.PosCache*) is used by all of the workers. Each worker has its own copy of
+    the in-memory tier and its own hit statistics, the on-disk tier (if the cache has a *db_path*) is shared by all of
+    them.
+
+    The pool needs the *fork* start method of processes, which is available on Linux and macOS. Create it before
+    starting other threads (eg. a web server), forking a process with running threads is not safe.
+    """
+
+    def __init__(
+            self,
+            processor: BasicProcessor,
+            workers: int = 4,
+            use_pos_tagging: bool = True,
+            pos_batch_size: int = 7000,
+            chunk_size: Union[int, None] = None,
+            startup_timeout: float = 600.0,
+            pos_cache: Union[PosCache, None] = None
+    ):
+        """
+        Load models of the processor and start the workers. The initializer returns when all of the workers are ready.
+
+        Args:
+            processor (BasicProcessor): a processor used by the workers
+            workers (int): how many processes to start
+            use_pos_tagging (bool): if True, SpaCy pipeline, POS tagger and Stanza models are loaded before the workers
+            are started (see *BasicProcessor.warmup*)
+            pos_batch_size (int): POS tagging batch size of the Stanza pipeline, it can't be changed after the pipeline
+            is loaded
+            chunk_size (Union[int, None]): a total number of characters of texts in a single task of a worker, if None,
+            it is computed from the number of characters of the input texts (see *MordinezNLP.utils.size_aware_chunks*)
+            startup_timeout (float): how many seconds to wait for the workers
+            pos_cache (Union[PosCache, None]): a cache of POS tags of sentences used by the workers
+        """
+        if workers < 1:
+            raise Exception('Number of workers has to be a positive number')
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise Exception('WorkerPool needs the "fork" start method of processes, which is not available')
+
+        self.processor = processor
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+        start = time.perf_counter()
+        processor.warmup(use_pos_tagging=use_pos_tagging, pos_batch_size=pos_batch_size)
+        self._models_time = time.perf_counter() - start
+
+        with _pool_lock:
+            self._pool_id = next(_pool_ids)
+            _pool_processors[self._pool_id] = processor
+            _pool_pos_caches[self._pool_id] = pos_cache
+
+        context = multiprocessing.get_context('fork')
+        ready_queue = context.Queue()
+
+        gc.collect()
+        gc.freeze()
+        try:
+            started = time.time()
+            self._pool = context.Pool(workers, initializer=_init_pool_worker, initargs=(started, ready_queue))
+        finally:
+            gc.unfreeze()
+
+        self._workers_startup: Dict[int, float] = {}
+        try:
+            for _ in range(workers):
+                pid, startup = ready_queue.get(timeout=startup_timeout)
+                self._workers_startup[pid] = startup
+        except queue.Empty:
+            self.close()
+            raise Exception('Workers were not started in {} seconds'.format(startup_timeout))
+        self._startup_time = time.time() - started
+
+    def _chunks(self, texts: List[str]) -> List[List[str]]:
+        return list(size_aware_chunks(texts, self.workers, self.chunk_size))
+
+    def process(self, texts: Union[str, List[str]], **options) -> Union[str, List[str]]:
+        """
+        Process texts with *BasicProcessor.process* of the workers. A list of texts is split into chunks which are
+        processed by all of the workers, a single text is processed by one of them.
+
+        Args:
+            texts (Union[str, List[str]]): a text or a list of texts to process
+            **options: options of *BasicProcessor.process* (eg. *use_pos_tagging*, *no_brackets*), each worker uses
+            a single thread (*list_processing_threads* and *tokenizer_threads* are 1) by default. *cache*,
+            *profiler* and *pos_cache* can't be used, they would be copied to the workers (pass *pos_cache* to the
+            pool instead).
+
+        Returns:
+            Union[str, List[str]]: Post-processed texts
+        """
+        if 'cache' in options or 'profiler' in options:
+            raise Exception('Cache and profiler can\'t be used by the workers, use BasicProcessor.process instead')
+        if 'pos_cache' in options:
+            raise Exception('POS cache can\'t be passed to the workers, pass it to the WorkerPool initializer instead')
+        options = dict({'list_processing_threads': 1, 'tokenizer_threads': 1}, **options)
+
+        if type(texts) is str:
+            return self._pool.apply(_process_in_worker, (self._pool_id, texts, options))
+
+        processed_chunks = self._pool.starmap(
+            _process_in_worker,
+            [(self._pool_id, chunk, options) for chunk in self._chunks(texts)]
+        )
+        return list(itertools.chain(*processed_chunks))
+
+    def pos_tag(self, texts: List[str], **options) -> List[Tuple[List[List[str]], List[List[str]]]]:
+        """
+        POS tag texts with *PartOfSpeech.process* of the workers.
+
+        Args:
+            texts (List[str]): texts to tag, each text is a document
+            **options: options of *PartOfSpeech.process* (eg. *pos_replacement_list*), *tokenizer_threads* is 1 by
+            default, *cache* can't be used (pass *pos_cache* to the pool instead)
+
+        Returns:
+            List[Tuple[List[List[str]], List[List[str]]]]: for each of the documents its sentences with string tokens
+            and POS tags of the tokens
+        """
+        if 'cache' in options:
+            raise Exception('POS cache can\'t be passed to the workers, pass it to the WorkerPool initializer instead')
+        options = dict({'tokenizer_threads': 1}, **options)
+        tagged_chunks = self._pool.starmap(
+            _pos_tag_in_worker,
+            [(self._pool_id, chunk, options) for chunk in self._chunks(texts)]
+        )
+        return list(itertools.chain(*tagged_chunks))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return startup time and current memory usage of the pool.
+
+        Returns:
+            Dict[str, Any]: number of workers, time of loading the models in the main process, time until all of the
+            workers were ready, memory of the main process and startup time and memory of each of the workers (memory
+            in MB is None if it can't be read, it is read from */proc* on Linux)
+        """
+        workers = []
+        for pid, startup in sorted(self._workers_startup.items()):
+            worker = {'pid': pid, 'startup': startup}
+            worker.update(_process_memory(pid))
+            workers.append(worker)
+
+        return {
+            'workers': self.workers,
+            'models_time': self._models_time,
+            'startup_time': self._startup_time,
+            'main_process': _process_memory(os.getpid()),
+            'worker_processes': workers,
+        }
+
+    def close(self):
+        """
+        Stop the workers.
+        """
+        self._pool.terminate()
+        self._pool.join()
+        with _pool_lock:
+            _pool_processors.pop(self._pool_id, None)
+            _pool_pos_caches.pop(self._pool_id, None)
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
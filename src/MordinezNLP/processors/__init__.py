@@ -1 +1,15 @@
-from .Basic import BasicProcessor
\ No newline at end of file
+from ..utils.lazy_attributes import lazy_attributes
+
+# attributes are imported on the first access, see *MordinezNLP.utils.lazy_attributes*
+__all__ = ['BasicProcessor', 'DocumentGuard', 'LanguageResources', 'ProcessingPlan', 'ResultCache', 'RuleProfiler',
+           'WorkerPool']
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'BasicProcessor': '.Basic',
+    'DocumentGuard': '.DocumentGuard',
+    'LanguageResources': '.LanguageResources',
+    'ProcessingPlan': '.ProcessingPlan',
+    'ResultCache': '.ResultCache',
+    'RuleProfiler': '.RuleProfiler',
+    'WorkerPool': '.WorkerPool',
+})
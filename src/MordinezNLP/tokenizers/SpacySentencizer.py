@@ -0,0 +1,113 @@
+import re
+
+import numpy
+from spacy.attrs import SENT_START
+from typing import Iterable
+
+from spacy.language import Language
+from spacy.pipeline import Sentencizer
+from spacy.tokens import Doc
+
+# name of the SpaCy pipeline component of the *special_tokens_sentencizer*
+SENTENCIZER_NAME = "special_tokens_sentencizer"
+
+# pipeline components which are not needed when sentences are split by rules, the tagger and the morphologizer listen
+# to tok2vec, so they can't run without it
+RULES_DISABLED_COMPONENTS = ['tok2vec', 'tagger', 'morphologizer', 'parser', 'senter']
+
+# characters which end a sentence, tokens made only of them (eg. ".", "?!", "...") end a sentence
+_sentence_end_chars = frozenset(Sentencizer.default_punct_chars)
+# closing quotes and brackets after the end of a sentence belong to the same sentence
+_closing_chars = frozenset("\"'”’»)]}")
+# special tokens of *BasicProcessor* (eg. "<number>", "<date>", "<url>")
+_special_token_regex = re.compile(r"<[a-z_]+>")
+
+
+def _ends_sentence(text: str) -> bool:
+    return all(character in _sentence_end_chars for character in text)
+
+
+def _continues_end(text: str) -> bool:
+    # closing quotes, brackets and more sentence ending characters after the end of a sentence
+    return all(character in _closing_chars or character in _sentence_end_chars for character in text)
+
+
+def _starts_sentence(text: str) -> bool:
+    # a capitalized word, a number, a special token or an opening quote or bracket, a lowercase word continues the
+    # sentence (eg. after an abbreviation)
+    first = text[0]
+    return first.isupper() or first.isdigit() or first in "\"'“‘«([{" or _special_token_regex.match(text) is not None
+
+
+@Language.component(SENTENCIZER_NAME)
+def special_tokens_sentencizer(doc: Doc) -> Doc:
+    """
+    A rule based SpaCy pipeline component which splits documents into sentences without the dependency parser. A new
+    sentence starts:
+     - after a token made only of sentence ending characters (eg. ".", "!", "?!") and closing quotes and brackets
+       attached to it, if the next token is a capitalized word, a number, a special token (eg. "<date>"), an opening
+       quote or an opening bracket,
+     - after a line break.
+
+    Special tokens produced by *BasicProcessor* are single tokens (see *spacy_tokenizer*), so a sentence can start with
+    a special token (eg. "... on <date>. <date> General debate ...") and a special token followed by a dot doesn't
+    split a sentence if the next word is lowercase.
+
+    Args:
+        doc (Doc): a tokenized document
+
+    Returns:
+        Doc: the document with sentence starts set
+    """
+    # 1 for tokens which start a sentence, -1 for the other tokens, set at once with *Doc.from_array*
+    sent_starts = numpy.full(len(doc), -1, dtype="int64")
+    ended = False
+    previous = None
+    for i, token in enumerate(doc):
+        text = token.text
+        if i == 0:
+            sent_starts[i] = 1
+        elif token.is_space:
+            pass
+        elif ended and previous.whitespace_ == "" and _continues_end(text):
+            previous = token
+            continue
+        else:
+            if (previous.is_space and "\n" in previous.text) or (ended and _starts_sentence(text)):
+                sent_starts[i] = 1
+            ended = False
+
+        if not token.is_space and _ends_sentence(text):
+            ended = True
+        previous = token
+
+    if len(doc) > 0:
+        doc.from_array([SENT_START], sent_starts.astype("uint64").reshape(-1, 1))
+    return doc
+
+
+def spacy_sentencizer(nlp: Language, keep_components: Iterable[str] = ()) -> Language:
+    """
+    Replace sentence splitting of a SpaCy pipeline by the dependency parser with the rule based
+    *special_tokens_sentencizer*. The parser and the components which it needs (tok2vec, tagger) are disabled, so
+    tokenized documents get only sentences, which makes the pipeline many times faster. Token attributes which come
+    from the tokenizer (eg. *norm_*) are not changed.
+
+    Components which are still needed (eg. the tagger and tok2vec for POS tags of SpaCy) can be kept with
+    *keep_components*, then only the parser and the other components are disabled.
+
+    Args:
+        nlp (spacy.language.Language): A Language object from SpaCy, it is changed in place
+        keep_components (Iterable[str]): names of the components which are not disabled
+
+    Returns:
+        spacy.language.Language: the same Language object
+    """
+    for component in RULES_DISABLED_COMPONENTS:
+        if component in nlp.pipe_names and component not in keep_components:
+            nlp.disable_pipe(component)
+    if SENTENCIZER_NAME not in nlp.component_names:
+        nlp.add_pipe(SENTENCIZER_NAME, first=True)
+    elif SENTENCIZER_NAME in nlp.disabled:
+        nlp.enable_pipe(SENTENCIZER_NAME)
+    return nlp
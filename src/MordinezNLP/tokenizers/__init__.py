@@ -1 +1,9 @@
-from .SpacyTokenizer import spacy_tokenizer
\ No newline at end of file
+from ..utils.lazy_attributes import lazy_attributes
+
+# attributes are imported on the first access, see *MordinezNLP.utils.lazy_attributes*
+__all__ = ['spacy_sentencizer', 'spacy_tokenizer']
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'spacy_sentencizer': '.SpacySentencizer',
+    'spacy_tokenizer': '.SpacyTokenizer',
+})
@@ -0,0 +1,297 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Union, Dict, Any, Iterable, Tuple
+
+
+class TwoTierCache:
+    """
+    A two-tier cache of strings, the storage of *MordinezNLP.processors.ResultCache* (processed texts) and
+    *MordinezNLP.pipelines.PosCache* (POS tags of sentences). Subclasses build keys of their options, values are
+    stored under keys built by *make_key*.
+
+    The first tier is an in-memory LRU cache which keeps up to *memory_items* values. It is limited by the number of
+    values only, so a few huge values can take a lot of memory, set *memory_chars* to limit also the total length of
+    the kept values. The second tier is an optional sqlite database, which survives restarts and can be shared by many
+    processes. When it has more than *disk_items* values, the least recently used ones are removed.
+
+    ::
+
+        cache = TwoTierCache(memory_items=1000, db_path="cache.sqlite")
+        key = cache.make_key("an input text", "options")
+        cache.set(key, "a value")
+        print(cache.get(key), cache.stats())
+    """
+
+    # the number of rows in the on-disk tier is counted again after so many written values, because other processes
+    # sharing the database change it too
+    count_refresh_items: int = 10000
+
+    def __init__(
+            self,
+            memory_items: int = 100000,
+            db_path: Union[str, None] = None,
+            disk_items: Union[int, None] = 10000000,
+            memory_chars: Union[int, None] = None
+    ):
+        """
+        Args:
+            memory_items (int): how many values are kept in the in-memory tier
+            db_path (Union[str, None]): a path to the sqlite database of the on-disk tier, if None, only the
+            in-memory tier is used
+            disk_items (Union[int, None]): how many values are kept in the on-disk tier, if None, the on-disk tier is
+            never evicted
+            memory_chars (Union[int, None]): total length of the values kept in the in-memory tier, if None, the tier
+            is limited only by *memory_items*
+        """
+        if memory_items < 0:
+            raise Exception('Number of in-memory cache items can\'t be negative')
+        if memory_chars is not None and memory_chars < 0:
+            raise Exception('Length of in-memory cache values can\'t be negative')
+
+        self.memory_items = memory_items
+        self.db_path = db_path
+        self.disk_items = disk_items
+        self.memory_chars = memory_chars
+
+        self._lock = threading.RLock()
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._connection = None
+        self._connection_pid = None
+        self._disk_size = 0
+        self._written_since_count = 0
+
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+        }
+
+    @staticmethod
+    def make_key(text: str, options_key: str) -> str:
+        """
+        Build a cache key of a text with the options.
+
+        Args:
+            text (str): an input text
+            options_key (str): hash of the options, built by the *options_key* (or a similar function) of a subclass
+
+        Returns:
+            str: cache key
+        """
+        return options_key + hashlib.blake2b(text.encode('utf8', 'surrogatepass'), digest_size=16).hexdigest()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # a connection can't be used in a forked process, so each process opens its own one
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(self.db_path, timeout=60, check_same_thread=False)
+            self._connection_pid = os.getpid()
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, last_used REAL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            self._connection.commit()
+            self._count_disk_items()
+        return self._connection
+
+    def _count_disk_items(self):
+        # COUNT(*) scans the whole table, so it is run only when the connection is opened and from time to time
+        self._disk_size = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        self._written_since_count = 0
+
+    def _existing_keys(self, connection: sqlite3.Connection, keys: List[str]) -> int:
+        existing = 0
+        # sqlite limits the number of variables in a single query
+        for start in range(0, len(keys), 500):
+            keys_batch = keys[start:start + 500]
+            existing += connection.execute(
+                "SELECT COUNT(*) FROM results WHERE key IN ({})".format(",".join("?" * len(keys_batch))),
+                keys_batch
+            ).fetchone()[0]
+        return existing
+
+    def _remember(self, key: str, value: str):
+        if self.memory_items == 0:
+            return
+
+        previous = self._memory.get(key)
+        if previous is not None:
+            self._memory_size -= len(previous)
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        self._memory_size += len(value)
+        while len(self._memory) > self.memory_items or \
+                (self.memory_chars is not None and self._memory_size > self.memory_chars and len(self._memory) > 0):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self._stats['memory_evictions'] += 1
+
+    def get_many(self, keys: List[str]) -> List[Union[str, None]]:
+        """
+        Get cached values.
+
+        Args:
+            keys (List[str]): cache keys built by *make_key*
+
+        Returns:
+            List[Union[str, None]]: cached values in the same order as keys, None for keys which are not cached
+        """
+        with self._lock:
+            values = []
+            missing = []
+            for i, key in enumerate(keys):
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                else:
+                    missing.append(i)
+                values.append(value)
+
+            if self.db_path is not None and len(missing) > 0:
+                connection = self._get_connection()
+                missing_keys = list(OrderedDict.fromkeys(keys[i] for i in missing))
+
+                found = {}
+                # sqlite limits the number of variables in a single query
+                for start in range(0, len(missing_keys), 500):
+                    keys_batch = missing_keys[start:start + 500]
+                    found.update(connection.execute(
+                        "SELECT key, value FROM results WHERE key IN ({})".format(",".join("?" * len(keys_batch))),
+                        keys_batch
+                    ).fetchall())
+
+                if len(found) > 0:
+                    now = time.time()
+                    connection.executemany(
+                        "UPDATE results SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in found]
+                    )
+                    connection.commit()
+
+                for i in missing:
+                    value = found.get(keys[i])
+                    if value is not None:
+                        values[i] = value
+                        self._remember(keys[i], value)
+                        self._stats['disk_hits'] += 1
+                    else:
+                        self._stats['misses'] += 1
+            else:
+                self._stats['misses'] += len(missing)
+
+            return values
+
+    def set_many(self, items: Iterable[Tuple[str, str]]):
+        """
+        Add values to the cache.
+
+        Args:
+            items (Iterable[Tuple[str, str]]): pairs of a cache key built by *make_key* and a value
+        """
+        items = list(items)
+
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value)
+
+            if self.db_path is not None and len(items) > 0:
+                connection = self._get_connection()
+                now = time.time()
+
+                if self.disk_items is not None:
+                    # a running count of the rows, replaced values don't add new rows
+                    unique_keys = list(OrderedDict.fromkeys(key for key, _ in items))
+                    self._disk_size += len(unique_keys) - self._existing_keys(connection, unique_keys)
+                    self._written_since_count += len(items)
+
+                connection.executemany(
+                    "INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+                    [(key, value, now) for key, value in items]
+                )
+
+                if self.disk_items is not None:
+                    if self._written_since_count >= self.count_refresh_items:
+                        self._count_disk_items()
+
+                    overflow = self._disk_size - self.disk_items
+                    if overflow > 0:
+                        evicted = connection.execute(
+                            "DELETE FROM results WHERE key IN "
+                            "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                            (overflow,)
+                        ).rowcount
+                        self._disk_size -= evicted
+                        self._stats['disk_evictions'] += evicted
+                connection.commit()
+
+    def get(self, key: str) -> Union[str, None]:
+        """
+        Get a single cached value.
+
+        Args:
+            key (str): a cache key built by *make_key*
+
+        Returns:
+            Union[str, None]: cached value or None if it is not cached
+        """
+        return self.get_many([key])[0]
+
+    def set(self, key: str, value: str):
+        """
+        Add a single value to the cache.
+
+        Args:
+            key (str): a cache key built by *make_key*
+            value (str): a value
+        """
+        self.set_many([(key, value)])
+
+    def clear(self):
+        """
+        Remove all of the cached values from both tiers and reset the statistics.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            if self.db_path is not None:
+                connection = self._get_connection()
+                connection.execute("DELETE FROM results")
+                connection.commit()
+                self._disk_size = 0
+
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+    def close(self):
+        """
+        Close the on-disk tier database connection. It will be opened again if the cache is used after closing.
+        """
+        with self._lock:
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._connection_pid = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss and eviction statistics of the cache.
+
+        Returns:
+            Dict[str, Any]: number of hits in each tier, misses, evictions from each tier, the hit rate and the number of
+            values in the in-memory tier and their total length
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+            stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups > 0 else 0.0
+            stats['memory_size'] = len(self._memory)
+            stats['memory_chars'] = self._memory_size
+            return stats
@@ -1,4 +1,23 @@
-from .ngram_iterator import ngram_iterator
-from .random_string import random_string
-from .pos_replacement_list import pos_replacement_list
-from .token_replacement_list import token_replacement_list
\ No newline at end of file
+from .lazy_attributes import lazy_attributes
+
+# attributes are imported on the first access, see *lazy_attributes*
+__all__ = [
+    'ngram_iterator',
+    'random_string',
+    'pos_replacement_list',
+    'token_replacement_list',
+    'size_aware_chunks',
+    'trie_regex',
+    'TwoTierCache',
+    'lazy_attributes',
+]
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'ngram_iterator': '.ngram_iterator',
+    'random_string': '.random_string',
+    'pos_replacement_list': '.pos_replacement_list',
+    'token_replacement_list': '.token_replacement_list',
+    'size_aware_chunks': '.size_aware_chunks',
+    'trie_regex': '.trie_regex',
+    'TwoTierCache': '.TwoTierCache',
+})
@@ -0,0 +1,69 @@
+import importlib
+import sys
+from types import ModuleType
+from typing import Dict, Callable, Tuple, Any, List
+
+
+class _LazyPackage(ModuleType):
+    """
+    Module type of packages which use *lazy_attributes*. Most of the lazy attributes are defined in submodules of
+    the same name (eg. *process_pdf* in *parsers/process_pdf.py*). The import system sets a submodule as an attribute of
+    the package when it is imported, so it would shadow the attribute. Like with eager imports in *__init__.py*, the
+    package attribute is the object defined in the submodule, not the submodule itself.
+    """
+
+    def __setattr__(self, name: str, value: Any):
+        if isinstance(value, ModuleType) and value.__name__ == self.__name__ + "." + name and \
+                name in self.__dict__.get('_lazy_attributes', {}) and hasattr(value, name):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+def lazy_attributes(package: str, package_globals: Dict[str, Any], attributes: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Build module level *__getattr__* and *__dir__* functions (PEP 562) of a package, which import attributes of the
+    package on the first access instead of when the package is imported. Thanks to that, importing a package doesn't
+    import heavy dependencies (SpaCy, Stanza, pdfplumber, ...) of the modules which are not used.
+
+    Module level *__getattr__* needs Python 3.7, on Python 3.6 all of the attributes are imported eagerly, like with
+    imports in *__init__.py*.
+
+    Use it in a package *__init__.py*:
+
+    ::
+
+        __getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+            'HTML_Parser': '.HTML_Parser',
+            'process_pdf': '.process_pdf',
+        })
+
+    Args:
+        package (str): a name of the package (*__name__* of the *__init__.py*)
+        package_globals (Dict[str, Any]): globals of the package, imported attributes are stored there, so each of
+        them is imported once
+        attributes (Dict[str, str]): for each attribute name a (relative) name of the module which defines it
+
+    Returns:
+        Tuple[Callable, Callable]: *__getattr__* and *__dir__* functions of the package
+    """
+    package_globals['_lazy_attributes'] = attributes
+    if package in sys.modules:
+        sys.modules[package].__class__ = _LazyPackage
+
+    if sys.version_info < (3, 7):
+        # module level *__getattr__* is not called by Python 3.6
+        for name, module in attributes.items():
+            package_globals[name] = getattr(importlib.import_module(module, package), name)
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError("module {!r} has no attribute {!r}".format(package, name))
+
+        value = getattr(importlib.import_module(attributes[name], package), name)
+        package_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(package_globals) | set(attributes))
+
+    return __getattr__, __dir__
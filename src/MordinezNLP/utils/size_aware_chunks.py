@@ -0,0 +1,72 @@
+from typing import List, Generator, Union
+
+
+def size_aware_chunks(
+        texts: List[str],
+        workers: int,
+        target_chunk_size: Union[int, None] = None,
+        large_text_size: Union[int, None] = None,
+        chunks_per_worker: int = 4,
+        min_chunk_size: int = 20000,
+        max_chunk_size: int = 2000000
+) -> Generator[List[str], None, None]:
+    """
+    Split a list of texts into chunks with a similar total number of characters, so each worker of a threads or
+    processes pool gets a similar amount of work. Chunks are built from consecutive texts, so joining all of the chunks
+    gives the input list in the same order.
+
+    If *target_chunk_size* is not set, it is computed from the total number of characters, so that each worker gets
+    about *chunks_per_worker* chunks. It is clamped to *min_chunk_size* and *max_chunk_size* so small lists don't become
+    thousands of tiny chunks and huge lists don't become a few enormous ones.
+
+    Each text which is at least *large_text_size* characters long (by default the target chunk size) goes to its own
+    chunk.
+
+    For example for texts with lengths [10, 10, 100, 10] and *target_chunk_size* set to 20 it will output chunks with
+    lengths [[10, 10], [100], [10]].
+
+    Args:
+        texts (List[str]): a list of texts to split
+        workers (int): how many workers will process the chunks
+        target_chunk_size (Union[int, None]): a total number of characters in a single chunk
+        large_text_size (Union[int, None]): a number of characters above which a text gets its own chunk
+        chunks_per_worker (int): how many chunks each worker should get when the target size is computed
+        min_chunk_size (int): minimal computed target chunk size
+        max_chunk_size (int): maximal computed target chunk size
+
+    Returns:
+        Generator[List[str], None, None]: chunks of texts
+    """
+    if target_chunk_size is None:
+        total_size = sum(len(text) for text in texts)
+        target_chunk_size = total_size // max(workers * chunks_per_worker, 1)
+        target_chunk_size = min(max(target_chunk_size, min_chunk_size), max_chunk_size)
+
+    if large_text_size is None:
+        large_text_size = target_chunk_size
+
+    chunk = []
+    chunk_size = 0
+    for text in texts:
+        if len(text) >= large_text_size:
+            if len(chunk) > 0:
+                yield chunk
+                chunk = []
+                chunk_size = 0
+            yield [text]
+            continue
+
+        chunk.append(text)
+        chunk_size += len(text)
+
+        if chunk_size >= target_chunk_size:
+            yield chunk
+            chunk = []
+            chunk_size = 0
+
+    if len(chunk) > 0:
+        yield chunk
+
+
+if __name__ == '__main__':
+    print([[len(text) for text in chunk] for chunk in size_aware_chunks(['a' * 10, 'b' * 10, 'c' * 100, 'd' * 10], 2, 20)])
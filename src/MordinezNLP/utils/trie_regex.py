@@ -0,0 +1,74 @@
+import re
+from typing import Iterable, Dict, List
+
+
+def _build_trie(words: Iterable[str]) -> Dict[str, dict]:
+    trie = {}
+    for word in words:
+        node = trie
+        for character in word:
+            node = node.setdefault(character, {})
+        # an empty key marks the end of a word
+        node[""] = {}
+    return trie
+
+
+def _alternatives(node: Dict[str, dict]) -> List[str]:
+    alternatives = []
+    last_characters = []
+    for character in sorted(key for key in node if key != ""):
+        if list(node[character]) == [""]:
+            last_characters.append(re.escape(character))
+        else:
+            alternatives.append(re.escape(character) + _node_regex(node[character]))
+
+    # characters which end words and have no continuation are merged into a class, eg. "[dht]"
+    if len(last_characters) == 1:
+        alternatives.append(last_characters[0])
+    elif len(last_characters) > 1:
+        alternatives.append("[" + "".join(last_characters) + "]")
+    return alternatives
+
+
+def _node_regex(node: Dict[str, dict]) -> str:
+    alternatives = _alternatives(node)
+    if "" not in node:
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    # a word ends here, longer words are tried first, a single character or a class doesn't need a group
+    if len(alternatives) == 1 and re.fullmatch(r"\\?.|\[[^\]]*\]", alternatives[0]) is not None:
+        return alternatives[0] + "?"
+    return "(?:" + "|".join(alternatives) + ")?"
+
+
+def trie_regex(words: Iterable[str]) -> str:
+    """
+    Build a regex which matches any of the words, like "|".join(words), but with shared prefixes of the words
+    factored out into a trie, eg. ["twenty", "twentieth", "thirty"] gives "(?:t(?:hirty|went(?:ieth|y)))".
+
+    A regex engine tries each alternative of a flat alternation at each position of a text. With the prefixes factored
+    out, a position which doesn't start any of the words is rejected after checking one character, and a common prefix
+    is checked once instead of once for each word.
+
+    The regex matches exactly the same set of words. If a word is a prefix of another word, the longer one is tried
+    first (like in an alternation sorted by the length of words), so the result is the same as the result of the flat
+    alternation if none of the words is a prefix of another one, or if the regex is followed by something which can't
+    match the rest of the longer word (eg. a whitespace).
+
+    The regex has no capturing groups, so it can be put into a bigger regex without changing numbers of its groups.
+    Words are put into the regex as they are, use flags of the bigger regex (eg. *re.IGNORECASE*) to match them
+    differently.
+
+    Args:
+        words (Iterable[str]): words to match, empty words and duplicates are ignored
+
+    Returns:
+        str: a regex, it is wrapped in a non-capturing group, so it can be followed by a quantifier
+    """
+    alternatives = _alternatives(_build_trie(word for word in words if len(word) > 0))
+    if len(alternatives) == 0:
+        # matches nothing, like an empty alternation of words
+        return "(?!)"
+    return "(?:" + "|".join(alternatives) + ")"
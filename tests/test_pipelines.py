@@ -1,5 +1,6 @@
 import json
 import os
+import tempfile
 import unittest
 from pprint import pprint
 
@@ -9,10 +10,10 @@ from spacy.language import Language
 from helper import BASE_DIR
 
 try:
-    from src.MordinezNLP.pipelines import PartOfSpeech
+    from src.MordinezNLP.pipelines import PartOfSpeech, PosCache
     from src.MordinezNLP.tokenizers import spacy_tokenizer
 except:
-    from MordinezNLP.pipelines import PartOfSpeech
+    from MordinezNLP.pipelines import PartOfSpeech, PosCache
     from MordinezNLP.tokenizers import spacy_tokenizer
 
 
@@ -77,6 +78,127 @@ class TestPipelines(unittest.TestCase):
             docs.append(doc)
         self.assertEqual(docs, [(gt_sentences, gt_poss)])
 
+    def test_pos_pipeline_window(self):
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1.txt"), encoding="utf8") as f:
+            docs_to_tag = f.read().split(". ")
+
+        pos_output = list(self.pos_tagger.process(
+            docs_to_tag,
+            1,
+            30,
+            return_docs=True,
+            return_string_tokens=True
+        ))
+
+        # documents are read lazily from an iterator and tagged in windows, the output is the same
+        for window in [1, 3]:
+            windowed_pos_output = self.pos_tagger.process(
+                iter(docs_to_tag),
+                1,
+                30,
+                return_docs=True,
+                return_string_tokens=True,
+                window=window
+            )
+            self.assertEqual(list(windowed_pos_output), pos_output)
+
+        with self.assertRaises(Exception):
+            list(self.pos_tagger.process(docs_to_tag, window=0))
+
+    def test_pos_pipeline_cache(self):
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1.txt"), encoding="utf8") as f:
+            docs_to_tag = f.read().split(". ")
+
+        pos_output = list(self.pos_tagger.process(docs_to_tag, 1, 30, return_docs=True, return_string_tokens=True))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PosCache(db_path=os.path.join(temp_dir, "pos_cache.sqlite"))
+
+            # repeated documents are tagged once, the second call is answered from the cache
+            for _ in range(2):
+                cached_pos_output = self.pos_tagger.process(
+                    docs_to_tag * 2,
+                    1,
+                    30,
+                    return_docs=True,
+                    return_string_tokens=True,
+                    cache=cache
+                )
+                self.assertEqual(list(cached_pos_output), pos_output * 2)
+
+            stats = cache.stats()
+            self.assertEqual(stats['tagged_sentences'], stats['memory_size'])
+            self.assertEqual(stats['memory_hits'], stats['misses'])
+            cache.close()
+
+    def test_pos_pipeline_token_budget(self):
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1.txt"), encoding="utf8") as f:
+            to_process_content = f.read()
+
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1_gt.json"),
+                  encoding="utf8") as f2:
+            gt = json.loads(f2.read())
+
+        # tags of sentences tagged in length buckets are returned in the original order
+        for pos_batch_tokens in [1, 50, 500, 100000]:
+            pos_output = self.pos_tagger.process([to_process_content], 1, 30, pos_batch_tokens=pos_batch_tokens)
+            outputs = [[[token.text for token in sentence], sentence_pos] for sentence, sentence_pos in pos_output]
+            self.assertEqual(outputs, gt['sentences'])
+
+        # sorted by length, at most 20 padded tokens in a batch, a longer sentence is a batch on its own
+        sentences = [['word'] * length for length in [5, 400, 3, 5, 20, 1]]
+        self.assertEqual(PartOfSpeech._length_batches(sentences, 20), [[5, 2, 0, 3], [4], [1]])
+
+    def test_pos_pipeline_rules_segmentation(self):
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1.txt"), encoding="utf8") as f:
+            to_process_content = f.read()
+
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1_gt.json"),
+                  encoding="utf8") as f2:
+            gt = json.loads(f2.read())
+
+        nlp: Language = spacy.load("en_core_web_sm")
+        nlp.tokenizer = spacy_tokenizer(nlp)
+        pos_tagger = PartOfSpeech(nlp, 'en', sentence_segmentation='rules')
+        self.assertNotIn('parser', nlp.pipe_names)
+
+        pos_output = list(pos_tagger.process([to_process_content], 1, 30, return_string_tokens=True))
+
+        # the same tokens split into sentences by rules, each of the tokens has its POS tag
+        self.assertEqual(
+            [token for sentence, _ in pos_output for token in sentence],
+            [token for sentence, _ in gt['sentences'] for token in sentence]
+        )
+        for sentence, sentence_pos in pos_output:
+            self.assertEqual(len(sentence), len(sentence_pos))
+        self.assertEqual(len(pos_output), len(gt['sentences']) - 1)
+
+    def test_pos_pipeline_spacy_backend(self):
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1.txt"), encoding="utf8") as f:
+            to_process_content = f.read()
+
+        with open(os.path.join(BASE_DIR, "tests", "resources", "test_pipelines", "pos_1_gt.json"),
+                  encoding="utf8") as f2:
+            gt = json.loads(f2.read())
+
+        nlp: Language = spacy.load("en_core_web_sm")
+        nlp.tokenizer = spacy_tokenizer(nlp)
+        pos_tagger = PartOfSpeech(nlp, 'en', backend='spacy')
+        self.assertNotIn('tagger', nlp.disabled)
+        self.assertNotIn('attribute_ruler', nlp.disabled)
+
+        pos_output = [
+            [[token.text for token in sentence], sentence_pos]
+            for sentence, sentence_pos in pos_tagger.process([to_process_content], 1, 30)
+        ]
+
+        # the same sentences as with Stanza, tags are mapped with the same replacement lists
+        self.assertEqual([sentence for sentence, _ in pos_output], [sentence for sentence, _ in gt['sentences']])
+        tags = [pos for _, sentence_pos in pos_output for pos in sentence_pos]
+        gt_tags = [pos for _, sentence_pos in gt['sentences'] for pos in sentence_pos]
+        self.assertTrue(set(tags) <= set(pos_tagger.pos_replacement_list.values()))
+        self.assertGreater(sum(pos == gt_pos for pos, gt_pos in zip(tags, gt_tags)) / len(gt_tags), 0.8)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,51 @@
+import json
 import os
+import pickle
+import re
+import sys
+import tempfile
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from cleantext import clean
 
 from helper import BASE_DIR
 try:
-    from src.MordinezNLP.processors import BasicProcessor
+    from src.MordinezNLP.processors import BasicProcessor, ResultCache, RuleProfiler, DocumentGuard, LanguageResources, \
+        WorkerPool
+    from src.MordinezNLP.pipelines.PosCache import PosCache
+    from src.MordinezNLP.processors.Segments import split_into_segments, safe_boundaries
+    from src.MordinezNLP.processors.Basic import _LazyInitProcessPoolExecutor
+    from src.MordinezNLP.processors.EntityTagger import EntityTagger
+    from src.MordinezNLP.processors.UnicodeRepair import needs_unicode_repair, _encodes_to_ascii
+    from src.MordinezNLP.utils import pos_replacement_list
 except:
-    from MordinezNLP.processors import BasicProcessor
+    from MordinezNLP.processors import BasicProcessor, ResultCache, RuleProfiler, DocumentGuard, LanguageResources, \
+        WorkerPool
+    from MordinezNLP.pipelines.PosCache import PosCache
+    from MordinezNLP.processors.Segments import split_into_segments, safe_boundaries
+    from MordinezNLP.processors.Basic import _LazyInitProcessPoolExecutor
+    from MordinezNLP.processors.EntityTagger import EntityTagger
+    from MordinezNLP.processors.UnicodeRepair import needs_unicode_repair, _encodes_to_ascii
+    from MordinezNLP.utils import pos_replacement_list
+
+
+def multiple_characters_with_replace(bp: BasicProcessor, text_to_process: str) -> str:
+    """
+    The old *process_multiple_characters* which replaced every occurrence of a matched word in the whole text.
+    """
+    for entity in re.findall(bp.multiple_characters_regex, text_to_process):
+        entity_to_find = re.escape(entity)
+
+        for match in re.findall(
+                "(([^" + entity_to_find + r"^\s.]*)([" + entity_to_find + "]{3,})([^" + entity_to_find + r"^\s.]*))",
+                text_to_process):
+            if re.sub(bp.multiple_characters_non_sense, "", match[0]) == match[2]:
+                text_to_process = text_to_process.replace(match[0], "")
+            else:
+                text_to_process = text_to_process.replace(match[0], match[1] + entity + match[3])
+    return text_to_process
 
 
 class TestProcessors(unittest.TestCase):
@@ -101,6 +141,588 @@ class TestProcessors(unittest.TestCase):
 
         self.assertEqual(processed_texts, texts_gt)
 
+    def test_multiple_characters(self):
+        texts_to_process = ['EEEEEEEEEEEE!', 'supeeeeeer', 'EEEE<number>!', 'suppppprrrrrpper', 'heeeey!!!! wow....']
+        texts_gt = ['', 'super', '', 'suprpper', 'hey! wow.']
+
+        self.assertEqual([self.bp.process_multiple_characters(text) for text in texts_to_process], texts_gt)
+
+    def test_multiple_characters_replaced_in_place(self):
+        # each word is processed on its own, like with the old str.replace of the whole text
+        texts_to_process = [
+            'EEEEEEEEEEEE!', 'supeeeeeer and suppppprrrrrpper', 'heeeey!!!! wow....', 'gooood gooood', 'yeeees yeeeeees',
+            'x<<<<y x<<<<y', 'xx.!!!!.x', 'wait.... ..EEEE!.. ok', 'axxxbxxxx'
+        ]
+        self.assertEqual(
+            [self.bp.process_multiple_characters(text) for text in texts_to_process],
+            [multiple_characters_with_replace(self.bp, text) for text in texts_to_process]
+        )
+
+        # the old version also replaced a matched word inside of other words, see *process_multiple_characters*
+        texts_to_process = [
+            'soooo sooooo', 'wow!!!! wow!!!!!', 'EEEE xEEEEy', 'noooo way, nooooo', 'soooonoooo noooo',
+            'wait.... ..EEEE!.. ok....'
+        ]
+        self.assertEqual(
+            [self.bp.process_multiple_characters(text) for text in texts_to_process],
+            ['so so', 'wow! wow!', ' xEy', 'no way, no', 'son no', 'wait. .... ok.']
+        )
+        self.assertEqual(
+            [multiple_characters_with_replace(self.bp, text) for text in texts_to_process],
+            ['so soo', 'wow! wow!!', ' xy', 'no way, noo', 'son n', 'wait. . ok.']
+        )
+
+    def test_models_are_loaded_lazily(self):
+        bp = BasicProcessor()
+        bp.process(["Its a joke ofc", "123123 And the last one is 3rd place"], use_pos_tagging=False)
+
+        self.assertIsNone(bp._nlp)
+        self.assertIsNone(bp._pos_tagger)
+
+    def test_language_resources_are_shared(self):
+        bp = BasicProcessor('en')
+        self.assertIs(bp.resources, self.bp.resources)
+        self.assertIs(bp.common_dates_combined, self.bp.common_dates_combined)
+        self.assertEqual(BasicProcessor.load_ordinals('en')[:3], ['first', 'second', 'third'])
+
+        # resources unpickled in another process are used instead of building them again
+        resources = pickle.loads(pickle.dumps(bp.resources))
+        self.assertEqual(resources.patterns, bp.resources.patterns)
+        LanguageResources.clear()
+        LanguageResources.register(resources)
+        self.assertIs(BasicProcessor('en').resources, resources)
+        self.assertEqual(BasicProcessor('en').process("It was on 1st of May", use_pos_tagging=False), "It was on <date>")
+
+        with self.assertRaises(Exception):
+            BasicProcessor('pl')
+
+    def test_warmup(self):
+        bp = BasicProcessor()
+        bp.warmup()
+
+        self.assertIsNotNone(bp._nlp)
+        self.assertIsNotNone(bp._pos_tagger)
+        self.assertEqual(bp.process("They've been there last year."), "They have been there last year.")
+
+    def test_compiled_plan_is_cached(self):
+        plan_1 = self.bp.compile(language='en', no_dates=False)
+        plan_2 = self.bp.compile(language='en', no_dates=False)
+        plan_3 = self.bp.compile(language='en')
+
+        self.assertIs(plan_1, plan_2)
+        self.assertIsNot(plan_1, plan_3)
+
+    def test_concurrent_calls(self):
+        texts_to_process = [
+            "Hi! it is my first text written on saturday 16th january 2021",
+            "And here is my e-mail: asdfe@sdff.pl (and a bracket) with 3 > 2",
+            "123123 And the last one is 3rd place, see https://example.com",
+        ]
+        options_list = [
+            {},
+            {'no_dates': False, 'lower': True},
+            {'replace_with_number': "<num>", 'replace_with_url': "<link>", 'no_brackets': False},
+            {'no_numbers': False, 'replace_with_email': "<mail>", 'no_punct': True},
+        ]
+
+        # expected results of each of the options, from a separate processor
+        bp = BasicProcessor()
+        expected = []
+        for options in options_list:
+            processed_texts = bp.process(texts_to_process, use_pos_tagging=False, list_processing_threads=1, **options)
+            expected.append((processed_texts, bp.get_special_tokens()))
+
+        shared_bp = BasicProcessor()
+        shared_bp.plans_cache_size = 2
+
+        def call(index: int):
+            options = options_list[index % len(options_list)]
+            if index % 2 == 0:
+                processed_texts = [shared_bp.process(text, use_pos_tagging=False, **options) for text in texts_to_process]
+            else:
+                processed_texts = shared_bp.process(
+                    texts_to_process,
+                    use_pos_tagging=False,
+                    list_processing_threads=2,
+                    **options
+                )
+            return processed_texts, shared_bp.get_special_tokens()
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(call, range(200)))
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        for index, result in enumerate(results):
+            self.assertEqual(result, expected[index % len(options_list)])
+
+        # the basic POS replacement list is not changed by the processors
+        self.assertEqual(pos_replacement_list['NUM'], 'NOUN')
+        self.assertEqual(shared_bp._pos_replacement_list_['NUM'], 'NUM')
+
+    def test_compiled_plan_run(self):
+        texts_to_process = [
+            "Hi! it is my first text written on saturday 16th january 2021",
+            "And here is my e-mail: asdfe@sdff.pl",
+            "123123 And the last one is 3rd place",
+        ]
+
+        plan = self.bp.compile(language='en')
+
+        self.assertEqual(
+            [plan.run(text) for text in texts_to_process],
+            [self.bp.process(text, language='en', use_pos_tagging=False) for text in texts_to_process]
+        )
+        self.assertEqual(
+            plan.run_batch(texts_to_process),
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False)
+        )
+
+    def test_rules_prefilter(self):
+        texts_to_process = [
+            "just a few plain words",
+            "<b>Bold</b> text with 3 > 2 and (a bracket) on 12.01.2021",
+        ]
+
+        plan = self.bp.compile(language='en', no_brackets=False)
+        processed_texts = plan.run_batch(texts_to_process)
+
+        stats = plan.prefilter_stats()
+        self.assertEqual(stats['documents'], 2)
+        self.assertGreater(stats['skipped_rule_executions'], 0)
+        self.assertEqual(stats['rule_executions'] + stats['skipped_rule_executions'], 2 * len(plan.rules))
+
+        # a counter for each rule, it doesn't grow with the number of documents
+        documents, skipped_counts, degraded_counts, dropped_counts = plan.pop_stats()
+        self.assertEqual(documents, 2)
+        self.assertEqual(len(skipped_counts), len(plan.rules))
+        self.assertEqual(sum(skipped_counts), stats['skipped_rule_executions'])
+        self.assertEqual(sum(degraded_counts) + sum(dropped_counts), 0)
+        self.assertEqual(plan.prefilter_stats()['documents'], 0)
+
+        # the same rules without preconditions must give the same output
+        for rule in plan.rules:
+            rule.precondition = None
+        self.assertEqual(processed_texts, plan.run_batch(texts_to_process))
+
+    def test_unicode_repair_fast_path(self):
+        self.assertFalse(needs_unicode_repair("just a few plain words, 3 > 2"))
+        self.assertFalse(needs_unicode_repair("中文 😂"))
+        self.assertTrue(needs_unicode_repair("Tom &amp; Jerry"))
+        self.assertTrue(needs_unicode_repair("itâ€™s"))
+        self.assertTrue(needs_unicode_repair("e\u0301"))
+        # the fallback of str.isascii on Python 3.6
+        for text in ["", "plain text", "caf\u00e9", "\x7f", "\ud800", "中文"]:
+            self.assertEqual(_encodes_to_ascii(text), all(ord(character) < 128 for character in text), text)
+
+        plan = self.bp.compile(language='en')
+        # plans are cached, so other tests could use this one
+        plan.pop_stats()
+        self.assertEqual(plan.rules[0].name, "fix_text")
+        self.assertEqual(
+            plan.run_batch(["just a few plain words", "itâ€™s broken"]),
+            ["just a few plain words", "it's broken"]
+        )
+        self.assertEqual(plan.prefilter_stats()['unicode_repair'], {'fast_path': 1, 'repaired': 1})
+
+        # ftfy is always run at the beginning, fix_unicode controls only the second repair before the basic clean
+        plan = self.bp.compile(language='en', fix_unicode=False)
+        self.assertEqual(plan.rules[0].name, "fix_text")
+        self.assertNotIn("repair_unicode", [rule.name for rule in plan.rules])
+        self.assertEqual(
+            self.bp.process(["ＬＯＵＤ　ＮＯＩＳＥＳ! annnnnnnnnd", "Ã©tÃ© mojibake cafÃ©", "next week’s plans"],
+                            language='en', use_pos_tagging=False, fix_unicode=False),
+            ["LOUD NOISES! and", "été mojibake café", "next week's plans"]
+        )
+
+    def test_entity_tagger(self):
+        texts = [
+            "call +1 555-123-4567 or mail john.doe@example.com, see https://example.com/a?b=1.",
+            "<url>-5 and com-5 cost $ 1,000.50 or 1 000,john@example.com",
+            "info@www.example.com 12345 6789012 (at) 3.14",
+        ]
+        for i in range(1, 6):
+            with open(os.path.join(BASE_DIR, "tests", "resources", "test_processors", "doc{}.txt".format(i)),
+                      encoding="utf8") as f:
+                texts.append(f.read())
+
+        # *cleantext.clean* with the defaults of the *EntityTagger*
+        defaults = dict(fix_unicode=False, to_ascii=False, lower=False, no_emails=True, no_phone_numbers=True,
+                        no_numbers=True, no_currency_symbols=True, replace_with_url="<url>",
+                        replace_with_email="<email>", replace_with_phone_number="<phone>",
+                        replace_with_number="<number>", replace_with_currency_symbol="<currency>")
+        for options in [{}, {'no_urls': True, 'no_digits': True, 'lower': True, 'no_line_breaks': True}]:
+            tagger = EntityTagger(**options)
+            for text in texts:
+                self.assertEqual(tagger.tag(text), clean(text, **dict(defaults, **options)))
+
+        tagger = EntityTagger(no_urls=True)
+        self.assertEqual(
+            tagger.tag_and_count(texts[0]),
+            ("call <phone> or mail <email>, see <url>", {'url': 1, 'email': 1, 'phone': 1})
+        )
+        self.assertEqual(tagger.count("$ 5"), ("<currency> <number>", 2))
+
+    def test_rule_profiler(self):
+        texts_to_process = [
+            "Hi! it is my first text written on saturday 16th january 2021",
+            "And here is my e-mail , asdfe@sdff.pl",
+        ]
+        profiler = RuleProfiler()
+
+        self.assertEqual(
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False, profiler=profiler),
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False)
+        )
+
+        report = profiler.report()
+        rules = {rule['name']: rule for rule in report['rules']}
+        self.assertEqual(report['documents'], 2)
+        self.assertEqual(rules['basic_clean']['calls'], 2)
+        self.assertEqual(rules['dates']['changed'], 1)
+        self.assertEqual(rules['fix_base_brackets_2_left']['skipped'], 2)
+        self.assertGreater(rules['space_and_punct']['substitutions'], 0)
+        self.assertIsNone(rules['strip']['substitutions'])
+
+        self.assertEqual(json.loads(profiler.to_json()), report)
+
+        # records contain lengths of the texts and a changed flag, not the texts
+        profiler = RuleProfiler()
+        profiler.add([('shorten', 0.5, 2, 10, 8, True), ('never', None, None, 8, 8, False)])
+        rules = {rule['name']: rule for rule in profiler.report()['rules']}
+        self.assertEqual((rules['shorten']['chars_in'], rules['shorten']['chars_out']), (10, 8))
+        self.assertEqual(rules['shorten']['changed'], 1)
+        self.assertEqual((rules['never']['calls'], rules['never']['skipped']), (0, 1))
+
+    def test_document_guard(self):
+        texts_to_process = [
+            "Hi! it is my first text written on saturday 16th january 2021",
+            "Some (text " * 300,
+            "<" * 3000,
+        ]
+        without_guard = self.bp.process(texts_to_process, language='en', use_pos_tagging=False)
+
+        # documents within the limits are processed as usual
+        guard = DocumentGuard(max_document_size=10000, segment_size=5000)
+        self.assertEqual(
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False, guard=guard),
+            without_guard
+        )
+        self.assertEqual(guard.report()['documents'], 3)
+        self.assertEqual(guard.report()['guarded'], 0)
+
+        guard = DocumentGuard(max_document_size=1000, segment_size=500)
+        processed = self.bp.process(texts_to_process, language='en', use_pos_tagging=False, guard=guard)
+        self.assertEqual(processed[0], without_guard[0])
+        self.assertEqual(guard.report()['reasons'], {'oversize_segmented': 2})
+
+        guard = DocumentGuard(max_document_size=1000, on_oversize='drop')
+        processed = self.bp.process(texts_to_process, language='en', use_pos_tagging=False, guard=guard)
+        self.assertEqual(processed, [without_guard[0], "", ""])
+        self.assertEqual(guard.report()['reasons'], {'oversize_dropped': 2})
+        self.assertEqual(guard.report()['events'][0]['size'], len(texts_to_process[1]))
+
+        # the budget is exceeded before the first costly rule
+        guard = DocumentGuard(max_document_size=None, time_budget=0.0, on_timeout='drop')
+        self.assertEqual(self.bp.process(texts_to_process, language='en', use_pos_tagging=False, guard=guard),
+                         ["", "", ""])
+        guard = DocumentGuard(max_document_size=None, time_budget=0.0, on_timeout='degrade')
+        processed = self.bp.process(texts_to_process, language='en', use_pos_tagging=False, guard=guard)
+        self.assertNotIn("", processed)
+        self.assertEqual(guard.report()['reasons'], {'timeout_degraded': 3})
+
+        other_guard = DocumentGuard()
+        other_guard.merge(guard.report())
+        other_guard.merge(guard.report())
+        self.assertEqual(other_guard.report()['reasons'], {'timeout_degraded': 6})
+        self.assertEqual(json.loads(guard.to_json()), guard.report())
+
+        text = "a line\n" * 50 + "words without line breaks " * 50 + "x" * 300
+        segments = split_into_segments(text, 100)
+        self.assertEqual("".join(segments), text)
+        self.assertTrue(all(len(segment) <= 100 for segment in segments))
+
+        with self.assertRaises(Exception):
+            DocumentGuard(on_oversize='truncate')
+
+    def test_document_guard_time_budget(self):
+        # the costly rules take about 10 s on the whole text, the default guard processes it in short segments
+        guard = DocumentGuard()
+        start = time.perf_counter()
+        self.bp.process("<" * 32000, language='en', use_pos_tagging=False, guard=guard)
+        self.assertLess(time.perf_counter() - start, guard.time_budget)
+        self.assertEqual(guard.report()['reasons'], {'oversize_segmented': 1})
+
+    def test_document_guard_prefilter_stats(self):
+        texts_to_process = ["just a few plain words", "itâ€™s broken", "itâ€™s broken " * 100]
+        plan = self.bp.compile(language='en')
+        plan.pop_stats()
+
+        # a dropped document doesn't take the unicode fast path and its rules aren't counted as prefiltered
+        plan.run_batch(texts_to_process, guard=DocumentGuard(max_document_size=1000, on_oversize='drop'))
+        stats = plan.prefilter_stats()
+        self.assertEqual(stats['unicode_repair'], {'fast_path': 1, 'repaired': 1})
+        self.assertEqual(stats['dropped_by_rule'], {rule.name: 1 for rule in plan.rules})
+        self.assertEqual(stats['degraded_rule_executions'], 0)
+        self.assertEqual(
+            stats['rule_executions'] + stats['skipped_rule_executions'] + stats['dropped_rule_executions'],
+            3 * len(plan.rules)
+        )
+        without_guard_skipped = plan.pop_stats()[1]
+
+        # costly rules of degraded documents are counted apart from failed preconditions
+        plan.run_batch(texts_to_process[:2], guard=DocumentGuard(time_budget=0.0, on_timeout='degrade'))
+        documents, skipped_counts, degraded_counts, dropped_counts = plan.pop_stats()
+        costly = [index for index, rule in enumerate(plan.rules) if rule.costly]
+        self.assertIn("double_upper_case_letters", [plan.rules[index].name for index in costly])
+        self.assertEqual([index for index, count in enumerate(degraded_counts) if count > 0], costly)
+        self.assertTrue(all(degraded_counts[index] == 2 and skipped_counts[index] == 0 for index in costly))
+        self.assertEqual(sum(dropped_counts), 0)
+        self.assertEqual(
+            [count for index, count in enumerate(skipped_counts) if index not in costly],
+            [count for index, count in enumerate(without_guard_skipped) if index not in costly]
+        )
+
+    def test_segmented_processing(self):
+        documents = []
+        for i in range(1, 6):
+            with open(os.path.join(BASE_DIR, "tests", "resources", "test_processors", "doc{}.txt".format(i)),
+                      encoding="utf8") as f:
+                documents.append(f.read())
+        large_text = "\n\n".join(documents * 4)
+        self.assertGreater(len(split_into_segments(large_text, 1000)), 1)
+
+        # segments of a single text and of texts in a list are processed by the pool, multiple characters are
+        # reduced differently in segments (see below)
+        options = {'use_pos_tagging': False, 'no_multiple_chars': False}
+        for executor in ['thread', 'process']:
+            self.assertEqual(
+                self.bp.process(large_text, segment_size=1000, executor=executor, list_processing_threads=2, **options),
+                self.bp.process(large_text, **options)
+            )
+        self.assertEqual(
+            self.bp.process(["short text", large_text], segment_size=1000, **options),
+            self.bp.process(["short text", large_text], **options)
+        )
+
+        # brackets, lists, lines starting with a number or following a url are not split
+        text = "First (line\nsecond) line\n- item\nthird line\n10 apples\nsee example.com\nLast line"
+        positions, paragraphs = safe_boundaries(text)
+        self.assertEqual([text[position:position + 4] for position in positions], ["see "])
+        self.assertEqual(paragraphs, [False])
+        self.assertEqual(split_into_segments(text, 1000), [text])
+
+        # boundary artefact: repeated characters are reduced in the whole text if any of them is repeated at least 4
+        # times, in a segmented text only in the segment with such repetition
+        text = "We had a nooo way.\n\nIt was sooooo good."
+        self.assertEqual(self.bp.process(text, use_pos_tagging=False), "We had a no way. It was so good.")
+        self.assertEqual(self.bp.process(text, use_pos_tagging=False, segment_size=20),
+                         "We had a nooo way. It was so good.")
+
+        # a text without line breaks is cut at whitespace
+        segments = split_into_segments("word " * 100, 42)
+        self.assertEqual("".join(segments), "word " * 100)
+        self.assertTrue(all(len(segment) <= 42 and segment.endswith(" ") for segment in segments))
+
+        with self.assertRaises(Exception):
+            split_into_segments(text, 0)
+
+    def test_doc_list_process_executor(self):
+        texts_to_process = [
+            "Hi! it is my first text written on saturday 16th january 2021",
+            "And here is my e-mail: asdfe@sdff.pl",
+            "Its a joke ofc",
+            "123123 And the last one is 3rd place",
+            "GAME FOR SALEIF U AINT GOT THOSE CDS^^^^^^^^^^^^ U better slap",
+        ]
+
+        processed_texts = self.bp.process(
+            texts_to_process,
+            language='en',
+            use_pos_tagging=False,
+            list_processing_threads=2,
+            executor='process'
+        )
+
+        self.assertEqual(
+            processed_texts,
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False)
+        )
+
+        # a pool without the initializer (Python 3.6), workers build the plan in their first task
+        plan = self.bp.compile(language='en')
+        with _LazyInitProcessPoolExecutor(2, ('en', plan.options, [], [])) as pool:
+            self.assertEqual(
+                self.bp._process_list(texts_to_process, plan, pool, 2, None, None),
+                plan.run_batch(texts_to_process)
+            )
+
+    def test_process_iter(self):
+        texts_to_process = [
+            "Hi! it is my first text written on saturday 16th january 2021",
+            "And here is my e-mail: asdfe@sdff.pl",
+            "Its a joke ofc",
+            "123123 And the last one is 3rd place",
+            "GAME FOR SALEIF U AINT GOT THOSE CDS^^^^^^^^^^^^ U better slap",
+        ]
+
+        processed_texts = self.bp.process_iter(
+            (text for text in texts_to_process),
+            window=2,
+            language='en',
+            use_pos_tagging=False
+        )
+
+        self.assertEqual(
+            list(processed_texts),
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False)
+        )
+
+    def test_worker_pool(self):
+        texts_to_process = [
+            "Hi! it is my first text written on saturday 16th january 2021",
+            "And here is my e-mail: asdfe@sdff.pl",
+            "Its a joke ofc",
+            "123123 And the last one is 3rd place",
+        ]
+
+        with WorkerPool(self.bp, workers=2, use_pos_tagging=False) as pool:
+            stats = pool.stats()
+            self.assertEqual(len(stats['worker_processes']), 2)
+            self.assertTrue(all(worker['startup'] >= 0 for worker in stats['worker_processes']))
+
+            # the same workers are used for each call
+            for options in [{}, {'no_brackets': False}]:
+                self.assertEqual(
+                    pool.process(texts_to_process, use_pos_tagging=False, **options),
+                    self.bp.process(texts_to_process, use_pos_tagging=False, **options)
+                )
+            self.assertEqual(
+                pool.process(texts_to_process[0], use_pos_tagging=False),
+                self.bp.process(texts_to_process[0], use_pos_tagging=False)
+            )
+            self.assertEqual(pool.stats()['worker_processes'][0]['pid'], stats['worker_processes'][0]['pid'])
+
+            with self.assertRaises(Exception):
+                pool.process(texts_to_process, use_pos_tagging=False, profiler=RuleProfiler())
+
+    def test_doc_list_unknown_executor(self):
+        with self.assertRaises(Exception):
+            self.bp.process(["Its a joke ofc"], language='en', use_pos_tagging=False, executor='gpu')
+
+    def test_result_cache(self):
+        texts_to_process = [
+            "Accept all cookies to continue",
+            "And here is my e-mail: asdfe@sdff.pl",
+            "Accept all cookies to continue",
+        ]
+        cache = ResultCache(memory_items=10)
+
+        processed_texts = self.bp.process(texts_to_process, language='en', use_pos_tagging=False)
+        self.assertEqual(
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False, cache=cache),
+            processed_texts
+        )
+        self.assertEqual(cache.stats()['misses'], 3)
+        self.assertEqual(cache.stats()['memory_size'], 2)
+
+        self.assertEqual(
+            self.bp.process(texts_to_process, language='en', use_pos_tagging=False, cache=cache),
+            processed_texts
+        )
+        self.assertEqual(
+            self.bp.process(texts_to_process[0], language='en', use_pos_tagging=False, cache=cache),
+            processed_texts[0]
+        )
+        self.assertEqual(cache.stats()['memory_hits'], 4)
+
+        # other options are a different cache entry
+        self.bp.process(texts_to_process[0], language='en', use_pos_tagging=False, lower=True, cache=cache)
+        self.assertEqual(cache.stats()['misses'], 4)
+
+        with self.assertRaises(Exception):
+            self.bp.process(texts_to_process, use_pos_tagging=False, pre_rules=[lambda x: x], cache=cache)
+
+        # sentence segmentation and the backend change POS tags only
+        plan = self.bp.compile(language='en')
+        self.assertNotEqual(cache.options_key(plan, True, sentence_segmentation='rules'), cache.options_key(plan, True))
+        self.assertEqual(cache.options_key(plan, False, sentence_segmentation='rules'), cache.options_key(plan, False))
+        self.assertNotEqual(cache.options_key(plan, True, pos_backend='spacy'), cache.options_key(plan, True))
+        self.assertEqual(cache.options_key(plan, False, pos_backend='spacy'), cache.options_key(plan, False))
+
+    def test_result_cache_disk(self):
+        texts_to_process = ["first text {}".format(i) for i in range(5)]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "cache.sqlite")
+
+            cache = ResultCache(memory_items=2, db_path=db_path, disk_items=4)
+            processed_texts = list(self.bp.process_iter(texts_to_process, use_pos_tagging=False, cache=cache))
+            self.assertEqual(cache.stats()['memory_evictions'], 3)
+            self.assertEqual(cache.stats()['disk_evictions'], 1)
+            cache.close()
+
+            # a new cache with the same database, one of the texts was evicted from it
+            cache = ResultCache(memory_items=2, db_path=db_path, disk_items=4)
+            self.assertEqual(
+                list(self.bp.process_iter(texts_to_process, use_pos_tagging=False, cache=cache)),
+                processed_texts
+            )
+            self.assertEqual(cache.stats()['disk_hits'], 4)
+            self.assertEqual(cache.stats()['misses'], 1)
+            cache.close()
+
+            # replaced texts don't count as new rows, so nothing more is evicted
+            cache = ResultCache(memory_items=2, db_path=os.path.join(temp_dir, "other_cache.sqlite"), disk_items=4)
+            cache.set_many([("key {}".format(i), "value") for i in range(4)] * 2)
+            cache.set("key 0", "other value")
+            self.assertEqual(cache.stats()['disk_evictions'], 0)
+            cache.set("key 4", "value")
+            self.assertEqual(cache.stats()['disk_evictions'], 1)
+            cache.close()
+
+    def test_result_cache_memory_chars(self):
+        cache = ResultCache(memory_items=10, memory_chars=10)
+        cache.set_many([("first", "a" * 4), ("second", "b" * 4)])
+        self.assertEqual(cache.stats()['memory_chars'], 8)
+
+        # a huge text evicts the older ones
+        cache.set("third", "c" * 8)
+        self.assertEqual(cache.get_many(["first", "second", "third"]), [None, None, "c" * 8])
+        self.assertEqual(cache.stats()['memory_evictions'], 2)
+        self.assertEqual(cache.stats()['memory_chars'], 8)
+
+    def test_pos_cache(self):
+        sentence = ["Click", "here", "to", "subscribe", "."]
+        tags = ["VERB", "ADV", "PART", "VERB", "PUNCT"]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "pos_cache.sqlite")
+
+            cache = PosCache(memory_items=10, db_path=db_path)
+            tagging_key = cache.tagging_key('en', pos_replacement_list, {})
+            key = PosCache.sentence_key(sentence, tagging_key)
+
+            # other replacement lists and other tokens are different entries
+            self.assertNotEqual(tagging_key, cache.tagging_key('en', dict(pos_replacement_list, NUM='NUM'), {}))
+            self.assertNotEqual(key, PosCache.sentence_key(["Click here", "to", "subscribe", "."], tagging_key))
+
+            self.assertEqual(cache.get_tags([key]), [None])
+            cache.set_tags([(key, tags)])
+            self.assertEqual(cache.get_tags([key, key]), [tags, tags])
+            self.assertEqual(cache.stats()['tagged_sentences'], 1)
+            self.assertEqual(cache.stats()['hit_rate'], 2 / 3)
+            cache.close()
+
+            # tags survive in the on-disk tier
+            cache = PosCache(memory_items=10, db_path=db_path)
+            self.assertEqual(cache.get_tags([key]), [tags])
+            self.assertEqual(cache.stats()['disk_hits'], 1)
+            cache.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,9 +4,9 @@ import spacy
 from spacy.language import Language
 
 try:
-    from src.MordinezNLP.tokenizers import spacy_tokenizer
+    from src.MordinezNLP.tokenizers import spacy_tokenizer, spacy_sentencizer
 except:
-    from MordinezNLP.tokenizers import spacy_tokenizer
+    from MordinezNLP.tokenizers import spacy_tokenizer, spacy_sentencizer
 
 class TestTokenizers(unittest.TestCase):
     nlp: Language = spacy.load("en_core_web_sm")
@@ -62,6 +62,30 @@ class TestTokenizers(unittest.TestCase):
                 ]
             )
 
+    def test_spacy_sentencizer(self):
+        # the sentencizer doesn't need a trained pipeline
+        nlp: Language = spacy.blank("en")
+        nlp.tokenizer = spacy_tokenizer(nlp)
+        spacy_sentencizer(nlp)
+
+        texts = [
+            "It was on <date>. <date> General debate on covid-<number>. He said \"Stop.\" Then he left!",
+            "About <number>. and more (see above.) Yes?! \"Quoted.\"\n\nA new paragraph",
+        ]
+        sentences = [[sentence.text for sentence in doc.sents] for doc in nlp.pipe(texts)]
+        self.assertEqual(sentences, [
+            ["It was on <date>.", "<date> General debate on covid-<number>.", "He said \"Stop.\"", "Then he left!"],
+            ["About <number>. and more (see above.)", "Yes?!", "\"Quoted.\"\n\n", "A new paragraph"],
+        ])
+
+        # the parser and tok2vec are disabled in a trained pipeline
+        nlp = spacy.load("en_core_web_sm")
+        nlp.tokenizer = spacy_tokenizer(nlp)
+        spacy_sentencizer(nlp)
+        self.assertNotIn('parser', nlp.pipe_names)
+        self.assertNotIn('tok2vec', nlp.pipe_names)
+        self.assertEqual([sentence.text for sentence in nlp(texts[0]).sents], sentences[0])
+
 
 if __name__ == '__main__':
     unittest.main()
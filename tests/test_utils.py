@@ -1,10 +1,15 @@
+import json
+import re
 import string
+import subprocess
+import sys
 import unittest
 
+from helper import BASE_DIR
 try:
-    from src.MordinezNLP.utils import ngram_iterator, random_string
+    from src.MordinezNLP.utils import ngram_iterator, random_string, size_aware_chunks, trie_regex
 except:
-    from MordinezNLP.utils import ngram_iterator, random_string
+    from MordinezNLP.utils import ngram_iterator, random_string, size_aware_chunks, trie_regex
 
 
 class UtilsTests(unittest.TestCase):
@@ -68,6 +73,89 @@ class UtilsTests(unittest.TestCase):
 
         self.assertEqual(is_subset, True)
 
+    def test_size_aware_chunks_target_size(self):
+        texts = ['a' * 10, 'b' * 10, 'c' * 5, 'd' * 5, 'e' * 10, 'f']
+        output = list(size_aware_chunks(texts, 2, target_chunk_size=20))
+        self.assertEqual(output, [['a' * 10, 'b' * 10], ['c' * 5, 'd' * 5, 'e' * 10], ['f']])
+
+    def test_size_aware_chunks_large_text_isolated(self):
+        texts = ['a' * 10, 'b' * 100, 'c' * 10]
+        output = list(size_aware_chunks(texts, 2, target_chunk_size=20))
+        self.assertEqual(output, [['a' * 10], ['b' * 100], ['c' * 10]])
+
+    def test_size_aware_chunks_keeps_order(self):
+        texts = [random_string(length) for length in range(1, 300)]
+        output = list(size_aware_chunks(texts, 4, min_chunk_size=100))
+        self.assertEqual([text for chunk in output for text in chunk], texts)
+        self.assertGreater(len(output), 4)
+
+    def test_size_aware_chunks_adapts_to_workers(self):
+        texts = ['a' * 100] * 1000
+        output_2_workers = list(size_aware_chunks(texts, 2, min_chunk_size=1))
+        output_8_workers = list(size_aware_chunks(texts, 8, min_chunk_size=1))
+        self.assertEqual(len(output_2_workers), 8)
+        self.assertEqual(len(output_8_workers), 32)
+
+    def test_trie_regex_factors_prefixes(self):
+        self.assertEqual(trie_regex(["twenty", "twentieth", "thirty"]), "(?:t(?:hirty|went(?:ieth|y)))")
+        self.assertEqual(trie_regex(["a", "ab", "ac"]), "(?:a[bc]?)")
+        self.assertEqual(trie_regex([]), "(?!)")
+
+    def test_trie_regex_matches_the_same_words(self):
+        words = ["first", "twenty-first", "twentyfirst", "twentieth", "may", "march", "a.b", "a", "ab", "abc"]
+        regex = re.compile(trie_regex(words))
+        candidates = words + ["", "twenty", "twenty first", "ma", "aXb", "abcd", "b"]
+
+        for candidate in candidates:
+            self.assertEqual(regex.fullmatch(candidate) is not None, candidate in words, candidate)
+        # the same groups as in a bigger regex without the trie
+        self.assertEqual(re.compile("(x)" + trie_regex(words) + "(y)").groups, 2)
+
+
+class ImportTests(unittest.TestCase):
+    # seconds, importing the package must not import SpaCy, Stanza, torch, etc.
+    import_time_budget = 0.5
+    heavy_modules = ['spacy', 'stanza', 'torch', 'pdfplumber', 'selectolax', 'cleantext', 'elasticsearch']
+
+    def _import_in_new_process(self, package: str, version: str = "") -> dict:
+        code = (
+            "import json, sys, time\n"
+            "sys.version_info = {1} or sys.version_info\n"
+            "start = time.perf_counter()\n"
+            "try:\n"
+            "    import src.MordinezNLP.{0}\n"
+            "except ImportError:\n"
+            "    import MordinezNLP.{0}\n"
+            "package = sys.modules.get('src.MordinezNLP.{0}') or sys.modules['MordinezNLP.{0}']\n"
+            "print(json.dumps({{'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules),\n"
+            "                   'globals': sorted(vars(package))}}))\n"
+        ).format(package, version or "()")
+        output = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, stdout=subprocess.PIPE,
+                                universal_newlines=True, check=True)
+        return json.loads(output.stdout.strip().splitlines()[-1])
+
+    def test_utils_import_time_budget(self):
+        output = self._import_in_new_process("utils")
+        self.assertLess(output['seconds'], self.import_time_budget)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "attributes are imported eagerly on Python 3.6")
+    def test_packages_import_lazily(self):
+        for package in ['utils', 'processors', 'parsers', 'downloaders', 'pipelines', 'tokenizers']:
+            modules = self._import_in_new_process(package)['modules']
+            for module in self.heavy_modules:
+                self.assertNotIn(module, modules, "{} imports {}".format(package, module))
+
+    def test_pos_cache_doesnt_import_processors(self):
+        # the cache storage is shared through utils, POS tags caching doesn't need the processing rules
+        modules = self._import_in_new_process("pipelines.PosCache")['modules']
+        self.assertFalse([module for module in modules if ".processors" in module])
+        self.assertNotIn('ftfy', modules)
+
+    def test_python_36_imports_eagerly(self):
+        # module level __getattr__ isn't called by Python 3.6, so all of the attributes have to be imported
+        self.assertNotIn('trie_regex', self._import_in_new_process("utils")['globals'])
+        self.assertIn('trie_regex', self._import_in_new_process("utils", "(3, 6, 15)")['globals'])
+
 
 if __name__ == '__main__':
     unittest.main()